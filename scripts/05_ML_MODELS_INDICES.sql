@@ -0,0 +1,32 @@
+-- ============================================
+-- INDICES ml_models / model_predictions - POSTGRESQL
+-- Ejecutar contra la base de datos de ModelRepository
+-- ============================================
+
+-- Solo un modelo activo por nombre. ModelRepository.activate_model
+-- desactiva y activa en una sola sentencia; este indice hace que la base
+-- de datos garantice la regla y convierte el filtro is_active en un
+-- lookup por indice.
+CREATE UNIQUE INDEX IF NOT EXISTS ml_models_one_active
+    ON ml_models (model_name)
+    WHERE is_active;
+
+-- Modelo activo mas reciente por nombre (get_active_model,
+-- get_all_active_models): rango sobre el indice parcial en vez de seq scan.
+CREATE INDEX IF NOT EXISTS ml_models_active
+    ON ml_models (model_name, created_at DESC)
+    WHERE is_active;
+
+-- Lookup puntual por version (get_model_version, get_model_file).
+CREATE INDEX IF NOT EXISTS ml_models_name_version
+    ON ml_models (model_name, version);
+
+-- Listado de versiones por modelo (get_model_versions, compare_models).
+CREATE INDEX IF NOT EXISTS ml_models_name_created
+    ON ml_models (model_name, created_at DESC);
+
+-- Ventana de predicciones por modelo (p99 en get_model_performance_stats).
+-- INCLUDE permite un index-only scan sin visitar el heap.
+CREATE INDEX IF NOT EXISTS model_predictions_model_time
+    ON model_predictions (model_id, created_at DESC)
+    INCLUDE (prediction_time_ms, confidence, output_value, actual_value);
@@ -0,0 +1,48 @@
+-- ============================================
+-- ROLLUP HORARIO DE model_predictions - POSTGRESQL
+-- Ejecutar contra la base de datos de ModelRepository
+-- ============================================
+
+-- ModelRepository.record_prediction_performance inserta cada prediccion
+-- y actualiza esta tabla en la misma sentencia; get_model_performance_stats
+-- agrega solo las filas de las ultimas N horas en lugar de recorrer
+-- model_predictions completo.
+CREATE TABLE IF NOT EXISTS model_predictions_hourly (
+    model_id            INTEGER          NOT NULL,
+    bucket              TIMESTAMP        NOT NULL,
+    prediction_count    BIGINT           NOT NULL DEFAULT 0,
+    latency_count       BIGINT           NOT NULL DEFAULT 0,
+    latency_sum         DOUBLE PRECISION NOT NULL DEFAULT 0,
+    latency_min         DOUBLE PRECISION,
+    latency_max         DOUBLE PRECISION,
+    confidence_count    BIGINT           NOT NULL DEFAULT 0,
+    confidence_sum      DOUBLE PRECISION NOT NULL DEFAULT 0,
+    confidence_sumsq    DOUBLE PRECISION NOT NULL DEFAULT 0,
+    error_count         BIGINT           NOT NULL DEFAULT 0,
+    error_sum           DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (model_id, bucket)
+);
+
+-- Backfill inicial desde las predicciones existentes
+INSERT INTO model_predictions_hourly (
+    model_id, bucket, prediction_count,
+    latency_count, latency_sum, latency_min, latency_max,
+    confidence_count, confidence_sum, confidence_sumsq,
+    error_count, error_sum
+)
+SELECT
+    model_id,
+    date_trunc('hour', created_at),
+    COUNT(*),
+    COUNT(prediction_time_ms),
+    COALESCE(SUM(prediction_time_ms), 0),
+    MIN(prediction_time_ms),
+    MAX(prediction_time_ms),
+    COUNT(confidence),
+    COALESCE(SUM(confidence), 0),
+    COALESCE(SUM(confidence * confidence), 0),
+    COUNT(actual_value - output_value),
+    COALESCE(SUM(ABS(actual_value - output_value)), 0)
+FROM model_predictions
+GROUP BY model_id, date_trunc('hour', created_at)
+ON CONFLICT (model_id, bucket) DO NOTHING;
@@ -0,0 +1,20 @@
+-- ============================================
+-- METRICAS JSONB EN ml_models - POSTGRESQL
+-- Ejecutar contra la base de datos de ModelRepository
+-- ============================================
+
+-- metrics y validation_metrics pasan de texto a jsonb: los clientes
+-- reciben un dict nativo (sin json.loads) y Postgres puede filtrar por
+-- campos de metricas. ModelRepository envia los valores con el adaptador
+-- Json de psycopg2.
+ALTER TABLE ml_models
+    ALTER COLUMN metrics TYPE jsonb USING metrics::jsonb;
+
+ALTER TABLE ml_models
+    ALTER COLUMN validation_metrics TYPE jsonb USING validation_metrics::jsonb;
+
+-- Filtro por contencion de metricas (compare_models con metric_filter:
+-- metrics @> '{"rmse": ...}'). jsonb_path_ops es mas compacto y solo
+-- soporta @>, que es el unico operador que usamos.
+CREATE INDEX IF NOT EXISTS ml_models_metrics
+    ON ml_models USING gin (metrics jsonb_path_ops);
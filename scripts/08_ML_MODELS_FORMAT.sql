@@ -0,0 +1,12 @@
+-- ============================================
+-- FORMATO DE SERIALIZACION EN ml_models - POSTGRESQL
+-- Ejecutar contra la base de datos de ModelRepository
+-- ============================================
+
+-- model_format indica como deserializar el archivo del modelo:
+--   pickle   -> pickle.load (versiones existentes)
+--   joblib   -> joblib.load; si el archivo no esta comprimido se abre con
+--               mmap_mode='r' y los arrays de numpy se comparten entre workers
+--   xgb_json -> xgboost.Booster.load_model
+ALTER TABLE ml_models
+    ADD COLUMN IF NOT EXISTS model_format VARCHAR(16) NOT NULL DEFAULT 'pickle';
@@ -0,0 +1,13 @@
+-- ============================================
+-- HASH DEL ARCHIVO EN ml_models - POSTGRESQL
+-- Ejecutar contra la base de datos de ModelRepository
+-- (antes de desplegar el almacenamiento por contenido de modelos)
+-- ============================================
+
+-- file_sha256 es el SHA-256 (hex) de los bytes sin comprimir del modelo.
+-- Los archivos nuevos se guardan en sha256/<aa>/<bb>/<hash>.pkl, y
+-- ModelManager lo usa para no recargar un modelo cuyo archivo no cambio.
+-- Las versiones existentes quedan en NULL y se siguen leyendo por
+-- model_path.
+ALTER TABLE ml_models
+    ADD COLUMN IF NOT EXISTS file_sha256 CHAR(64) NULL;
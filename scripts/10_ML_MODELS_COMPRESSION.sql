@@ -0,0 +1,11 @@
+-- ============================================
+-- COMPRESION DE ARCHIVOS EN ml_models - POSTGRESQL
+-- Ejecutar contra la base de datos de ModelRepository
+-- (despues de 09_ML_MODELS_FILE_HASH.sql)
+-- ============================================
+
+-- compression indica el codec del archivo en disco ('zstd') o NULL si el
+-- archivo esta sin comprimir. open_model_file descomprime segun este valor.
+-- Las versiones existentes quedan en NULL porque se guardaron sin comprimir.
+ALTER TABLE ml_models
+    ADD COLUMN IF NOT EXISTS compression VARCHAR(16) NULL;
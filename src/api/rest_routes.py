@@ -451,9 +451,10 @@ def create_rest_routes(
 
     @api.route('/health/detailed', methods=['GET'])
     def detailed_health_check():
-        """Detailed health check"""
+        """Detailed health check (?full=false stops at the first unhealthy component)"""
         try:
-            health = health_service.check_system_health()
+            full = request.args.get('full', 'true').lower() != 'false'
+            health = health_service.check_system_health(full=full)
 
             return jsonify(health), 200
 
@@ -102,18 +102,25 @@ class LoggerMixin:
         """Get logger for this class"""
         return logging.getLogger(self.__class__.__module__ + '.' + self.__class__.__name__)
 
-    def log_info(self, message: str, **kwargs):
+    # Positional args are %-formatted lazily by logging, only when the
+    # level is enabled: log_info("Optimizing dispatch %s", dispatch_id)
+
+    def log_info(self, message: str, *args, **kwargs):
         """Log info message"""
-        self.logger.info(message, extra=kwargs)
+        self.logger.info(message, *args, extra=kwargs)
 
-    def log_error(self, message: str, **kwargs):
+    def log_error(self, message: str, *args, **kwargs):
         """Log error message"""
-        self.logger.error(message, extra=kwargs)
+        self.logger.error(message, *args, extra=kwargs)
+
+    def log_exception(self, message: str, *args, **kwargs):
+        """Log error message with the traceback of the exception being handled"""
+        self.logger.exception(message, *args, extra=kwargs)
 
-    def log_warning(self, message: str, **kwargs):
+    def log_warning(self, message: str, *args, **kwargs):
         """Log warning message"""
-        self.logger.warning(message, extra=kwargs)
+        self.logger.warning(message, *args, extra=kwargs)
 
-    def log_debug(self, message: str, **kwargs):
+    def log_debug(self, message: str, *args, **kwargs):
         """Log debug message"""
-        self.logger.debug(message, extra=kwargs)
+        self.logger.debug(message, *args, extra=kwargs)
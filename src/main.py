@@ -213,6 +213,7 @@ def register_routes(app: Flask):
             prediction_service = PredictionService(
                 model_manager, dispatch_repo, ambulance_repo, model_repo, cache_repo
             )
+            prediction_service.warmup()
 
             training_service = TrainingService(
                 model_manager, dispatch_repo, model_repo, cache_repo
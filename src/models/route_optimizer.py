@@ -188,6 +188,9 @@ class RouteOptimizer(BaseModel):
         """
         Optimize routes for multiple dispatches
 
+        Sequential helper: calls predict once per entry. The optimizer is
+        analytical, so there is no model call to batch.
+
         Args:
             features_list: List of route feature dictionaries
 
@@ -3,10 +3,12 @@ Ambulance Repository
 Manages ambulance records, availability, and location tracking
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Collection
 from datetime import datetime, timedelta
 import json
 
+import numpy as np
+
 from .base_repository import BaseRepository
 
 
@@ -179,12 +181,48 @@ class AmbulanceRepository(BaseRepository):
             self.log_error(f"Error getting available ambulances: {str(e)}")
             return []
 
+    def get_available_ambulances_soa(self, ambulance_type: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Get available ambulances as parallel arrays (structure of arrays)
+
+        Reads through the cached get_available_ambulances, so both views
+        share the same availability cache and invalidation.
+
+        Args:
+            ambulance_type: Filter by type (optional)
+
+        Returns:
+            Dictionary with ids, lats, lons and types arrays
+        """
+        return self.ambulances_to_soa(self.get_available_ambulances(ambulance_type))
+
+    @staticmethod
+    def ambulances_to_soa(ambulances: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Convert ambulance rows to parallel arrays
+
+        Args:
+            ambulances: Ambulance dictionaries
+
+        Returns:
+            Dictionary with ids (int64), lats and lons (float, NaN when
+            missing) and types (object) arrays
+        """
+        count = len(ambulances)
+        return {
+            'ids': np.fromiter((a['id'] for a in ambulances), dtype=np.int64, count=count),
+            'lats': np.array([a.get('current_lat') for a in ambulances], dtype=float),
+            'lons': np.array([a.get('current_lon') for a in ambulances], dtype=float),
+            'types': np.array([a.get('type') for a in ambulances], dtype=object)
+        }
+
     def get_available_ambulances_near(
         self,
         latitude: float,
         longitude: float,
         radius_km: float = 10,
-        limit: int = 5
+        limit: int = 5,
+        exclude_ids: Optional[Collection[int]] = None
     ) -> List[Dict]:
         """
         Get available ambulances near a location
@@ -194,16 +232,26 @@ class AmbulanceRepository(BaseRepository):
             longitude: Target longitude
             radius_km: Search radius in kilometers
             limit: Maximum results
+            exclude_ids: Ambulance IDs to leave out (filtered in SQL, so the
+                limit counts only eligible ambulances)
 
         Returns:
             List of nearby ambulances with distance
         """
         try:
+            excluded = sorted(exclude_ids) if exclude_ids else []
+
             cache_key = f"nearby:ambulances:{latitude:.2f}:{longitude:.2f}:{radius_km}"
+            if excluded:
+                cache_key += ":excl:" + ",".join(str(ambulance_id) for ambulance_id in excluded)
             cached = self.get_cache(cache_key)
             if cached:
                 return cached
 
+            exclusion = ''
+            if excluded:
+                exclusion = f"AND id NOT IN ({', '.join(['%s'] * len(excluded))})"
+
             # Using Haversine formula for distance calculation
             query = f"""
                 SELECT *,
@@ -215,11 +263,12 @@ class AmbulanceRepository(BaseRepository):
                     AND (6371 * acos(cos(radians(%s)) * cos(radians(current_lat)) *
                     cos(radians(current_lon) - radians(%s)) +
                     sin(radians(%s)) * sin(radians(current_lat)))) <= %s
+                    {exclusion}
                 ORDER BY distance_km ASC
                 LIMIT %s
             """
 
-            params = [latitude, longitude, latitude, latitude, longitude, latitude, radius_km, limit]
+            params = [latitude, longitude, latitude, latitude, longitude, latitude, radius_km, *excluded, limit]
             results = self.execute_query(query, tuple(params))
 
             if results:
@@ -6,11 +6,49 @@ Provides common database and cache operations for all repositories
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from decimal import Decimal
 import json
 
+import orjson
+
 from ..config.logger import LoggerMixin
 
 
+class _CacheMiss:
+    """Sentinel for a cached negative lookup"""
+
+    def __repr__(self) -> str:
+        return 'CACHE_MISS'
+
+
+# Returned by get_cache/get_cache_many for a cached negative lookup (see set_cache_miss)
+CACHE_MISS = _CacheMiss()
+
+# Stored payload that marks a negative lookup
+_CACHE_MISS_MARKER = '__cache_miss__'
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback serializer for types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+
+def dump_cache_value(value: Any) -> bytes:
+    """Serialize a cache payload with orjson"""
+    return orjson.dumps(
+        value,
+        default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+    )
+
+
+def load_cache_value(cached: Any) -> Any:
+    """Deserialize a cache payload written by dump_cache_value"""
+    return orjson.loads(cached) if isinstance(cached, (str, bytes, bytearray, memoryview)) else cached
+
+
 class BaseRepository(ABC, LoggerMixin):
     """
     Abstract base class for all repositories
@@ -40,34 +78,137 @@ class BaseRepository(ABC, LoggerMixin):
     # CACHE OPERATIONS
     # ============================================
 
-    def get_cache(self, key: str) -> Optional[Any]:
+    def get_cache(self, key: str, scope: Optional[str] = None) -> Optional[Any]:
         """
         Get value from cache
 
         Args:
             key: Cache key
+            scope: Revision scope; entries written under an older revision
+                are treated as misses (see bump_cache_revision)
 
         Returns:
             Cached value or None
         """
+        if scope is not None:
+            return self.get_cache_with_revision(key, scope)[0]
+
         if not self.redis:
             return None
 
         try:
             full_key = f"{self.cache_prefix}:{key}"
             cached = self.redis.get(full_key)
+            if not cached:
+                return None
 
-            if cached:
-                self.log_debug(f"Cache hit: {full_key}")
-                return json.loads(cached) if isinstance(cached, str) else cached
+            value = load_cache_value(cached)
+            self.log_debug(f"Cache hit: {full_key}")
+            return CACHE_MISS if value == _CACHE_MISS_MARKER else value
 
+        except Exception as e:
+            self.log_warning(f"Cache get error: {str(e)}")
             return None
 
+    def get_cache_with_revision(self, key: str, scope: str) -> Tuple[Optional[Any], Optional[int]]:
+        """
+        Get a scoped value from cache together with the scope revision
+
+        The revision is read in the same MGET as the value, before the caller
+        queries the database on a miss. Passing it back to set_cache stamps
+        the fresh row with the revision it was read under, so a bump that
+        lands while the query runs invalidates it.
+
+        Args:
+            key: Cache key
+            scope: Revision scope
+
+        Returns:
+            Tuple of (cached value or None, revision or None if unknown)
+        """
+        if not self.redis:
+            return None, None
+
+        try:
+            full_key = f"{self.cache_prefix}:{key}"
+            cached, revision = self.redis.mget([full_key, self._revision_key(scope)])
+            revision = self._parse_revision(revision)
+            if not cached:
+                return None, revision
+
+            value = self._unwrap_revision(load_cache_value(cached), revision)
+            if value is not None:
+                self.log_debug(f"Cache hit: {full_key}")
+            return (CACHE_MISS if value == _CACHE_MISS_MARKER else value), revision
+
         except Exception as e:
             self.log_warning(f"Cache get error: {str(e)}")
-            return None
+            return None, None
+
+    def get_cache_many(self, keys: List[str], scopes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Get several values from cache in a single round trip (MGET)
+
+        Args:
+            keys: Cache keys
+            scopes: Optional mapping of key -> revision scope
 
-    def set_cache(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        Returns:
+            Dictionary of key -> cached value (misses are omitted)
+        """
+        return self.get_cache_many_with_revisions(keys, scopes)[0]
+
+    def get_cache_many_with_revisions(
+        self,
+        keys: List[str],
+        scopes: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """
+        Get several values from cache together with the revisions of their scopes
+
+        Args:
+            keys: Cache keys
+            scopes: Optional mapping of key -> revision scope
+
+        Returns:
+            Tuple of (key -> cached value with misses omitted,
+            scope -> revision read in the same MGET), see get_cache_with_revision
+        """
+        if not self.redis or not keys:
+            return {}, {}
+
+        try:
+            scopes = scopes or {}
+            scope_names = sorted(set(scopes.values()))
+            full_keys = [f"{self.cache_prefix}:{key}" for key in keys]
+            values = self.redis.mget(full_keys + [self._revision_key(s) for s in scope_names])
+            revisions = {s: self._parse_revision(v) for s, v in zip(scope_names, values[len(keys):])}
+
+            found = {}
+            for key, cached in zip(keys, values[:len(keys)]):
+                if not cached:
+                    continue
+                value = load_cache_value(cached)
+                if key in scopes:
+                    value = self._unwrap_revision(value, revisions[scopes[key]])
+                if value is not None:
+                    found[key] = CACHE_MISS if value == _CACHE_MISS_MARKER else value
+
+            self.log_debug(f"Cache mget: {len(found)}/{len(keys)} hits")
+            return found, revisions
+
+        except Exception as e:
+            self.log_warning(f"Cache mget error: {str(e)}")
+            return {}, {}
+
+    def set_cache(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        scope: Optional[str] = None,
+        revision: Optional[int] = None
+    ) -> bool:
         """
         Set value in cache
 
@@ -75,6 +216,10 @@ class BaseRepository(ABC, LoggerMixin):
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds
+            scope: Revision scope the entry belongs to
+            revision: Scope revision read before the value was loaded (see
+                get_cache_with_revision); the write is dropped if the scope
+                has been bumped since
 
         Returns:
             True if successful
@@ -86,11 +231,16 @@ class BaseRepository(ABC, LoggerMixin):
             full_key = f"{self.cache_prefix}:{key}"
             ttl = ttl or self.cache_ttl
 
-            # Serialize value
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+            if scope is not None:
+                current = self._parse_revision(self.redis.get(self._revision_key(scope)))
+                if revision is None:
+                    revision = current
+                elif revision != current:
+                    self.log_debug(f"Cache set skipped: {full_key} (revision changed)")
+                    return False
+                value = {'rev': revision, 'data': value}
 
-            self.redis.setEx(full_key, ttl, str(value))
+            self.redis.setEx(full_key, ttl, dump_cache_value(value))
             self.log_debug(f"Cache set: {full_key} (TTL: {ttl}s)")
             return True
 
@@ -98,6 +248,81 @@ class BaseRepository(ABC, LoggerMixin):
             self.log_warning(f"Cache set error: {str(e)}")
             return False
 
+    def set_cache_miss(
+        self,
+        key: str,
+        ttl: int = 60,
+        scope: Optional[str] = None,
+        revision: Optional[int] = None
+    ) -> bool:
+        """
+        Cache a negative lookup so repeated misses do not reach the database
+
+        Args:
+            key: Cache key
+            ttl: Time to live in seconds (keep short)
+            scope: Revision scope; bumping it makes the miss visible again
+            revision: Scope revision read before the lookup (see set_cache)
+
+        Returns:
+            True if successful
+        """
+        return self.set_cache(key, _CACHE_MISS_MARKER, ttl=ttl, scope=scope, revision=revision)
+
+    def set_cache_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        scopes: Optional[Dict[str, str]] = None,
+        revisions: Optional[Dict[str, int]] = None
+    ) -> bool:
+        """
+        Set several cache values in a single round trip (pipeline)
+
+        Args:
+            items: Dictionary of key -> value
+            ttl: Time to live in seconds
+            scopes: Optional mapping of key -> revision scope
+            revisions: Optional mapping of scope -> revision read before the
+                values were loaded; keys of scopes bumped since are skipped
+
+        Returns:
+            True if successful
+        """
+        if not self.redis or not items:
+            return False
+
+        try:
+            ttl = ttl or self.cache_ttl
+            scopes = scopes or {}
+            scope_names = sorted(set(scopes.values()))
+            current = {}
+            if scope_names:
+                values = self.redis.mget([self._revision_key(s) for s in scope_names])
+                current = {s: self._parse_revision(v) for s, v in zip(scope_names, values)}
+            revisions = revisions or {}
+            read = {s: revisions.get(s, rev) for s, rev in current.items()}
+
+            pipe = self.redis.pipeline()
+            written = 0
+
+            for key, value in items.items():
+                if key in scopes:
+                    scope = scopes[key]
+                    if read[scope] != current[scope]:
+                        continue
+                    value = {'rev': read[scope], 'data': value}
+                pipe.setEx(f"{self.cache_prefix}:{key}", ttl, dump_cache_value(value))
+                written += 1
+
+            pipe.execute()
+            self.log_debug(f"Cache mset: {written}/{len(items)} keys (TTL: {ttl}s)")
+            return True
+
+        except Exception as e:
+            self.log_warning(f"Cache mset error: {str(e)}")
+            return False
+
     def delete_cache(self, key: str) -> bool:
         """
         Delete from cache
@@ -154,6 +379,74 @@ class BaseRepository(ABC, LoggerMixin):
             self.log_warning(f"Cache clear error: {str(e)}")
             return 0
 
+    def bump_cache_revision(self, *scopes: str) -> bool:
+        """
+        Invalidate every cache entry written under the given scopes
+
+        Increments a per-scope revision counter (O(1) INCR) instead of
+        scanning the keyspace; stale entries are rejected on read and
+        expire through their TTL.
+
+        Args:
+            *scopes: Revision scopes to invalidate
+
+        Returns:
+            True if successful
+        """
+        if not self.redis or not scopes:
+            return False
+
+        try:
+            pipe = self.redis.pipeline()
+            for scope in scopes:
+                pipe.incr(self._revision_key(scope))
+            pipe.execute()
+
+            self.log_debug(f"Cache revision bumped: {', '.join(scopes)}")
+            return True
+
+        except Exception as e:
+            self.log_warning(f"Cache revision error: {str(e)}")
+            return False
+
+    def get_cache_revision(self, scope: str) -> Optional[int]:
+        """
+        Current revision of a cache scope
+
+        Lets in-process caches that sit in front of the repository notice a
+        bump made by another worker.
+
+        Args:
+            scope: Revision scope
+
+        Returns:
+            Revision counter, or None if the cache is unavailable
+        """
+        if not self.redis:
+            return None
+
+        try:
+            return self._parse_revision(self.redis.get(self._revision_key(scope)))
+
+        except Exception as e:
+            self.log_warning(f"Cache revision error: {str(e)}")
+            return None
+
+    def _revision_key(self, scope: str) -> str:
+        """Build the revision counter key for a scope"""
+        return f"{self.cache_prefix}:rev:{scope}"
+
+    @staticmethod
+    def _parse_revision(revision: Any) -> int:
+        """Parse a revision counter as returned by Redis"""
+        return int(revision) if revision else 0
+
+    def _unwrap_revision(self, payload: Any, revision: Any) -> Optional[Any]:
+        """Return the cached data if it was written under the current revision"""
+        if not isinstance(payload, dict) or payload.get('rev') != self._parse_revision(revision):
+            return None
+        return payload.get('data')
+
     # ============================================
     # DATABASE OPERATIONS
     # ============================================
@@ -272,6 +565,34 @@ class BaseRepository(ABC, LoggerMixin):
             self.log_error(f"Error counting records: {str(e)}")
             return 0
 
+    def count_many(self, tables: List[str]) -> Dict[str, int]:
+        """
+        Count records of several tables in a single round-trip
+
+        Args:
+            tables: Table names
+
+        Returns:
+            Dictionary of table name -> record count (0 for tables not returned)
+        """
+        try:
+            counts = {table: 0 for table in tables}
+            if not counts:
+                return counts
+
+            query = " UNION ALL ".join(
+                f"SELECT %s AS table_name, COUNT(*) AS count FROM {table}" for table in counts
+            )
+
+            for row in self.execute_query(query, tuple(counts)) or []:
+                counts[row['table_name']] = row['count']
+
+            return counts
+
+        except Exception as e:
+            self.log_error(f"Error counting records: {str(e)}")
+            return {table: 0 for table in tables}
+
     def save(self, table: str, data: Dict) -> bool:
         """
         Save/update record
@@ -5,9 +5,9 @@ Specialized Redis caching operations for frequently accessed data
 
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-import json
 
 from ..config.logger import LoggerMixin
+from .base_repository import dump_cache_value, load_cache_value
 
 
 class CacheRepository(LoggerMixin):
@@ -48,9 +48,9 @@ class CacheRepository(LoggerMixin):
             value = self.redis.get(key)
 
             if value:
-                # Try to deserialize JSON
+                # Try to deserialize JSON (str or bytes, depending on the client)
                 try:
-                    return json.loads(value) if isinstance(value, str) else value
+                    return load_cache_value(value)
                 except:
                     return value
 
@@ -73,9 +73,9 @@ class CacheRepository(LoggerMixin):
             True if successful
         """
         try:
-            # Serialize if needed
+            # Serialize if needed (orjson also handles numpy values and datetimes)
             if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+                value = dump_cache_value(value)
             else:
                 value = str(value)
 
@@ -318,7 +318,7 @@ class CacheRepository(LoggerMixin):
         """
         try:
             if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+                value = dump_cache_value(value)
             else:
                 value = str(value)
 
@@ -353,8 +353,7 @@ class CacheRepository(LoggerMixin):
 
             for item in items:
                 try:
-                    item_str = item.decode() if isinstance(item, bytes) else item
-                    result.append(json.loads(item_str))
+                    result.append(load_cache_value(item))
                 except:
                     result.append(item)
 
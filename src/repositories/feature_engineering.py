@@ -9,6 +9,34 @@ import math
 import numpy as np
 
 from ..config.logger import LoggerMixin
+from ..utils.geo import EARTH_RADIUS_KM, haversine, haversine_vector, njit
+
+
+@njit(cache=True, fastmath=True)
+def _route_geometry(lat1: float, lon1: float, lat2: float, lon2: float) -> Tuple[float, float]:
+    """
+    Haversine distance (km) and initial bearing (degrees, 0-360) of a route
+
+    One compiled pass that shares the radian conversions and trigonometry of
+    calculate_distance and calculate_bearing (positional args only).
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlon = math.radians(lon2) - math.radians(lon1)
+    cos_lat1 = math.cos(lat1_rad)
+    cos_lat2 = math.cos(lat2_rad)
+    sin_lat1 = math.sin(lat1_rad)
+    sin_lat2 = math.sin(lat2_rad)
+
+    a = (math.sin((lat2_rad - lat1_rad) / 2) ** 2 +
+         cos_lat1 * cos_lat2 * math.sin(dlon / 2) ** 2)
+    distance = EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(a))
+
+    x = math.sin(dlon) * cos_lat2
+    y = cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * math.cos(dlon)
+    bearing = (math.degrees(math.atan2(x, y)) + 360) % 360
+
+    return distance, bearing
 
 
 class FeatureEngineer(LoggerMixin):
@@ -22,6 +50,12 @@ class FeatureEngineer(LoggerMixin):
     - Feature validation
     """
 
+    # Fixed feature vector sizes, reported with prediction telemetry:
+    # ETA = 5 geographic + hour, weekday, traffic level + 7 traffic encodings
+    ETA_FEATURE_COUNT = 15
+    # Route = origin, destination, traffic, hour, weekday, alternatives
+    ROUTE_FEATURE_COUNT = 8
+
     def __init__(self):
         """Initialize Feature Engineer"""
         self.log_info("Initialized FeatureEngineer")
@@ -48,25 +82,41 @@ class FeatureEngineer(LoggerMixin):
             Distance in kilometers
         """
         try:
-            R = 6371  # Earth radius in km
+            return haversine(float(lat1), float(lon1), float(lat2), float(lon2))
 
-            lat1_rad = math.radians(lat1)
-            lon1_rad = math.radians(lon1)
-            lat2_rad = math.radians(lat2)
-            lon2_rad = math.radians(lon2)
+        except Exception:
+            return 0.0
 
-            dlat = lat2_rad - lat1_rad
-            dlon = lon2_rad - lon1_rad
+    @staticmethod
+    def calculate_distance_matrix(
+        lats1: Any,
+        lons1: Any,
+        lats2: Any,
+        lons2: Any
+    ) -> np.ndarray:
+        """
+        Distance between every pair of two point sets
 
-            a = (math.sin(dlat / 2) ** 2 +
-                 math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2)
-            c = 2 * math.asin(math.sqrt(a))
-            distance = R * c
+        NumPy-broadcast haversine whose entry [i, j] matches
+        calculate_distance(lats1[i], lons1[i], lats2[j], lons2[j]), so it
+        agrees with every other distance in the service.
 
-            return distance
+        Args:
+            lats1, lons1: First point set (N latitudes, N longitudes)
+            lats2, lons2: Second point set (M latitudes, M longitudes)
 
-        except Exception:
-            return 0.0
+        Returns:
+            (N, M) array of distances in kilometers (0.0 where a coordinate is missing)
+        """
+        lats1 = np.asarray(lats1, dtype=float)
+        lons1 = np.asarray(lons1, dtype=float)
+        lats2 = np.asarray(lats2, dtype=float)
+        lons2 = np.asarray(lons2, dtype=float)
+
+        distance = haversine_vector(lats1[:, None], lons1[:, None], lats2[None, :], lons2[None, :])
+
+        # Same fallback as calculate_distance for unusable coordinates
+        return np.nan_to_num(distance, nan=0.0, posinf=0.0)
 
     @staticmethod
     def calculate_bearing(
@@ -120,15 +170,13 @@ class FeatureEngineer(LoggerMixin):
         Returns:
             Dictionary with geographic features
         """
-        distance = self.calculate_distance(
-            origin_lat, origin_lon,
-            destination_lat, destination_lon
-        )
-
-        bearing = self.calculate_bearing(
-            origin_lat, origin_lon,
-            destination_lat, destination_lon
-        )
+        try:
+            distance, bearing = _route_geometry(
+                float(origin_lat), float(origin_lon),
+                float(destination_lat), float(destination_lon)
+            )
+        except Exception:
+            distance, bearing = 0.0, 0.0
 
         # Cardinal direction
         if bearing < 45 or bearing >= 315:
@@ -148,6 +196,59 @@ class FeatureEngineer(LoggerMixin):
             'lon_diff': abs(destination_lon - origin_lon)
         }
 
+    def extract_geographic_features_batch(
+        self,
+        origin_lats: Any,
+        origin_lons: Any,
+        destination_lats: Any,
+        destination_lons: Any
+    ) -> Dict[str, np.ndarray]:
+        """
+        Extract geographic features for many routes at once
+
+        Vectorized counterpart of extract_geographic_features: element i of
+        each array describes route i.
+
+        Args:
+            origin_lats, origin_lons: Starting locations (N each)
+            destination_lats, destination_lons: Destinations (N each)
+
+        Returns:
+            Dictionary with distance_km, bearing_degrees, cardinal_direction,
+            lat_diff and lon_diff arrays
+        """
+        lat1 = np.asarray(origin_lats, dtype=float)
+        lon1 = np.asarray(origin_lons, dtype=float)
+        lat2 = np.asarray(destination_lats, dtype=float)
+        lon2 = np.asarray(destination_lons, dtype=float)
+
+        lat1_rad, lon1_rad = np.radians(lat1), np.radians(lon1)
+        lat2_rad, lon2_rad = np.radians(lat2), np.radians(lon2)
+        dlon = lon2_rad - lon1_rad
+
+        # Haversine distance (same kernel as calculate_distance)
+        distance = np.nan_to_num(haversine_vector(lat1, lon1, lat2, lon2), nan=0.0)
+
+        # Bearing (same formula as calculate_bearing)
+        x = np.sin(dlon) * np.cos(lat2_rad)
+        y = (np.cos(lat1_rad) * np.sin(lat2_rad) -
+             np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(dlon))
+        bearing = np.nan_to_num((np.degrees(np.arctan2(x, y)) + 360) % 360, nan=0.0)
+
+        direction = np.select(
+            [(bearing < 45) | (bearing >= 315), bearing < 135, bearing < 225],
+            ['N', 'E', 'S'],
+            default='W'
+        )
+
+        return {
+            'distance_km': distance,
+            'bearing_degrees': bearing,
+            'cardinal_direction': direction,
+            'lat_diff': np.abs(lat2 - lat1),
+            'lon_diff': np.abs(lon2 - lon1)
+        }
+
     # ============================================
     # TEMPORAL FEATURES
     # ============================================
@@ -3,12 +3,31 @@ Model Repository
 Manages ML model persistence, versioning, and metadata
 """
 
-from typing import Dict, List, Optional, Any
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import io
 import json
+import mmap
 import os
+import time
+import uuid
 
-from .base_repository import BaseRepository
+try:
+    import zstandard
+except ImportError:  # Model files are stored uncompressed without it
+    zstandard = None
+
+try:
+    from psycopg2.extras import Json
+except ImportError:  # JSON columns are sent as text literals without it
+    Json = None
+
+from .base_repository import BaseRepository, CACHE_MISS
+
+# Serialized model accepted by save_model_version
+ModelData = Union[bytes, BinaryIO, Iterable[bytes]]
 
 
 class ModelRepository(BaseRepository):
@@ -22,7 +41,94 @@ class ModelRepository(BaseRepository):
     - Model deployment management
     """
 
-    def __init__(self, db_connection=None, redis_client=None, models_path: str = "/models"):
+    # Revision scope for the cross-model "all active" listing
+    ACTIVE_MODELS_SCOPE = 'models:active'
+
+    # Model files above this size are evicted from the page cache after writing
+    LARGE_MODEL_BYTES = 64 * 1024 * 1024
+
+    # Read size when streaming a model from a file object
+    MODEL_CHUNK_BYTES = 1024 * 1024
+
+    # zstd level for model files (fast enough that disk IO still dominates)
+    ZSTD_LEVEL = 3
+
+    # Aggregates over model_predictions_hourly rows returned by the performance stats queries
+    _PERF_STATS_COLUMNS = """
+        COALESCE(SUM(prediction_count), 0) as total_predictions,
+        SUM(latency_sum) / NULLIF(SUM(latency_count), 0) as avg_prediction_time,
+        MIN(latency_min) as min_prediction_time,
+        MAX(latency_max) as max_prediction_time,
+        SUM(confidence_sum) / NULLIF(SUM(confidence_count), 0) as avg_confidence,
+        SQRT(GREATEST(
+            (SUM(confidence_sumsq) - SUM(confidence_sum) ^ 2 / NULLIF(SUM(confidence_count), 0))
+            / NULLIF(SUM(confidence_count) - 1, 0),
+            0
+        )) as stddev_confidence,
+        SUM(error_sum) / NULLIF(SUM(error_count), 0) as mae
+    """
+
+    # TTL for cached "not found" lookups of a model version / active model
+    NEGATIVE_CACHE_TTL = 60
+
+    # In-process cache of get_active_model results (bounds cross-worker staleness)
+    LOCAL_ACTIVE_TTL = 1.0
+    LOCAL_ACTIVE_MAX_ENTRIES = 32
+
+    # Server-side timestamp for write paths (columns hold naive UTC timestamps)
+    _NOW_SQL = "(NOW() AT TIME ZONE 'UTC')"
+
+    # Columns read by the hot metadata paths (leaves out description, feature_names, hyperparameters).
+    # file_sha256, compression and model_format need scripts/08-10 applied first.
+    _SELECT_COLUMNS = (
+        "id, model_name, version, model_type, model_path, file_size, file_sha256, "
+        "compression, model_format, is_active, training_date, training_samples, metrics, "
+        "created_at, updated_at, activated_at"
+    )
+
+    # Folds rows from an "inserted" CTE over model_predictions into model_predictions_hourly
+    _PERF_ROLLUP_UPSERT = """
+        INSERT INTO model_predictions_hourly (
+            model_id, bucket, prediction_count,
+            latency_count, latency_sum, latency_min, latency_max,
+            confidence_count, confidence_sum, confidence_sumsq,
+            error_count, error_sum
+        )
+        SELECT
+            model_id,
+            date_trunc('hour', created_at),
+            COUNT(*),
+            COUNT(prediction_time_ms),
+            COALESCE(SUM(prediction_time_ms), 0),
+            MIN(prediction_time_ms),
+            MAX(prediction_time_ms),
+            COUNT(confidence),
+            COALESCE(SUM(confidence), 0),
+            COALESCE(SUM(confidence * confidence), 0),
+            COUNT(actual_value - output_value),
+            COALESCE(SUM(ABS(actual_value - output_value)), 0)
+        FROM inserted
+        GROUP BY model_id, date_trunc('hour', created_at)
+        ON CONFLICT (model_id, bucket) DO UPDATE SET
+            prediction_count = model_predictions_hourly.prediction_count + EXCLUDED.prediction_count,
+            latency_count = model_predictions_hourly.latency_count + EXCLUDED.latency_count,
+            latency_sum = model_predictions_hourly.latency_sum + EXCLUDED.latency_sum,
+            latency_min = LEAST(model_predictions_hourly.latency_min, EXCLUDED.latency_min),
+            latency_max = GREATEST(model_predictions_hourly.latency_max, EXCLUDED.latency_max),
+            confidence_count = model_predictions_hourly.confidence_count + EXCLUDED.confidence_count,
+            confidence_sum = model_predictions_hourly.confidence_sum + EXCLUDED.confidence_sum,
+            confidence_sumsq = model_predictions_hourly.confidence_sumsq + EXCLUDED.confidence_sumsq,
+            error_count = model_predictions_hourly.error_count + EXCLUDED.error_count,
+            error_sum = model_predictions_hourly.error_sum + EXCLUDED.error_sum
+    """
+
+    def __init__(
+        self,
+        db_connection=None,
+        redis_client=None,
+        models_path: str = "/models",
+        async_pool=None
+    ):
         """
         Initialize Model Repository
 
@@ -30,10 +136,18 @@ class ModelRepository(BaseRepository):
             db_connection: Database connection object
             redis_client: Redis client instance
             models_path: Path to store model files
+            async_pool: Optional asyncpg pool used by the *_async read methods
         """
         super().__init__(db_connection, redis_client)
         self.table_name = 'ml_models'
         self.models_path = models_path
+        self.async_pool = async_pool
+
+        # model_name -> (expires_at, active model or None), see get_active_model
+        self._local_active: Dict[str, Tuple[float, Optional[Dict]]] = {}
+
+        # model_name -> (path, compression) of the last opened active model file
+        self._last_active_files: Dict[str, Tuple[str, Optional[str]]] = {}
 
         # Ensure models directory exists
         os.makedirs(models_path, exist_ok=True)
@@ -42,7 +156,7 @@ class ModelRepository(BaseRepository):
     # MODEL PERSISTENCE
     # ============================================
 
-    def save_model_version(self, model_info: Dict[str, Any], model_bytes: bytes) -> Optional[int]:
+    def save_model_version(self, model_info: Dict[str, Any], model_data: ModelData) -> Optional[int]:
         """
         Save a new model version
 
@@ -57,40 +171,42 @@ class ModelRepository(BaseRepository):
                 - feature_names: List[str]
                 - hyperparameters: Dict
                 - description: str (optional)
+                - model_format: str (optional) pickle, joblib or xgb_json;
+                  defaults to pickle
 
-            model_bytes: Serialized model binary data
+            model_data: Serialized model as bytes, a binary file object or an
+                iterable of byte chunks; streamed to disk without buffering
 
         Returns:
             Model version ID if successful, None otherwise
         """
         try:
-            model_info['created_at'] = datetime.utcnow().isoformat()
-            model_info['updated_at'] = datetime.utcnow().isoformat()
             model_info['is_active'] = False  # Only activate after validation
+            model_info.setdefault('model_format', 'pickle')
 
-            # Save model file
-            model_filename = self._generate_model_filename(
-                model_info['model_name'],
-                model_info['version']
-            )
-            model_filepath = os.path.join(self.models_path, model_filename)
-
-            with open(model_filepath, 'wb') as f:
-                f.write(model_bytes)
+            # Save model file (content-addressed, identical blobs are stored once)
+            model_path, file_size, file_sha256, compression = self._store_model_file(model_data)
 
             # Store metadata in database
-            model_info['model_path'] = model_filename
-            model_info['file_size'] = len(model_bytes)
+            model_info['model_path'] = model_path
+            model_info['file_size'] = file_size
+            model_info['file_sha256'] = file_sha256
+            model_info['compression'] = compression
 
-            columns = ', '.join(model_info.keys())
-            placeholders = ', '.join(['%s'] * len(model_info))
+            columns = ', '.join(list(model_info.keys()) + ['created_at', 'updated_at'])
+            placeholders = ', '.join(['%s'] * len(model_info) + [self._NOW_SQL] * 2)
             query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
 
-            affected = self.execute_update(query, tuple(model_info.values()))
+            values = tuple(
+                self._jsonb(value) if isinstance(value, (dict, list)) else value
+                for value in model_info.values()
+            )
+            affected = self.execute_update(query, values)
 
             if affected > 0:
                 self.log_info(f"Model {model_info['model_name']} v{model_info['version']} saved")
-                self.clear_cache_pattern(f"model:{model_info['model_name']}:*")
+                self.bump_cache_revision(self._cache_scope(model_info['model_name']))
+                self._local_active.pop(model_info['model_name'], None)
                 return model_info.get('id')
 
             return None
@@ -99,6 +215,23 @@ class ModelRepository(BaseRepository):
             self.log_error(f"Error saving model version: {str(e)}")
             return None
 
+    async def save_model_version_async(self, model_info: Dict[str, Any], model_data: ModelData) -> Optional[int]:
+        """
+        Save a new model version without blocking the event loop
+
+        The file write, fsync and metadata insert run in the default
+        thread pool executor.
+
+        Args:
+            model_info: Model metadata (see save_model_version)
+            model_data: Serialized model (see save_model_version)
+
+        Returns:
+            Model version ID if successful, None otherwise
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.save_model_version, model_info, model_data)
+
     def get_model_version(self, model_name: str, version: str) -> Optional[Dict]:
         """
         Get specific model version metadata
@@ -112,12 +245,14 @@ class ModelRepository(BaseRepository):
         """
         try:
             cache_key = f"model:{model_name}:{version}"
-            cached = self.get_cache(cache_key)
+            cached, revision = self.get_cache_with_revision(cache_key, self._cache_scope(model_name))
+            if cached is CACHE_MISS:
+                return None
             if cached:
                 return cached
 
             query = f"""
-                SELECT * FROM {self.table_name}
+                SELECT {self._SELECT_COLUMNS} FROM {self.table_name}
                 WHERE model_name = %s AND version = %s
             """
 
@@ -125,15 +260,68 @@ class ModelRepository(BaseRepository):
 
             if results:
                 model = results[0]
-                self.set_cache(cache_key, model)
+                self.set_cache(cache_key, model, scope=self._cache_scope(model_name), revision=revision)
                 return model
 
+            self.set_cache_miss(
+                cache_key, ttl=self.NEGATIVE_CACHE_TTL, scope=self._cache_scope(model_name), revision=revision
+            )
             return None
 
         except Exception as e:
             self.log_error(f"Error getting model version: {str(e)}")
             return None
 
+    async def get_model_version_async(self, model_name: str, version: str) -> Optional[Dict]:
+        """
+        Get specific model version metadata from an event loop
+
+        Uses the asyncpg pool when one was given; otherwise the synchronous
+        lookup runs in the default thread pool executor.
+
+        Args:
+            model_name: Model name (eta, severity, ambulance, route)
+            version: Version string
+
+        Returns:
+            Model metadata dictionary or None
+        """
+        if self.async_pool is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.get_model_version, model_name, version)
+
+        try:
+            cache_key = f"model:{model_name}:{version}"
+            cached, revision = self.get_cache_with_revision(cache_key, self._cache_scope(model_name))
+            if cached is CACHE_MISS:
+                return None
+            if cached:
+                return cached
+
+            query = f"""
+                SELECT {self._SELECT_COLUMNS} FROM {self.table_name}
+                WHERE model_name = $1 AND version = $2
+            """
+
+            row = await self.async_pool.fetchrow(query, model_name, version)
+
+            if row:
+                model = dict(row)
+                # asyncpg hands json columns back as text unless a codec is registered
+                if isinstance(model.get('metrics'), str):
+                    model['metrics'] = json.loads(model['metrics'])
+                self.set_cache(cache_key, model, scope=self._cache_scope(model_name), revision=revision)
+                return model
+
+            self.set_cache_miss(
+                cache_key, ttl=self.NEGATIVE_CACHE_TTL, scope=self._cache_scope(model_name), revision=revision
+            )
+            return None
+
+        except Exception as e:
+            self.log_error(f"Error getting model version (async): {str(e)}")
+            return None
+
     def get_active_model(self, model_name: str) -> Optional[Dict]:
         """
         Get currently active/deployed model
@@ -144,14 +332,30 @@ class ModelRepository(BaseRepository):
         Returns:
             Active model metadata or None
         """
+        local = self._local_active.get(model_name)
+        if local and local[0] > time.monotonic():
+            return dict(local[1]) if local[1] else None
+
+        model = self._fetch_active_model(model_name)
+
+        if len(self._local_active) >= self.LOCAL_ACTIVE_MAX_ENTRIES:
+            self._local_active.clear()
+        self._local_active[model_name] = (time.monotonic() + self.LOCAL_ACTIVE_TTL, model)
+
+        return dict(model) if model else None
+
+    def _fetch_active_model(self, model_name: str) -> Optional[Dict]:
+        """Active model lookup through Redis and the database"""
         try:
             cache_key = f"model:active:{model_name}"
-            cached = self.get_cache(cache_key)
+            cached, revision = self.get_cache_with_revision(cache_key, self._cache_scope(model_name))
+            if cached is CACHE_MISS:
+                return None
             if cached:
                 return cached
 
             query = f"""
-                SELECT * FROM {self.table_name}
+                SELECT {self._SELECT_COLUMNS} FROM {self.table_name}
                 WHERE model_name = %s AND is_active = TRUE
                 ORDER BY created_at DESC
                 LIMIT 1
@@ -161,9 +365,12 @@ class ModelRepository(BaseRepository):
 
             if results:
                 model = results[0]
-                self.set_cache(cache_key, model, ttl=3600)
+                self.set_cache(cache_key, model, ttl=3600, scope=self._cache_scope(model_name), revision=revision)
                 return model
 
+            self.set_cache_miss(
+                cache_key, ttl=self.NEGATIVE_CACHE_TTL, scope=self._cache_scope(model_name), revision=revision
+            )
             return None
 
         except Exception as e:
@@ -183,12 +390,12 @@ class ModelRepository(BaseRepository):
         """
         try:
             cache_key = f"model:versions:{model_name}"
-            cached = self.get_cache(cache_key)
+            cached, revision = self.get_cache_with_revision(cache_key, self._cache_scope(model_name))
             if cached:
                 return cached
 
             query = f"""
-                SELECT * FROM {self.table_name}
+                SELECT {self._SELECT_COLUMNS} FROM {self.table_name}
                 WHERE model_name = %s
                 ORDER BY created_at DESC
                 LIMIT %s
@@ -197,7 +404,7 @@ class ModelRepository(BaseRepository):
             results = self.execute_query(query, (model_name, limit))
 
             if results:
-                self.set_cache(cache_key, results, ttl=1800)
+                self.set_cache(cache_key, results, ttl=1800, scope=self._cache_scope(model_name), revision=revision)
 
             return results or []
 
@@ -205,6 +412,59 @@ class ModelRepository(BaseRepository):
             self.log_error(f"Error getting model versions: {str(e)}")
             return []
 
+    def get_model_versions_bulk(self, model_names: List[str], limit: int = 10) -> Dict[str, List[Dict]]:
+        """
+        Get versions for several models with one cache MGET and one query for misses
+
+        Args:
+            model_names: Model names
+            limit: Maximum results per model
+
+        Returns:
+            Dictionary of model name -> list of model versions
+        """
+        try:
+            cache_keys = {name: f"model:versions:{name}" for name in model_names}
+            scopes = {key: self._cache_scope(name) for name, key in cache_keys.items()}
+            cached, revisions = self.get_cache_many_with_revisions(list(cache_keys.values()), scopes=scopes)
+
+            versions = {name: cached.get(key) or [] for name, key in cache_keys.items()}
+            missing = [name for name, key in cache_keys.items() if key not in cached]
+
+            if missing:
+                query = f"""
+                    SELECT * FROM (
+                        SELECT {self._SELECT_COLUMNS}, ROW_NUMBER() OVER (
+                            PARTITION BY model_name ORDER BY created_at DESC
+                        ) AS version_rank
+                        FROM {self.table_name}
+                        WHERE model_name = ANY(%s)
+                    ) ranked
+                    WHERE version_rank <= %s
+                    ORDER BY model_name, created_at DESC
+                """
+
+                results = self.execute_query(query, (missing, limit)) or []
+
+                fetched = {}
+                for row in results:
+                    row.pop('version_rank', None)
+                    fetched.setdefault(row['model_name'], []).append(row)
+
+                versions.update(fetched)
+                self.set_cache_many(
+                    {cache_keys[name]: rows for name, rows in fetched.items()},
+                    ttl=1800,
+                    scopes=scopes,
+                    revisions=revisions
+                )
+
+            return versions
+
+        except Exception as e:
+            self.log_error(f"Error getting bulk model versions: {str(e)}")
+            return {name: [] for name in model_names}
+
     # ============================================
     # MODEL DEPLOYMENT
     # ============================================
@@ -220,38 +480,36 @@ class ModelRepository(BaseRepository):
             True if successful
         """
         try:
-            # Get model info first
-            query = f"SELECT * FROM {self.table_name} WHERE id = %s"
-            results = self.execute_query(query, (model_id,))
-
-            if not results:
-                return False
-
-            model = results[0]
-            model_name = model['model_name']
-
-            # Deactivate all previous versions
-            deactivate_query = f"""
-                UPDATE {self.table_name}
-                SET is_active = FALSE, updated_at = %s
-                WHERE model_name = %s
-            """
-            self.execute_update(deactivate_query, (datetime.utcnow().isoformat(), model_name))
-
-            # Activate new version
-            activate_query = f"""
+            # Deactivate the current version and activate the new one in a single
+            # atomic statement. The activating UPDATE references the deactivate CTE
+            # so it runs first, keeping the "one active per model" index satisfied.
+            query = f"""
+                WITH target AS (
+                    SELECT model_name FROM {self.table_name} WHERE id = %s
+                ), deactivated AS (
+                    UPDATE {self.table_name}
+                    SET is_active = FALSE, updated_at = {self._NOW_SQL}
+                    WHERE model_name = (SELECT model_name FROM target)
+                      AND is_active
+                      AND id <> %s
+                    RETURNING id
+                )
                 UPDATE {self.table_name}
-                SET is_active = TRUE, activated_at = %s, updated_at = %s
+                SET is_active = TRUE, activated_at = {self._NOW_SQL}, updated_at = {self._NOW_SQL}
                 WHERE id = %s
+                  AND (SELECT COUNT(*) FROM deactivated) >= 0
+                RETURNING model_name, version
             """
 
-            now = datetime.utcnow().isoformat()
-            affected = self.execute_update(activate_query, (now, now, model_id))
+            results = self.execute_query(query, (model_id, model_id, model_id))
 
-            if affected > 0:
-                # Clear cache
-                self.delete_cache(f"model:active:{model_name}")
-                self.clear_cache_pattern(f"model:{model_name}:*")
+            if results:
+                model = results[0]
+                model_name = model['model_name']
+
+                # Invalidate cache
+                self.bump_cache_revision(self._cache_scope(model_name), self.ACTIVE_MODELS_SCOPE)
+                self._local_active.pop(model_name, None)
 
                 self.log_info(f"Model {model_name} v{model['version']} activated")
                 return True
@@ -273,23 +531,22 @@ class ModelRepository(BaseRepository):
             True if successful
         """
         try:
+            # RETURNING gives us the model name for cache invalidation in the same round trip
             query = f"""
                 UPDATE {self.table_name}
-                SET is_active = FALSE, updated_at = %s
+                SET is_active = FALSE, updated_at = {self._NOW_SQL}
                 WHERE id = %s
+                RETURNING model_name, version
             """
 
-            affected = self.execute_update(query, (datetime.utcnow().isoformat(), model_id))
+            results = self.execute_query(query, (model_id,))
 
-            if affected > 0:
-                # Clear relevant caches
-                results = self.execute_query(f"SELECT model_name FROM {self.table_name} WHERE id = %s", (model_id,))
-                if results:
-                    model_name = results[0]['model_name']
-                    self.delete_cache(f"model:active:{model_name}")
-                    self.clear_cache_pattern(f"model:{model_name}:*")
+            if results:
+                model_name = results[0]['model_name']
+                self.bump_cache_revision(self._cache_scope(model_name), self.ACTIVE_MODELS_SCOPE)
+                self._local_active.pop(model_name, None)
 
-                self.log_info(f"Model {model_id} deactivated")
+                self.log_info(f"Model {model_name} v{results[0]['version']} deactivated")
                 return True
 
             return False
@@ -325,13 +582,21 @@ class ModelRepository(BaseRepository):
                 'input_features': performance_data.get('input_features'),
                 'output_value': performance_data.get('output_value'),
                 'confidence': performance_data.get('confidence'),
-                'actual_value': performance_data.get('actual_value'),
-                'created_at': datetime.utcnow().isoformat()
+                'actual_value': performance_data.get('actual_value')
             }
 
-            columns = ', '.join(perf_data.keys())
-            placeholders = ', '.join(['%s'] * len(perf_data))
-            query = f"INSERT INTO model_predictions ({columns}) VALUES ({placeholders})"
+            columns = ', '.join(list(perf_data.keys()) + ['created_at'])
+            placeholders = ', '.join(['%s'] * len(perf_data) + [self._NOW_SQL])
+
+            # Insert the raw prediction and fold it into the hourly rollup in one statement
+            query = f"""
+                WITH inserted AS (
+                    INSERT INTO model_predictions ({columns}) VALUES ({placeholders})
+                    RETURNING model_id, created_at, prediction_time_ms,
+                              confidence, output_value, actual_value
+                )
+                {self._PERF_ROLLUP_UPSERT}
+            """
 
             affected = self.execute_update(query, tuple(perf_data.values()))
 
@@ -341,6 +606,50 @@ class ModelRepository(BaseRepository):
             self.log_error(f"Error recording prediction performance: {str(e)}")
             return False
 
+    def record_prediction_performance_bulk(self, model_id: int, rows: List[Dict[str, Any]]) -> int:
+        """
+        Record many prediction performance rows in a single statement
+
+        Args:
+            model_id: Model ID
+            rows: List of dictionaries with the same keys as
+                record_prediction_performance's performance_data
+
+        Returns:
+            Number of rows inserted
+        """
+        try:
+            if not rows:
+                return 0
+
+            fields = ('prediction_time_ms', 'input_features', 'output_value', 'confidence', 'actual_value')
+            columns = ', '.join(('model_id',) + fields + ('created_at',))
+            row_placeholders = '(' + ', '.join(['%s'] * (len(fields) + 1) + [self._NOW_SQL]) + ')'
+
+            params = []
+            for row in rows:
+                params.append(model_id)
+                params.extend(row.get(field) for field in fields)
+
+            # One multi-row INSERT, folded into the hourly rollup like the single-row path
+            query = f"""
+                WITH inserted AS (
+                    INSERT INTO model_predictions ({columns})
+                    VALUES {', '.join([row_placeholders] * len(rows))}
+                    RETURNING model_id, created_at, prediction_time_ms,
+                              confidence, output_value, actual_value
+                )
+                {self._PERF_ROLLUP_UPSERT}
+            """
+
+            self.execute_update(query, tuple(params))
+
+            return len(rows)
+
+        except Exception as e:
+            self.log_error(f"Error recording prediction performance batch: {str(e)}")
+            return 0
+
     def get_model_performance_stats(self, model_id: int, hours: int = 24) -> Dict[str, Any]:
         """
         Get performance statistics for model
@@ -360,21 +669,23 @@ class ModelRepository(BaseRepository):
 
             cutoff_time = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
 
-            query = """
+            # Aggregate O(hours) rollup rows instead of scanning every prediction.
+            # The window is aligned to the hour bucket containing the cutoff.
+            # p99 cannot be merged from rollup sums, so it is computed from the raw
+            # latencies in the window (an index range scan on model_id, created_at).
+            query = f"""
                 SELECT
-                    COUNT(*) as total_predictions,
-                    AVG(prediction_time_ms) as avg_prediction_time,
-                    MIN(prediction_time_ms) as min_prediction_time,
-                    MAX(prediction_time_ms) as max_prediction_time,
-                    AVG(confidence) as avg_confidence,
-                    STDDEV(confidence) as stddev_confidence,
-                    AVG(ABS(actual_value - output_value)) as mae,
-                    MAX(prediction_time_ms) as p99_latency
-                FROM model_predictions
-                WHERE model_id = %s AND created_at >= %s
+                    {self._PERF_STATS_COLUMNS},
+                    (
+                        SELECT percentile_cont(0.99) WITHIN GROUP (ORDER BY prediction_time_ms)
+                        FROM model_predictions
+                        WHERE model_id = %s AND created_at >= %s
+                    ) as p99_latency
+                FROM model_predictions_hourly
+                WHERE model_id = %s AND bucket >= date_trunc('hour', %s::timestamp)
             """
 
-            results = self.execute_query(query, (model_id, cutoff_time))
+            results = self.execute_query(query, (model_id, cutoff_time, model_id, cutoff_time))
 
             if results:
                 stats = results[0]
@@ -387,45 +698,124 @@ class ModelRepository(BaseRepository):
             self.log_error(f"Error getting model performance stats: {str(e)}")
             return {}
 
+    def get_performance_stats_bulk(self, model_ids: List[int], hours: int = 24) -> Dict[int, Dict[str, Any]]:
+        """
+        Get performance statistics for several models with one query for cache misses
+
+        Args:
+            model_ids: Model IDs
+            hours: Look back how many hours
+
+        Returns:
+            Dictionary of model ID -> performance metrics (see get_model_performance_stats)
+        """
+        try:
+            cache_keys = {model_id: f"model_perf:{model_id}:{hours}h" for model_id in model_ids}
+            cached = self.get_cache_many(list(cache_keys.values()))
+
+            stats = {model_id: cached[key] for model_id, key in cache_keys.items() if cached.get(key)}
+            missing = [model_id for model_id in model_ids if model_id not in stats]
+
+            if missing:
+                cutoff_time = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+
+                query = f"""
+                    SELECT
+                        h.model_id,
+                        {self._PERF_STATS_COLUMNS},
+                        p.p99_latency
+                    FROM model_predictions_hourly h
+                    LEFT JOIN (
+                        SELECT model_id,
+                               percentile_cont(0.99) WITHIN GROUP (ORDER BY prediction_time_ms) as p99_latency
+                        FROM model_predictions
+                        WHERE model_id = ANY(%s) AND created_at >= %s
+                        GROUP BY model_id
+                    ) p ON p.model_id = h.model_id
+                    WHERE h.model_id = ANY(%s) AND h.bucket >= date_trunc('hour', %s::timestamp)
+                    GROUP BY h.model_id, p.p99_latency
+                """
+
+                results = self.execute_query(query, (missing, cutoff_time, missing, cutoff_time)) or []
+
+                fetched = {row.pop('model_id'): row for row in results}
+
+                # Models without predictions in the window get the same shape as the single-model query
+                for model_id in missing:
+                    fetched.setdefault(model_id, {
+                        'total_predictions': 0,
+                        'avg_prediction_time': None,
+                        'min_prediction_time': None,
+                        'max_prediction_time': None,
+                        'avg_confidence': None,
+                        'stddev_confidence': None,
+                        'mae': None,
+                        'p99_latency': None
+                    })
+
+                stats.update(fetched)
+                self.set_cache_many({cache_keys[model_id]: row for model_id, row in fetched.items()}, ttl=600)
+
+            return stats
+
+        except Exception as e:
+            self.log_error(f"Error getting bulk performance stats: {str(e)}")
+            return {}
+
     # ============================================
     # MODEL COMPARISON & VALIDATION
     # ============================================
 
-    def compare_models(self, model_name: str) -> Dict[str, Any]:
+    def compare_models(self, model_name: str, metric_filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Compare all versions of a model
 
         Args:
             model_name: Model name
+            metric_filter: Optional metrics subset to match, evaluated in the
+                database as metrics @> filter (GIN index on metrics)
 
         Returns:
             Comparison dictionary with metrics
         """
         try:
             cache_key = f"model_comparison:{model_name}"
-            cached = self.get_cache(cache_key)
-            if cached:
-                return cached
+            revision = None
+            if not metric_filter:
+                cached, revision = self.get_cache_with_revision(cache_key, self._cache_scope(model_name))
+                if cached:
+                    return cached
+
+            params: Tuple[Any, ...] = (model_name,)
+            metric_clause = ""
+            if metric_filter:
+                metric_clause = "AND metrics @> %s"
+                params += (self._jsonb(metric_filter),)
 
             query = f"""
                 SELECT
                     id, version, created_at, is_active,
                     training_samples, metrics
                 FROM {self.table_name}
-                WHERE model_name = %s
+                WHERE model_name = %s {metric_clause}
                 ORDER BY created_at DESC
                 LIMIT 5
             """
 
-            results = self.execute_query(query, (model_name,))
+            results = self.execute_query(query, params) or []
+
+            # Rows written before the jsonb migration come back as text
+            for row in results:
+                if isinstance(row.get('metrics'), str):
+                    row['metrics'] = json.loads(row['metrics'])
 
             comparison = {
                 'model_name': model_name,
-                'versions': results or []
+                'versions': results
             }
 
-            if comparison['versions']:
-                self.set_cache(cache_key, comparison, ttl=3600)
+            if comparison['versions'] and not metric_filter:
+                self.set_cache(cache_key, comparison, ttl=3600, scope=self._cache_scope(model_name), revision=revision)
 
             return comparison
 
@@ -445,24 +835,23 @@ class ModelRepository(BaseRepository):
             True if successful
         """
         try:
-            update_data = {
-                'validation_metrics': json.dumps(validation_metrics),
-                'validated_at': datetime.utcnow().isoformat(),
-                'updated_at': datetime.utcnow().isoformat()
-            }
-
-            updates = ', '.join([f"{k} = %s" for k in update_data.keys()])
-            query = f"UPDATE {self.table_name} SET {updates} WHERE id = %s"
+            query = f"""
+                UPDATE {self.table_name}
+                SET validation_metrics = %s,
+                    validated_at = {self._NOW_SQL},
+                    updated_at = {self._NOW_SQL}
+                WHERE id = %s
+            """
 
-            values = list(update_data.values()) + [model_id]
-            affected = self.execute_update(query, tuple(values))
+            affected = self.execute_update(query, (self._jsonb(validation_metrics), model_id))
 
             if affected > 0:
-                # Clear cache
+                # Invalidate cache
                 results = self.execute_query(f"SELECT model_name, version FROM {self.table_name} WHERE id = %s", (model_id,))
                 if results:
                     model = results[0]
-                    self.clear_cache_pattern(f"model:{model['model_name']}:*")
+                    self.bump_cache_revision(self._cache_scope(model['model_name']))
+                    self._local_active.pop(model['model_name'], None)
 
                 self.log_info(f"Model {model_id} validated with metrics: {validation_metrics}")
                 return True
@@ -477,9 +866,33 @@ class ModelRepository(BaseRepository):
     # MODEL FILE OPERATIONS
     # ============================================
 
+    def get_model_file_path(self, model_name: str, version: str) -> Optional[str]:
+        """
+        Get absolute path of a model file
+
+        Lets HTTP handlers stream the file with Flask's send_file (sendfile(2))
+        instead of copying the whole model through Python memory. The file is
+        stored as-is on disk, i.e. zstd-compressed when the version's
+        'compression' field says so.
+
+        Args:
+            model_name: Model name
+            version: Model version
+
+        Returns:
+            Absolute file path or None
+        """
+        try:
+            resolved = self._resolve_model_file(model_name, version)
+            return resolved[0] if resolved else None
+
+        except Exception as e:
+            self.log_error(f"Error resolving model file path: {str(e)}")
+            return None
+
     def get_model_file(self, model_name: str, version: str) -> Optional[bytes]:
         """
-        Get model file bytes
+        Get model file bytes (decompressed)
 
         Args:
             model_name: Model name
@@ -489,22 +902,100 @@ class ModelRepository(BaseRepository):
             Model bytes or None
         """
         try:
-            # Get metadata first
-            model = self.get_model_version(model_name, version)
-            if not model:
+            stream = self.open_model_file(model_name, version)
+            if stream is None:
                 return None
 
-            model_filepath = os.path.join(self.models_path, model['model_path'])
+            with stream:
+                return stream.read()
+
+        except Exception as e:
+            self.log_error(f"Error reading model file: {str(e)}")
+            return None
+
+    def open_model_file(self, model_name: str, version: str) -> Optional[BinaryIO]:
+        """
+        Open a model file for reading without copying it into memory
+
+        The file is mapped read-only, so the OS pages it in on demand and
+        processes loading the same model share page cache pages. Compressed
+        files are decompressed as a stream on top of the map. The caller owns
+        the returned stream and must close it (it supports the context manager
+        protocol and pickle.load).
+
+        Args:
+            model_name: Model name
+            version: Model version
 
-            if not os.path.exists(model_filepath):
-                self.log_warning(f"Model file not found: {model_filepath}")
+        Returns:
+            Readable binary stream or None
+        """
+        try:
+            resolved = self._resolve_model_file(model_name, version)
+            if not resolved:
                 return None
 
-            with open(model_filepath, 'rb') as f:
-                return f.read()
+            return self._map_model_file(*resolved)
 
         except Exception as e:
-            self.log_error(f"Error reading model file: {str(e)}")
+            self.log_error(f"Error opening model file: {str(e)}")
+            return None
+
+    def get_active_model_file(self, model_name: str) -> Optional[bytes]:
+        """
+        Get the active model's file bytes (decompressed)
+
+        Args:
+            model_name: Model name
+
+        Returns:
+            Model bytes or None
+        """
+        try:
+            stream = self.open_active_model_file(model_name)
+            if stream is None:
+                return None
+
+            with stream:
+                return stream.read()
+
+        except Exception as e:
+            self.log_error(f"Error reading active model file: {str(e)}")
+            return None
+
+    def open_active_model_file(self, model_name: str) -> Optional[BinaryIO]:
+        """
+        Open the active model's file (see open_model_file)
+
+        Before looking up the active version, readahead is requested for the
+        file that was active last time, so the disk read overlaps the metadata
+        round trip. If the active version changed in the meantime the
+        prefetched pages are simply not used.
+
+        Args:
+            model_name: Model name
+
+        Returns:
+            Readable binary stream or None
+        """
+        try:
+            last_active = self._last_active_files.get(model_name)
+            if last_active:
+                self._prefetch_model_file(last_active[0])
+
+            model = self.get_active_model(model_name)
+            if not model:
+                return None
+
+            resolved = self._model_file_location(model)
+            if not resolved:
+                return None
+
+            self._last_active_files[model_name] = resolved
+            return self._map_model_file(*resolved)
+
+        except Exception as e:
+            self.log_error(f"Error opening active model file: {str(e)}")
             return None
 
     def delete_model_version(self, model_id: int) -> bool:
@@ -518,34 +1009,36 @@ class ModelRepository(BaseRepository):
             True if successful
         """
         try:
-            # Get model info
-            results = self.execute_query(f"SELECT * FROM {self.table_name} WHERE id = %s", (model_id,))
+            # Archive in database (soft delete), returning what we need to clean up
+            query = f"""
+                UPDATE {self.table_name}
+                SET is_active = FALSE, deleted_at = {self._NOW_SQL}
+                WHERE id = %s
+                RETURNING model_name, version, model_path,
+                    EXISTS (
+                        SELECT 1 FROM {self.table_name} other
+                        WHERE other.model_path = {self.table_name}.model_path
+                          AND other.id <> {self.table_name}.id
+                          AND other.deleted_at IS NULL
+                    ) AS path_shared
+            """
+
+            results = self.execute_query(query, (model_id,))
 
             if not results:
                 return False
 
             model = results[0]
+            self.bump_cache_revision(self._cache_scope(model['model_name']), self.ACTIVE_MODELS_SCOPE)
+            self._local_active.pop(model['model_name'], None)
 
-            # Delete file
+            # Delete file unless another live version shares the same content
             model_filepath = os.path.join(self.models_path, model['model_path'])
-            if os.path.exists(model_filepath):
+            if not model.get('path_shared') and os.path.exists(model_filepath):
                 os.remove(model_filepath)
                 self.log_info(f"Model file deleted: {model_filepath}")
 
-            # Archive in database (soft delete)
-            query = f"""
-                UPDATE {self.table_name}
-                SET is_active = FALSE, deleted_at = %s
-                WHERE id = %s
-            """
-
-            affected = self.execute_update(query, (datetime.utcnow().isoformat(), model_id))
-
-            if affected > 0:
-                self.clear_cache_pattern(f"model:{model['model_name']}:*")
-                return True
-
-            return False
+            return True
 
         except Exception as e:
             self.log_error(f"Error deleting model version: {str(e)}")
@@ -555,19 +1048,237 @@ class ModelRepository(BaseRepository):
     # HELPER METHODS
     # ============================================
 
-    def _generate_model_filename(self, model_name: str, version: str) -> str:
+    @staticmethod
+    def _content_address_path(file_sha256: str, compression: Optional[str] = None) -> str:
+        """
+        Generate model path relative to models_path from the content hash
+
+        Args:
+            file_sha256: SHA-256 hex digest of the uncompressed model bytes
+            compression: Compression codec ('zstd') or None
+
+        Returns:
+            Relative path string (sha256/<aa>/<bb>/<digest>.pkl[.zst])
+        """
+        suffix = '.pkl.zst' if compression == 'zstd' else '.pkl'
+        return os.path.join('sha256', file_sha256[:2], file_sha256[2:4], f"{file_sha256}{suffix}")
+
+    def _resolve_model_file(self, model_name: str, version: str) -> Optional[Tuple[str, Optional[str]]]:
         """
-        Generate model filename from name and version
+        Resolve the absolute file path and compression codec of a model version
 
         Args:
             model_name: Model name
-            version: Version string
+            version: Model version
+
+        Returns:
+            Tuple of (absolute path, compression) or None
+        """
+        model = self.get_model_version(model_name, version)
+        if not model:
+            return None
+
+        return self._model_file_location(model)
+
+    def _model_file_location(self, model: Dict) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Absolute file path and compression codec from model metadata
+
+        Args:
+            model: Model metadata row
+
+        Returns:
+            Tuple of (absolute path, compression) or None if the file is missing
+        """
+        model_filepath = os.path.abspath(os.path.join(self.models_path, model['model_path']))
+
+        if not os.path.exists(model_filepath):
+            self.log_warning(f"Model file not found: {model_filepath}")
+            return None
+
+        return model_filepath, model.get('compression')
+
+    def _map_model_file(self, model_filepath: str, compression: Optional[str]) -> Optional[BinaryIO]:
+        """
+        Memory-map a model file, wrapping it in a zstd stream when compressed
+
+        Args:
+            model_filepath: Absolute file path
+            compression: Compression codec recorded for the file
 
         Returns:
-            Filename string
+            Readable binary stream or None
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        return f"{model_name}_v{version}_{timestamp}.pkl"
+        if compression == 'zstd' and zstandard is None:
+            self.log_error(f"zstandard is required to read {model_filepath}")
+            return None
+
+        fd = os.open(model_filepath, os.O_RDONLY)
+        try:
+            buffer = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+
+        if hasattr(buffer, 'madvise'):
+            buffer.madvise(mmap.MADV_SEQUENTIAL)
+            buffer.madvise(mmap.MADV_WILLNEED)
+
+        if compression == 'zstd':
+            reader = zstandard.ZstdDecompressor().stream_reader(buffer, closefd=True)
+            return io.BufferedReader(reader, buffer_size=self.MODEL_CHUNK_BYTES)
+
+        return buffer
+
+    @staticmethod
+    def _prefetch_model_file(model_filepath: str) -> None:
+        """Ask the kernel to start reading a file into the page cache (non-blocking)"""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+
+        try:
+            fd = os.open(model_filepath, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    def _store_model_file(self, model_data: ModelData) -> Tuple[str, int, str, Optional[str]]:
+        """
+        Store model data under its content address
+
+        In-memory blobs whose content is already stored are not written at all;
+        streamed data is written to a temporary file and discarded if a file
+        with the same digest exists. Data is zstd-compressed when the
+        zstandard package is available.
+
+        Args:
+            model_data: Serialized model (bytes, binary file object or chunks)
+
+        Returns:
+            Tuple of (relative model path, file size on disk, SHA-256 hex digest
+            of the uncompressed data, compression codec or None)
+        """
+        compression = 'zstd' if zstandard is not None else None
+
+        if isinstance(model_data, (bytes, bytearray, memoryview)):
+            file_sha256 = hashlib.sha256(model_data).hexdigest()
+            model_path = self._content_address_path(file_sha256, compression)
+            model_filepath = os.path.join(self.models_path, model_path)
+            if os.path.exists(model_filepath):
+                self.log_info(f"Model content already stored: {model_path}")
+                return model_path, os.path.getsize(model_filepath), file_sha256, compression
+
+        tmp_filepath = os.path.join(self.models_path, f".upload-{uuid.uuid4().hex}.tmp")
+        try:
+            file_size, file_sha256 = self._write_model_file(tmp_filepath, model_data, compression)
+
+            model_path = self._content_address_path(file_sha256, compression)
+            model_filepath = os.path.join(self.models_path, model_path)
+
+            if os.path.exists(model_filepath):
+                os.remove(tmp_filepath)
+                self.log_info(f"Model content already stored: {model_path}")
+            else:
+                os.makedirs(os.path.dirname(model_filepath), exist_ok=True)
+                os.replace(tmp_filepath, model_filepath)
+
+            return model_path, file_size, file_sha256, compression
+
+        except Exception:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+            raise
+
+    def _write_model_file(
+        self,
+        model_filepath: str,
+        model_data: ModelData,
+        compression: Optional[str] = None
+    ) -> Tuple[int, str]:
+        """
+        Stream model data to disk and flush it
+
+        Large blobs are dropped from the page cache once persisted so a model
+        upload does not evict hot data.
+
+        Args:
+            model_filepath: Destination path
+            model_data: Serialized model (bytes, binary file object or chunks)
+            compression: 'zstd' to compress while writing, or None
+
+        Returns:
+            Tuple of (bytes written, SHA-256 hex digest of the uncompressed data)
+        """
+        digest = hashlib.sha256()
+        compressor = None
+        if compression == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=self.ZSTD_LEVEL, threads=-1).compressobj()
+        offset = 0
+
+        fd = os.open(model_filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            for chunk in self._iter_model_chunks(model_data):
+                digest.update(chunk)
+                offset = self._pwrite_all(fd, compressor.compress(chunk) if compressor else chunk, offset)
+
+            if compressor:
+                offset = self._pwrite_all(fd, compressor.flush(), offset)
+
+            os.fsync(fd)
+
+            if offset > self.LARGE_MODEL_BYTES and hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+        return offset, digest.hexdigest()
+
+    @staticmethod
+    def _pwrite_all(fd: int, data: bytes, offset: int) -> int:
+        """Write all of data at offset and return the offset past it"""
+        view = memoryview(data)
+        written = 0
+        while written < len(view):
+            written += os.pwrite(fd, view[written:], offset + written)
+        return offset + written
+
+    def _iter_model_chunks(self, model_data: ModelData) -> Iterator[bytes]:
+        """Yield model data as byte chunks of at most MODEL_CHUNK_BYTES"""
+        if isinstance(model_data, (bytes, bytearray, memoryview)):
+            yield model_data
+        elif hasattr(model_data, 'read'):
+            while True:
+                chunk = model_data.read(self.MODEL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            yield from model_data
+
+    @staticmethod
+    def _jsonb(value: Any) -> Any:
+        """Adapt a dict/list for a jsonb column"""
+        return Json(value) if Json is not None else json.dumps(value)
+
+    @staticmethod
+    def _cache_scope(model_name: str) -> str:
+        """Cache revision scope shared by all cached entries of a model"""
+        return f"model:{model_name}"
+
+    def get_model_revision(self, model_name: Optional[str] = None) -> Optional[int]:
+        """
+        Revision counter bumped whenever a model's metadata changes
+
+        Args:
+            model_name: Model name, or None for the all-active listing
+
+        Returns:
+            Revision counter, or None if the cache is unavailable
+        """
+        scope = self.ACTIVE_MODELS_SCOPE if model_name is None else self._cache_scope(model_name)
+        return self.get_cache_revision(scope)
 
     def get_all_active_models(self) -> List[Dict]:
         """
@@ -578,12 +1289,12 @@ class ModelRepository(BaseRepository):
         """
         try:
             cache_key = "models:all_active"
-            cached = self.get_cache(cache_key)
+            cached, revision = self.get_cache_with_revision(cache_key, self.ACTIVE_MODELS_SCOPE)
             if cached:
                 return cached
 
             query = f"""
-                SELECT * FROM {self.table_name}
+                SELECT {self._SELECT_COLUMNS} FROM {self.table_name}
                 WHERE is_active = TRUE
                 ORDER BY model_name, created_at DESC
             """
@@ -591,7 +1302,7 @@ class ModelRepository(BaseRepository):
             results = self.execute_query(query)
 
             if results:
-                self.set_cache(cache_key, results, ttl=3600)
+                self.set_cache(cache_key, results, ttl=3600, scope=self.ACTIVE_MODELS_SCOPE, revision=revision)
 
             return results or []
 
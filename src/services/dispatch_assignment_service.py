@@ -3,18 +3,42 @@ Dispatch Assignment Service - Fase 1 (Deterministic Rules)
 Handles ambulance selection and paramedic assignment based on deterministic rules
 """
 
+from collections import deque, namedtuple
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-import json
 import logging
 import math
 
+import numpy as np
+import orjson
+
+try:
+    from sklearn.neighbors import BallTree
+except ImportError:  # Sin scikit-learn se usa siempre el cálculo vectorizado
+    BallTree = None
+
 from ..repositories.dispatch_repository import DispatchRepository
 from ..repositories.assignment_history_repository import AssignmentHistoryRepository
 from ..config.settings import Config
+from ..utils.geo import haversine_vector
 
 logger = logging.getLogger(__name__)
 
+# Campos obligatorios de una solicitud de asignación
+REQUIRED_DISPATCH_FIELDS = frozenset({
+    'dispatch_id',
+    'patient_latitude',
+    'patient_longitude',
+    'severity_level',
+    'emergency_type'
+})
+
+# Regla de asignación de personal para un nivel de severidad
+PersonnelRule = namedtuple(
+    'PersonnelRule',
+    'min_paramedics levels include_nurse include_specialist description'
+)
+
 
 class DispatchAssignmentService:
     """
@@ -26,6 +50,23 @@ class DispatchAssignmentService:
     3. Asignación de personal según severidad
     """
 
+    # Desde este tamaño de flota se consulta un BallTree en lugar de calcular todas las distancias
+    AMBULANCE_TREE_MIN_SIZE = 32
+
+    # Desplazamiento máximo (grados, ~100 m) desde que se construyó el BallTree antes de reconstruirlo
+    AMBULANCE_TREE_MAX_DRIFT_DEG = 0.001
+
+    # Candidatas del BallTree que se re-ordenan con las posiciones actuales
+    AMBULANCE_TREE_RERANK_K = 8
+
+    # Pre-filtro por caja lat/lon: km por grado y holgura sobre la distancia máxima
+    KM_PER_DEGREE = 111.0
+    BBOX_SLACK = 1.1
+
+    # Tramos de distancia (km, inclusivos) -> confianza de la asignación
+    _CONF_BINS = np.array([2.0, 5.0, 10.0])
+    _CONF_VALS = np.array([0.95, 0.85, 0.7, 0.5])
+
     def __init__(
         self,
         dispatch_repo: DispatchRepository = None,
@@ -41,43 +82,59 @@ class DispatchAssignmentService:
         self.dispatch_repo = dispatch_repo
         self.assignment_history_repo = assignment_history_repo
 
+        # (ids, lats, lons, BallTree) de la última flota indexada; se asigna como una
+        # sola tupla para que un hilo nunca combine la clave de un árbol con otro árbol
+        self._amb_tree_cache = None
+
         # Configuración de reglas para asignación de personal
         self.paramedic_assignment_rules = {
-            5: {  # Crítico/Extremo
-                'min_paramedics': 3,
-                'levels': ['senior', 'senior', 'junior'],
-                'include_nurse': True,
-                'include_specialist': True,
-                'description': 'Critical case - 3 paramedics + nurse + specialist'
-            },
-            4: {  # Alto
-                'min_paramedics': 2,
-                'levels': ['senior', 'junior'],
-                'include_nurse': True,
-                'include_specialist': False,
-                'description': 'High severity - 2 paramedics + nurse'
-            },
-            3: {  # Medio
-                'min_paramedics': 2,
-                'levels': ['junior', 'junior'],
-                'include_nurse': False,
-                'include_specialist': False,
-                'description': 'Medium severity - 2 paramedics'
-            },
-            2: {  # Bajo-Medio
-                'min_paramedics': 1,
-                'levels': ['junior'],
-                'include_nurse': False,
-                'include_specialist': False,
-                'description': 'Low-Medium severity - 1 paramedic'
-            },
-            1: {  # Bajo
-                'min_paramedics': 1,
-                'levels': ['junior'],
-                'include_nurse': False,
-                'include_specialist': False,
-                'description': 'Low severity - 1 paramedic'
-            }
+            5: PersonnelRule(  # Crítico/Extremo
+                min_paramedics=3,
+                levels=('senior', 'senior', 'junior'),
+                include_nurse=True,
+                include_specialist=True,
+                description='Critical case - 3 paramedics + nurse + specialist'
+            ),
+            4: PersonnelRule(  # Alto
+                min_paramedics=2,
+                levels=('senior', 'junior'),
+                include_nurse=True,
+                include_specialist=False,
+                description='High severity - 2 paramedics + nurse'
+            ),
+            3: PersonnelRule(  # Medio
+                min_paramedics=2,
+                levels=('junior', 'junior'),
+                include_nurse=False,
+                include_specialist=False,
+                description='Medium severity - 2 paramedics'
+            ),
+            2: PersonnelRule(  # Bajo-Medio
+                min_paramedics=1,
+                levels=('junior',),
+                include_nurse=False,
+                include_specialist=False,
+                description='Low-Medium severity - 1 paramedic'
+            ),
+            1: PersonnelRule(  # Bajo
+                min_paramedics=1,
+                levels=('junior',),
+                include_nurse=False,
+                include_specialist=False,
+                description='Low severity - 1 paramedic'
+            )
+        }
+
+        # Reglas indexadas directamente por severidad (posición 0 sin uso)
+        self._rules = (None,) + tuple(
+            self.paramedic_assignment_rules[severity]
+            for severity in range(1, max(self.paramedic_assignment_rules) + 1)
+        )
+
+        # Texto fijo del razonamiento por severidad; por asignación solo se completan los valores
+        self._reasoning_templates = {
+            severity: f"Severity {severity}: {{count}} paramedics{{nurse}}"
+            for severity in self.paramedic_assignment_rules
         }
 
     # ============================================
@@ -117,6 +174,9 @@ class DispatchAssignmentService:
                     'error': STR (si aplica)
                 }
         """
+        # Un solo timestamp por solicitud (respuesta de éxito o de error)
+        timestamp = datetime.utcnow().isoformat()
+
         try:
             dispatch_id = dispatch_data.get('dispatch_id')
             severity = dispatch_data.get('severity_level', 3)
@@ -127,13 +187,15 @@ class DispatchAssignmentService:
             if not self._validate_input_data(dispatch_data):
                 return self._error_response(
                     "Invalid input data",
-                    dispatch_id
+                    dispatch_id,
+                    timestamp
                 )
 
             # ============================================
             # PASO 1: SELECCIONAR AMBULANCIA
             # ============================================
-            ambulance_result = self._select_ambulance(dispatch_data)
+            fleet = self._normalize_ambulances(dispatch_data.get('available_ambulances') or [])
+            ambulance_result = self._select_ambulance(dispatch_data, fleet)
 
             if not ambulance_result['success']:
                 return ambulance_result
@@ -142,7 +204,7 @@ class DispatchAssignmentService:
             distance_km = ambulance_result['distance_km']
             confidence_ambulance = ambulance_result['confidence']
 
-            logger.info(f"Ambulance {ambulance_id} selected at {distance_km}km")
+            logger.info(f"Ambulance {ambulance_id} selected at {distance_km:.2f}km")
 
             # ============================================
             # PASO 2: ASIGNAR PERSONAL
@@ -162,7 +224,7 @@ class DispatchAssignmentService:
             # ============================================
             # PASO 3: CALCULAR CONFIANZA GENERAL
             # ============================================
-            overall_confidence = (confidence_ambulance + confidence_paramedics) / 2
+            overall_confidence = (confidence_ambulance + confidence_paramedics) * 0.5
 
             # ============================================
             # PASO 4: REGISTRAR EN HISTÓRICO
@@ -195,19 +257,19 @@ class DispatchAssignmentService:
                     paramedic_result,
                     distance_km
                 ),
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': timestamp,
                 'history_id': history_result.get('history_id')
             }
 
         except Exception as e:
             logger.error(f"Error in assignment process: {str(e)}")
-            return self._error_response(f"Assignment failed: {str(e)}", dispatch_data.get('dispatch_id'))
+            return self._error_response(f"Assignment failed: {str(e)}", dispatch_data.get('dispatch_id'), timestamp)
 
     # ============================================
     # RULE 1: SELECT NEAREST AMBULANCE
     # ============================================
 
-    def _select_ambulance(self, dispatch_data: Dict) -> Dict:
+    def _select_ambulance(self, dispatch_data: Dict, fleet: Optional[Dict] = None) -> Dict:
         """
         REGLA 1: Seleccionar ambulancia más cercana disponible
 
@@ -219,6 +281,8 @@ class DispatchAssignmentService:
 
         Args:
             dispatch_data: Datos de la solicitud
+            fleet: Flota normalizada (ver _normalize_ambulances); se calcula
+                desde dispatch_data si no se pasa
 
         Returns:
             {
@@ -230,9 +294,11 @@ class DispatchAssignmentService:
             }
         """
         try:
-            available_ambulances = dispatch_data.get('available_ambulances', [])
+            if fleet is None:
+                fleet = self._normalize_ambulances(dispatch_data.get('available_ambulances') or [])
 
-            if not available_ambulances:
+            # Tras la normalización todo se lee de las columnas, sin .get por unidad
+            if fleet['ids'].size == 0:
                 logger.warning("No ambulances available")
                 return {
                     'success': False,
@@ -248,39 +314,32 @@ class DispatchAssignmentService:
                     'error': 'Patient location not provided'
                 }
 
-            # Calcular distancias y filtrar
-            ambulances_with_distance = []
-
-            for ambulance in available_ambulances:
-                if ambulance.get('status') != 'available':
-                    continue
-
-                distance = self._calculate_distance(
-                    patient_lat,
-                    patient_lon,
-                    ambulance.get('latitude'),
-                    ambulance.get('longitude')
-                )
+            # Ambulancias disponibles con coordenadas válidas
+            candidates = np.flatnonzero(fleet['available'] & np.isfinite(fleet['lat']) & np.isfinite(fleet['lon']))
 
-                # Aplicar máxima distancia configurada
-                if distance <= Config.AMBULANCE_MAX_DISTANCE_KM:
-                    ambulances_with_distance.append({
-                        'id': ambulance.get('id'),
-                        'distance': distance,
-                        'crew_level': ambulance.get('crew_level', 'junior'),
-                        'unit_type': ambulance.get('unit_type', 'basic')
-                    })
+            match = self._find_nearest_ambulance(
+                patient_lat,
+                patient_lon,
+                fleet['ids'][candidates],
+                fleet['lat'][candidates],
+                fleet['lon'][candidates]
+            )
 
-            if not ambulances_with_distance:
+            if match is None:
                 logger.warning("No ambulances within maximum distance")
                 return {
                     'success': False,
                     'error': 'No ambulances within service area'
                 }
 
-            # Ordenar por distancia y seleccionar la más cercana
-            ambulances_with_distance.sort(key=lambda x: x['distance'])
-            selected = ambulances_with_distance[0]
+            index, distance = match
+            index = candidates[index]
+            selected = {
+                'id': fleet['ids'][index],
+                'distance': distance,
+                'crew_level': fleet['crew_level'][index],
+                'unit_type': fleet['unit_type'][index]
+            }
 
             # Calcular confianza basada en distancia
             # Si está a 0-2km: muy alta confianza (0.95+)
@@ -289,21 +348,14 @@ class DispatchAssignmentService:
             # Si está a 10-15km: baja confianza (0.4-0.6)
 
             distance = selected['distance']
-            if distance <= 2:
-                confidence = 0.95
-            elif distance <= 5:
-                confidence = 0.85
-            elif distance <= 10:
-                confidence = 0.7
-            else:
-                confidence = 0.5
+            confidence = float(self._distance_confidence(distance))
 
-            logger.info(f"Selected ambulance {selected['id']} at {distance}km (confidence: {confidence})")
+            logger.info(f"Selected ambulance {selected['id']} at {distance:.2f}km (confidence: {confidence})")
 
             return {
                 'success': True,
                 'ambulance_id': selected['id'],
-                'distance_km': round(distance, 2),
+                'distance_km': distance,
                 'confidence': confidence,
                 'crew_level': selected['crew_level'],
                 'unit_type': selected['unit_type'],
@@ -317,6 +369,92 @@ class DispatchAssignmentService:
                 'error': f'Ambulance selection failed: {str(e)}'
             }
 
+    @classmethod
+    def _distance_confidence(cls, distances):
+        """
+        Confianza según distancia por búsqueda en tabla (escalar o arreglo)
+
+        Args:
+            distances: Distancia(s) en km
+
+        Returns:
+            Confianza(s) correspondiente(s)
+        """
+        return cls._CONF_VALS[np.searchsorted(cls._CONF_BINS, distances)]
+
+    def _find_nearest_ambulance(
+        self,
+        patient_lat: float,
+        patient_lon: float,
+        ids: np.ndarray,
+        lats: np.ndarray,
+        lons: np.ndarray
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Buscar la ambulancia candidata más cercana dentro de la distancia máxima
+
+        Flotas pequeñas: pre-filtro por caja lat/lon y Haversine vectorizado
+        solo sobre las que quedan.
+        Flotas grandes: consulta O(log N) sobre un BallTree (métrica haversine)
+        que se reconstruye solo cuando cambian las unidades o alguna se movió
+        más de ~100 m desde que se construyó; las k más cercanas se re-ordenan
+        con Haversine sobre las posiciones actuales.
+
+        Args:
+            patient_lat, patient_lon: Coordenadas del paciente
+            ids, lats, lons: Columnas de las ambulancias candidatas
+
+        Returns:
+            (índice en las candidatas, distancia en km) o None si ninguna está en rango
+        """
+        if lats.size == 0:
+            return None
+
+        if BallTree is not None and lats.size >= self.AMBULANCE_TREE_MIN_SIZE:
+            key = tuple(ids)
+            cached = self._amb_tree_cache
+            if (
+                cached is None
+                or cached[0] != key
+                or max(np.max(np.abs(lats - cached[1])), np.max(np.abs(lons - cached[2])))
+                > self.AMBULANCE_TREE_MAX_DRIFT_DEG
+            ):
+                tree = BallTree(np.radians(np.column_stack([lats, lons])), metric='haversine')
+                cached = (key, lats.copy(), lons.copy(), tree)
+                self._amb_tree_cache = cached
+
+            k = min(self.AMBULANCE_TREE_RERANK_K, lats.size)
+            _, idx = cached[3].query(np.radians([[patient_lat, patient_lon]]), k=k)
+            candidates = idx[0]
+            distances = haversine_vector(patient_lat, patient_lon, lats[candidates], lons[candidates])
+            best = int(np.argmin(distances))
+            nearest, distance = int(candidates[best]), float(distances[best])
+        else:
+            # Descartar con una caja lat/lon las que están claramente fuera de rango
+            # antes de calcular Haversine (con holgura por la aproximación plana)
+            max_km = Config.AMBULANCE_MAX_DISTANCE_KM * self.BBOX_SLACK
+            dlat_max = max_km / self.KM_PER_DEGREE
+            cos_lat = math.cos(math.radians(patient_lat))
+            dlon_max = max_km / (self.KM_PER_DEGREE * cos_lat) if cos_lat > 1e-6 else 360.0
+
+            dlon = np.abs(lons - patient_lon)
+            dlon = np.minimum(dlon, 360.0 - dlon)
+            in_box = np.flatnonzero((np.abs(lats - patient_lat) <= dlat_max) & (dlon <= dlon_max))
+
+            if in_box.size == 0:
+                return None
+
+            distances = haversine_vector(patient_lat, patient_lon, lats[in_box], lons[in_box])
+            best = int(np.argmin(distances))
+            nearest = int(in_box[best])
+            distance = float(distances[best])
+
+        # Aplicar máxima distancia configurada
+        if distance > Config.AMBULANCE_MAX_DISTANCE_KM:
+            return None
+
+        return nearest, distance
+
     # ============================================
     # RULE 2: ASSIGN PARAMEDICS BY SEVERITY
     # ============================================
@@ -349,23 +487,35 @@ class DispatchAssignmentService:
             }
         """
         try:
-            # Obtener regla para esta severidad
-            rule = self.paramedic_assignment_rules.get(severity_level)
-
-            if not rule:
+            # Obtener regla para esta severidad (acepta 3, 3.0, np.int64(3) o "3")
+            try:
+                severity_index = int(severity_level)
+            except (TypeError, ValueError):
+                severity_index = 0
+
+            if 0 < severity_index < len(self._rules):
+                rule = self._rules[severity_index]
+            else:
                 logger.warning(f"No rule found for severity {severity_level}, using default")
-                rule = self.paramedic_assignment_rules[3]  # Default: medium
+                rule = self._rules[3]  # Default: medium
 
-            min_paramedics = rule.get('min_paramedics', 1)
-            required_levels = rule.get('levels', ['junior'])
-            include_nurse = rule.get('include_nurse', False)
+            min_paramedics = rule.min_paramedics
+            required_levels = rule.levels
+            include_nurse = rule.include_nurse
 
             available_paramedics = dispatch_data.get('available_paramedics', [])
             available_nurses = dispatch_data.get('available_nurses', [])
 
-            # Separar paramédicos por nivel
-            senior_paramedics = [p for p in available_paramedics if p.get('level') == 'senior' and p.get('status') == 'available']
-            junior_paramedics = [p for p in available_paramedics if p.get('level') == 'junior' and p.get('status') == 'available']
+            # Separar paramédicos disponibles por nivel en una sola pasada
+            senior_paramedics, junior_paramedics = deque(), deque()
+            for p in available_paramedics:
+                if p.get('status') != 'available':
+                    continue
+                level = p.get('level')
+                if level == 'senior':
+                    senior_paramedics.append(p)
+                elif level == 'junior':
+                    junior_paramedics.append(p)
 
             assigned_paramedics = []
 
@@ -373,11 +523,11 @@ class DispatchAssignmentService:
             for required_level in required_levels:
                 if required_level == 'senior':
                     if senior_paramedics:
-                        paramedic = senior_paramedics.pop(0)
+                        paramedic = senior_paramedics.popleft()
                         assigned_paramedics.append(paramedic['id'])
                     elif junior_paramedics:
                         # Fallback: usar junior si no hay senior
-                        paramedic = junior_paramedics.pop(0)
+                        paramedic = junior_paramedics.popleft()
                         assigned_paramedics.append(paramedic['id'])
                     else:
                         logger.warning("No paramedics available for assignment")
@@ -388,11 +538,11 @@ class DispatchAssignmentService:
 
                 else:  # junior
                     if junior_paramedics:
-                        paramedic = junior_paramedics.pop(0)
+                        paramedic = junior_paramedics.popleft()
                         assigned_paramedics.append(paramedic['id'])
                     elif senior_paramedics:
                         # Fallback: usar senior si no hay junior
-                        paramedic = senior_paramedics.pop(0)
+                        paramedic = senior_paramedics.popleft()
                         assigned_paramedics.append(paramedic['id'])
                     else:
                         logger.warning("No paramedics available for assignment")
@@ -414,9 +564,12 @@ class DispatchAssignmentService:
             # Calcular confianza
             confidence = 0.9 if len(assigned_paramedics) >= min_paramedics else 0.6
 
-            reasoning = f"Severity {severity_level}: {len(assigned_paramedics)} paramedics"
-            if nurse_id:
-                reasoning += f" + nurse {nurse_id}"
+            nurse_suffix = f" + nurse {nurse_id}" if nurse_id else ""
+            template = self._reasoning_templates.get(severity_level)
+            if template:
+                reasoning = template.format(count=len(assigned_paramedics), nurse=nurse_suffix)
+            else:
+                reasoning = f"Severity {severity_level}: {len(assigned_paramedics)} paramedics{nurse_suffix}"
 
             logger.info(f"Assigned paramedics: {assigned_paramedics}, confidence: {confidence}")
 
@@ -439,70 +592,58 @@ class DispatchAssignmentService:
     # HELPER FUNCTIONS
     # ============================================
 
-    def _calculate_distance(
-        self,
-        lat1: float,
-        lon1: float,
-        lat2: float,
-        lon2: float
-    ) -> float:
+    @staticmethod
+    def _normalize_ambulances(ambulances: List[Dict]) -> Dict[str, np.ndarray]:
         """
-        Calcular distancia en km entre dos puntos usando Haversine formula
+        Pasar la lista de ambulancias (una dict por unidad) a columnas NumPy
+
+        Los valores por defecto y la validación de coordenadas se resuelven
+        aquí una sola vez; coordenadas no numéricas quedan como NaN.
 
         Args:
-            lat1, lon1: Coordenadas punto 1
-            lat2, lon2: Coordenadas punto 2
+            ambulances: LIST of {id, latitude, longitude, status, crew_level, unit_type}
 
         Returns:
-            Distancia en km
+            Dictionary con columnas 'ids', 'lat', 'lon', 'available',
+            'crew_level' y 'unit_type'
         """
-        try:
-            # Validar coordenadas
-            if not all(isinstance(x, (int, float)) for x in [lat1, lon1, lat2, lon2]):
-                logger.error(f"Invalid coordinates: {lat1}, {lon1}, {lat2}, {lon2}")
-                return float('inf')
-
-            # Radio de la tierra en km
-            R = 6371.0
-
-            # Convertir a radianes
-            lat1_rad = math.radians(lat1)
-            lon1_rad = math.radians(lon1)
-            lat2_rad = math.radians(lat2)
-            lon2_rad = math.radians(lon2)
-
-            # Diferencias
-            dlat = lat2_rad - lat1_rad
-            dlon = lon2_rad - lon1_rad
+        count = len(ambulances)
+        ids = np.empty(count, dtype=object)
+        crew_levels = np.empty(count, dtype=object)
+        unit_types = np.empty(count, dtype=object)
+        lats = np.full(count, np.nan)
+        lons = np.full(count, np.nan)
+        available = np.zeros(count, dtype=bool)
+
+        for i, ambulance in enumerate(ambulances):
+            ids[i] = ambulance.get('id')
+            crew_levels[i] = ambulance.get('crew_level', 'junior')
+            unit_types[i] = ambulance.get('unit_type', 'basic')
+            available[i] = ambulance.get('status') == 'available'
+
+            lat = ambulance.get('latitude')
+            lon = ambulance.get('longitude')
+            if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+                lats[i] = lat
+                lons[i] = lon
 
-            # Fórmula Haversine
-            a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
-            c = 2 * math.asin(math.sqrt(a))
-
-            distance = R * c
-
-            return distance
-
-        except Exception as e:
-            logger.error(f"Error calculating distance: {str(e)}")
-            return float('inf')
+        return {
+            'ids': ids,
+            'lat': lats,
+            'lon': lons,
+            'available': available,
+            'crew_level': crew_levels,
+            'unit_type': unit_types
+        }
 
     def _validate_input_data(self, dispatch_data: Dict) -> bool:
         """Validar que los datos de entrada sean correctos"""
-        required_fields = [
-            'dispatch_id',
-            'patient_latitude',
-            'patient_longitude',
-            'severity_level',
-            'emergency_type'
-        ]
+        if REQUIRED_DISPATCH_FIELDS.issubset(dispatch_data):
+            return True
 
-        for field in required_fields:
-            if field not in dispatch_data:
-                logger.error(f"Missing required field: {field}")
-                return False
-
-        return True
+        missing = sorted(REQUIRED_DISPATCH_FIELDS.difference(dispatch_data))
+        logger.error(f"Missing required field: {', '.join(missing)}")
+        return False
 
     def _record_assignment_history(
         self,
@@ -517,18 +658,25 @@ class DispatchAssignmentService:
                 logger.warning("Assignment history repository not available")
                 return {'success': False}
 
+            # Campos obligatorios ya validados en _validate_input_data
+            ambulances = dispatch_data.get('available_ambulances') or []
+            paramedics = dispatch_data.get('available_paramedics') or []
+
+            senior_ids = {p['id'] for p in paramedics if p.get('level') == 'senior'}
+            assigned_levels = ['senior' if pid in senior_ids else 'junior' for pid in paramedic_ids]
+
             history_data = {
-                'dispatch_id': dispatch_data.get('dispatch_id'),
-                'emergency_latitude': dispatch_data.get('patient_latitude'),
-                'emergency_longitude': dispatch_data.get('patient_longitude'),
-                'emergency_type': dispatch_data.get('emergency_type'),
-                'severity_level': dispatch_data.get('severity_level'),
+                'dispatch_id': dispatch_data['dispatch_id'],
+                'emergency_latitude': dispatch_data['patient_latitude'],
+                'emergency_longitude': dispatch_data['patient_longitude'],
+                'emergency_type': dispatch_data['emergency_type'],
+                'severity_level': dispatch_data['severity_level'],
                 'zone_code': dispatch_data.get('zone_code'),
-                'available_ambulances_count': len(dispatch_data.get('available_ambulances', [])),
-                'paramedics_available_count': len(dispatch_data.get('available_paramedics', [])),
+                'available_ambulances_count': len(ambulances),
+                'paramedics_available_count': len(paramedics),
                 'assigned_ambulance_id': ambulance_id,
-                'assigned_paramedic_ids': json.dumps(paramedic_ids),
-                'assigned_paramedic_levels': json.dumps(['senior' if pid in [p['id'] for p in dispatch_data.get('available_paramedics', []) if p.get('level') == 'senior'] else 'junior' for pid in paramedic_ids])
+                'assigned_paramedic_ids': orjson.dumps(paramedic_ids).decode(),
+                'assigned_paramedic_levels': orjson.dumps(assigned_levels).decode()
             }
 
             history_id = self.assignment_history_repo.create_assignment_history(history_data)
@@ -551,12 +699,17 @@ class DispatchAssignmentService:
         """Construir string explicativo del porqué de la asignación"""
         return f"Ambulance: {ambulance_result.get('reasoning')}. Personnel: {paramedic_result.get('reasoning')}"
 
-    def _error_response(self, error_message: str, dispatch_id: Optional[int] = None) -> Dict:
+    def _error_response(
+        self,
+        error_message: str,
+        dispatch_id: Optional[int] = None,
+        timestamp: Optional[str] = None
+    ) -> Dict:
         """Crear respuesta de error estándar"""
         return {
             'success': False,
             'dispatch_id': dispatch_id,
             'error': error_message,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp or datetime.utcnow().isoformat(),
             'phase': 1
         }
@@ -3,13 +3,83 @@ Health Service
 System health monitoring and diagnostics
 """
 
-from typing import Dict, Any, Optional
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError, as_completed, wait
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+import functools
+import threading
+import time
 
 from ..config.logger import LoggerMixin
 from ..repositories import ModelRepository, CacheRepository, DispatchRepository, AmbulanceRepository
+from ..utils.timeutils import now_iso
 from .model_manager import ModelManager
 
+# TTL (seconds) of cached check results, by outcome
+HEALTHY_CHECK_TTL = 5.0
+UNHEALTHY_CHECK_TTL = 2.0
+
+# Max seconds check_system_health waits for the component checks
+CHECK_TIMEOUT_SECONDS = 2.0
+
+# Models reported on by the health checks
+_MODEL_NAMES: Tuple[str, ...] = ('eta', 'severity', 'ambulance', 'route')
+
+# Health and alert thresholds
+_THRESHOLDS = SimpleNamespace(
+    latency_ms=500,               # avg model latency above this is slow
+    evictions_warn=500,           # evicted cache keys that raise an alert
+    evictions_unhealthy=1000,     # evicted cache keys that mark the cache unhealthy
+    pending_warn=100,             # pending dispatches that raise an alert
+    completion_min=0.5,           # minimum dispatch completion rate
+    cache_memory_max=10 ** 10     # Redis used memory (bytes), 10GB
+)
+
+
+def _memo(ttl_ok: float = HEALTHY_CHECK_TTL, ttl_fail: float = UNHEALTHY_CHECK_TTL):
+    """
+    Cache a HealthService check result on the instance
+
+    Healthy results are kept for ttl_ok seconds and failing ones for ttl_fail,
+    so probe storms do not reach Redis/DB while a recovery is still picked up
+    quickly. Each result carries 'timestamp' and 'expires'.
+
+    Args:
+        ttl_ok: TTL for healthy results
+        ttl_fail: TTL for unhealthy results
+    """
+    def decorator(func):
+        key = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self):
+            now = time.monotonic()
+            with self._check_lock:
+                cached = self._check_cache.get(key)
+            if cached and now < cached[1]:
+                return dict(cached[0])
+
+            result = func(self)
+
+            if 'healthy' in result:
+                healthy = result['healthy']
+            else:
+                healthy = result.get('status') == 'healthy'
+            ttl = ttl_ok if healthy else ttl_fail
+
+            checked_at = datetime.utcnow()
+            result.setdefault('timestamp', checked_at.isoformat())
+            result['expires'] = (checked_at + timedelta(seconds=ttl)).isoformat()
+
+            with self._check_lock:
+                self._check_cache[key] = (result, now + ttl)
+            return dict(result)
+
+        return wrapper
+
+    return decorator
+
 
 class HealthService(LoggerMixin):
     """
@@ -45,18 +115,36 @@ class HealthService(LoggerMixin):
         self.cache_repo = cache_repo
         self.dispatch_repo = dispatch_repo
         self.ambulance_repo = ambulance_repo
-        self.last_check = None
+        self.last_check: Optional[str] = None  # ISO timestamp of the last system check
         self.health_status = 'unknown'
+
+        # Elapsed-time bookkeeping uses the monotonic clock
+        self._start_monotonic = time.monotonic()
+        self._last_check_monotonic = 0.0
+
+        # Cached check results: method name -> (result, monotonic expiry), see _memo
+        self._check_cache: Dict[str, tuple] = {}
+        self._check_lock = threading.Lock()
+
+        # Component -> Future of its running check, see _submit_check
+        self._inflight_checks: Dict[str, Future] = {}
+
         self.log_info("Initialized HealthService")
 
     # ============================================
     # COMPREHENSIVE HEALTH CHECKS
     # ============================================
 
-    def check_system_health(self) -> Dict[str, Any]:
+    def check_system_health(self, full: bool = True) -> Dict[str, Any]:
         """
         Comprehensive system health check
 
+        Args:
+            full: Run every component check. When False the check stops at the
+                first unhealthy component (fast fail for probes): checks still
+                running are left out of 'components' and finish in the
+                background, where the next call picks them up.
+
         Returns:
             Health status with component details
         """
@@ -64,34 +152,48 @@ class HealthService(LoggerMixin):
             self.log_debug("Running system health check")
 
             health = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': now_iso(),
                 'status': 'healthy',
                 'components': {}
             }
 
-            # Check each component
-            model_health = self.check_models_health()
-            health['components']['models'] = model_health
-            if not model_health['healthy']:
-                health['status'] = 'degraded'
-
-            cache_health = self.check_cache_health()
-            health['components']['cache'] = cache_health
-            if not cache_health['healthy']:
-                health['status'] = 'degraded'
-
-            database_health = self.check_database_health()
-            health['components']['database'] = database_health
-            if not database_health['healthy']:
-                health['status'] = 'degraded'
+            # Check each component concurrently (independent I/O round trips)
+            futures = {
+                'models': self._submit_check('models', self.check_models_health),
+                'cache': self._submit_check('cache', self.check_cache_health),
+                'database': self._submit_check('database', self.check_database_health),
+                'services': self._submit_check('services', self.check_service_health)
+            }
 
-            service_health = self.check_service_health()
-            health['components']['services'] = service_health
-            if not service_health['healthy']:
-                health['status'] = 'degraded'
+            if full:
+                wait(futures.values(), timeout=CHECK_TIMEOUT_SECONDS)
+
+                for component, future in futures.items():
+                    if future.done():
+                        component_health = future.result()
+                    else:
+                        self.log_warning(f"Health check timed out: {component}")
+                        component_health = {'healthy': False, 'error': 'timeout'}
+
+                    health['components'][component] = component_health
+                    if not component_health['healthy']:
+                        health['status'] = 'degraded'
+            else:
+                components = {future: component for component, future in futures.items()}
+                try:
+                    for future in as_completed(components, timeout=CHECK_TIMEOUT_SECONDS):
+                        component_health = future.result()
+                        health['components'][components[future]] = component_health
+                        if not component_health['healthy']:
+                            health['status'] = 'degraded'
+                            break
+                except FuturesTimeoutError:
+                    self.log_warning("Health check timed out")
+                    health['status'] = 'degraded'
 
             # Store for tracking
-            self.last_check = datetime.utcnow()
+            self.last_check = health['timestamp']
+            self._last_check_monotonic = time.monotonic()
             self.health_status = health['status']
 
             self.log_info(f"Health check complete: {health['status']}")
@@ -100,15 +202,47 @@ class HealthService(LoggerMixin):
         except Exception as e:
             self.log_error(f"Error checking health: {str(e)}")
             return {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': now_iso(),
                 'status': 'unhealthy',
                 'error': str(e)
             }
 
+    def _submit_check(self, component: str, check) -> Future:
+        """
+        Run a component check on its own daemon thread
+
+        A check that is still running from an earlier call is reused instead
+        of started again, so a hung Redis/DB probe holds at most one thread per
+        component and never blocks the other checks.
+
+        Args:
+            component: Component name
+            check: Bound check method
+
+        Returns:
+            Future with the check result
+        """
+        with self._check_lock:
+            future = self._inflight_checks.get(component)
+            if future is not None and not future.done():
+                return future
+            future = Future()
+            self._inflight_checks[component] = future
+
+        def run():
+            try:
+                future.set_result(check())
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f'health-check-{component}', daemon=True).start()
+        return future
+
     # ============================================
     # COMPONENT HEALTH CHECKS
     # ============================================
 
+    @_memo()
     def check_models_health(self) -> Dict[str, Any]:
         """
         Check ML models health
@@ -119,23 +253,25 @@ class HealthService(LoggerMixin):
         try:
             status = self.model_manager.health_check()
 
-            models_loaded = sum(1 for v in status.get('models', {}).values() if v.get('status') == 'loaded')
-            total_models = len(status.get('models', {}))
+            # Counts are precomputed by ModelManager.health_check
+            models_loaded = status.get('loaded_count', 0)
+            total_models = status.get('total_count', 0)
 
             health = {
                 'healthy': models_loaded == total_models,
                 'models_loaded': models_loaded,
                 'models_total': total_models,
-                'models': status.get('models', {}),
-                'timestamp': datetime.utcnow().isoformat()
+                'models': status.get('models') or {},
+                'timestamp': now_iso()
             }
 
-            # Check model performance
-            for model_name in ['eta', 'severity', 'ambulance', 'route']:
-                perf = self.model_manager.get_model_performance(model_name, hours=1)
+            # Check model performance (one batched query for all models)
+            model_perf = self.model_manager.get_all_model_performance(hours=1)
+            for model_name in _MODEL_NAMES:
+                perf = model_perf.get(model_name)
                 if perf:
-                    avg_latency = perf.get('avg_prediction_time', 0)
-                    if avg_latency > 500:  # > 500ms is slow
+                    avg_latency = perf.get('avg_prediction_time') or 0
+                    if avg_latency > _THRESHOLDS.latency_ms:
                         health['healthy'] = False
                         health['warning'] = f"{model_name} latency high: {avg_latency}ms"
 
@@ -148,6 +284,7 @@ class HealthService(LoggerMixin):
                 'error': str(e)
             }
 
+    @_memo()
     def check_cache_health(self) -> Dict[str, Any]:
         """
         Check Redis cache health
@@ -159,8 +296,8 @@ class HealthService(LoggerMixin):
             stats = self.cache_repo.get_cache_stats()
 
             healthy = (
-                stats.get('used_memory_bytes', 0) < 1e10 and  # < 10GB
-                stats.get('evicted_keys', 0) < 1000  # < 1000 evicted keys
+                stats.get('used_memory_bytes', 0) < _THRESHOLDS.cache_memory_max and
+                stats.get('evicted_keys', 0) < _THRESHOLDS.evictions_unhealthy
             )
 
             return {
@@ -170,7 +307,7 @@ class HealthService(LoggerMixin):
                 'fragmentation_ratio': stats.get('memory_fragmentation', 0),
                 'total_keys': stats.get('total_keys', 0),
                 'evicted_keys': stats.get('evicted_keys', 0),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now_iso()
             }
 
         except Exception as e:
@@ -180,6 +317,7 @@ class HealthService(LoggerMixin):
                 'error': str(e)
             }
 
+    @_memo()
     def check_database_health(self) -> Dict[str, Any]:
         """
         Check database health
@@ -188,9 +326,10 @@ class HealthService(LoggerMixin):
             Database health status
         """
         try:
-            # Try to get basic stats
-            dispatch_count = self.dispatch_repo.count('dispatches')
-            ambulance_count = self.ambulance_repo.count('ambulances')
+            # Try to get basic stats (both counts in one round-trip)
+            counts = self.dispatch_repo.count_many(['dispatches', 'ambulances'])
+            dispatch_count = counts['dispatches']
+            ambulance_count = counts['ambulances']
 
             healthy = dispatch_count >= 0 and ambulance_count >= 0
 
@@ -198,7 +337,7 @@ class HealthService(LoggerMixin):
                 'healthy': healthy,
                 'dispatches': dispatch_count,
                 'ambulances': ambulance_count,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now_iso()
             }
 
         except Exception as e:
@@ -208,6 +347,7 @@ class HealthService(LoggerMixin):
                 'error': str(e)
             }
 
+    @_memo()
     def check_service_health(self) -> Dict[str, Any]:
         """
         Check service operations health
@@ -224,7 +364,7 @@ class HealthService(LoggerMixin):
             completion_rate = stats.get('completion_rate', 0)
 
             # System is healthy if processing dispatches and completing them
-            healthy = total_dispatches > 0 and completion_rate > 0.5  # > 50% completion
+            healthy = total_dispatches > 0 and completion_rate > _THRESHOLDS.completion_min
 
             return {
                 'healthy': healthy,
@@ -232,7 +372,7 @@ class HealthService(LoggerMixin):
                 'completion_rate': completion_rate,
                 'pending_count': stats.get('pending_count', 0),
                 'in_transit_count': stats.get('in_transit_count', 0),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now_iso()
             }
 
         except Exception as e:
@@ -254,13 +394,22 @@ class HealthService(LoggerMixin):
             Full diagnostic information
         """
         try:
+            # Model performance and cache stats are fetched once and shared by the
+            # sections below; alerts reuse the dispatch counts of the services check
+            system_health = self.check_system_health()
+            model_perf = self.model_manager.get_all_model_performance(hours=1)
+            cache_stats = self.cache_repo.get_cache_stats()
+
+            service_health = system_health.get('components', {}).get('services', {})
+            dispatch_stats = service_health if 'pending_count' in service_health else None
+
             report = {
-                'generated_at': datetime.utcnow().isoformat(),
-                'system_health': self.check_system_health(),
+                'generated_at': now_iso(),
+                'system_health': system_health,
                 'model_status': self.model_manager.get_all_models_status(),
-                'recent_performance': self._get_recent_performance(),
-                'resource_usage': self.cache_repo.get_cache_stats(),
-                'system_alerts': self._check_for_alerts()
+                'recent_performance': self._get_recent_performance(model_perf),
+                'resource_usage': cache_stats,
+                'system_alerts': self._check_for_alerts(model_perf, cache_stats, dispatch_stats)
             }
 
             return report
@@ -269,13 +418,16 @@ class HealthService(LoggerMixin):
             self.log_error(f"Error generating diagnostic report: {str(e)}")
             return {'error': str(e)}
 
-    def _get_recent_performance(self) -> Dict[str, Any]:
-        """Get recent performance metrics"""
+    def _get_recent_performance(self, model_perf: Optional[Dict[str, Dict]] = None) -> Dict[str, Any]:
+        """Get recent performance metrics (model_perf: result of get_all_model_performance)"""
         try:
             performance = {}
 
-            for model_name in ['eta', 'severity', 'ambulance', 'route']:
-                perf = self.model_manager.get_model_performance(model_name, hours=1)
+            if model_perf is None:
+                model_perf = self.model_manager.get_all_model_performance(hours=1)
+
+            for model_name in _MODEL_NAMES:
+                perf = model_perf.get(model_name)
                 if perf:
                     performance[model_name] = {
                         'total_predictions': perf.get('total_predictions', 0),
@@ -288,15 +440,37 @@ class HealthService(LoggerMixin):
         except Exception:
             return {}
 
-    def _check_for_alerts(self) -> list:
-        """Check for system alerts"""
+    def _check_for_alerts(
+        self,
+        model_perf: Optional[Dict[str, Dict]] = None,
+        cache_stats: Optional[Dict[str, Any]] = None,
+        dispatch_stats: Optional[Dict[str, Any]] = None
+    ) -> list:
+        """
+        Check for system alerts
+
+        Data already fetched by the caller can be passed in. Anything left as
+        None is read from a still-fresh check_cache_health/check_service_health
+        result when there is one, and fetched from the repositories otherwise.
+
+        Args:
+            model_perf: Result of ModelManager.get_all_model_performance
+            cache_stats: Result of CacheRepository.get_cache_stats
+            dispatch_stats: Dispatch statistics with 'pending_count'
+
+        Returns:
+            List of alerts
+        """
         try:
             alerts = []
 
+            if model_perf is None:
+                model_perf = self.model_manager.get_all_model_performance(hours=1)
+
             # Check for slow models
-            for model_name in ['eta', 'severity', 'ambulance', 'route']:
-                perf = self.model_manager.get_model_performance(model_name, hours=1)
-                if perf and perf.get('avg_prediction_time', 0) > 500:
+            for model_name in _MODEL_NAMES:
+                perf = model_perf.get(model_name)
+                if perf and (perf.get('avg_prediction_time') or 0) > _THRESHOLDS.latency_ms:
                     alerts.append({
                         'severity': 'warning',
                         'type': 'slow_model',
@@ -304,8 +478,11 @@ class HealthService(LoggerMixin):
                     })
 
             # Check for low cache efficiency
-            cache_stats = self.cache_repo.get_cache_stats()
-            if cache_stats.get('evicted_keys', 0) > 500:
+            if cache_stats is None:
+                cache_stats = self._fresh_check_result('check_cache_health', 'evicted_keys')
+            if cache_stats is None:
+                cache_stats = self.cache_repo.get_cache_stats()
+            if cache_stats.get('evicted_keys', 0) > _THRESHOLDS.evictions_warn:
                 alerts.append({
                     'severity': 'warning',
                     'type': 'cache_eviction',
@@ -313,8 +490,11 @@ class HealthService(LoggerMixin):
                 })
 
             # Check for pending dispatches
-            dispatch_stats = self.dispatch_repo.get_dispatch_statistics(hours=1)
-            if dispatch_stats.get('pending_count', 0) > 100:
+            if dispatch_stats is None:
+                dispatch_stats = self._fresh_check_result('check_service_health', 'pending_count')
+            if dispatch_stats is None:
+                dispatch_stats = self.dispatch_repo.get_dispatch_statistics(hours=1)
+            if dispatch_stats.get('pending_count', 0) > _THRESHOLDS.pending_warn:
                 alerts.append({
                     'severity': 'warning',
                     'type': 'pending_dispatches',
@@ -331,6 +511,25 @@ class HealthService(LoggerMixin):
     # STATUS TRACKING
     # ============================================
 
+    def _fresh_check_result(self, check_name: str, field: str) -> Optional[Dict[str, Any]]:
+        """
+        Unexpired cached result of a memoized check, if it carries a field
+
+        Args:
+            check_name: Name of the @_memo decorated check method
+            field: Field the caller needs from the result
+
+        Returns:
+            Cached result or None
+        """
+        with self._check_lock:
+            cached = self._check_cache.get(check_name)
+
+        if cached and time.monotonic() < cached[1] and field in cached[0]:
+            return cached[0]
+
+        return None
+
     def get_uptime(self) -> Dict[str, Any]:
         """
         Get service uptime information
@@ -339,17 +538,23 @@ class HealthService(LoggerMixin):
             Uptime information
         """
         try:
-            # This would track actual uptime if implemented with persistent storage
+            # Uptime of this service instance (not persisted across restarts)
+            now = time.monotonic()
             return {
-                'last_health_check': self.last_check.isoformat() if self.last_check else None,
+                'uptime_seconds': round(now - self._start_monotonic, 3),
+                'last_health_check': self.last_check,
+                'seconds_since_last_check': (
+                    round(now - self._last_check_monotonic, 3) if self._last_check_monotonic else None
+                ),
                 'current_status': self.health_status,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now_iso()
             }
 
         except Exception as e:
             self.log_error(f"Error getting uptime: {str(e)}")
             return {'error': str(e)}
 
+    @_memo()
     def get_quick_status(self) -> Dict[str, Any]:
         """
         Get quick status summary
@@ -367,7 +572,7 @@ class HealthService(LoggerMixin):
                 'models': 'ok' if models_ok else 'degraded',
                 'active_dispatches': dispatch_stats.get('in_transit_count', 0),
                 'pending_dispatches': dispatch_stats.get('pending_count', 0),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now_iso()
             }
 
         except Exception as e:
@@ -3,13 +3,62 @@ Model Manager Service
 Manages ML model lifecycle, loading, and version control
 """
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import atexit
 import pickle
+import threading
+import time
+
+import numpy as np
+
+try:
+    import joblib
+except ImportError:  # Models stored as 'joblib' cannot be loaded without it
+    joblib = None
+
+try:
+    import xgboost as xgb
+except ImportError:  # Models stored as 'xgb_json' cannot be loaded without it
+    xgb = None
 
 from ..config.logger import LoggerMixin
 from ..models import BaseModel, ETAModel, SeverityClassifier, AmbulanceSelector, RouteOptimizer
 from ..repositories import ModelRepository
+from ..utils.timeutils import now_iso
+
+
+# Deserialized models shared by every ModelManager in the process, keyed by
+# (model_name, version, file_sha256) so a replaced file is never served stale
+MODEL_CACHE_MAX_ENTRIES = 8
+_model_cache: "OrderedDict[Tuple[str, str, Optional[str]], Any]" = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+
+def _model_cache_key(model_name: str, model_info: Dict) -> Tuple[str, str, Optional[str]]:
+    return (model_name, str(model_info.get('version')), model_info.get('file_sha256'))
+
+
+def _model_cache_get(key: Tuple[str, str, Optional[str]]) -> Optional[Any]:
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            _model_cache.move_to_end(key)
+        return model
+
+
+def _model_cache_put(key: Tuple[str, str, Optional[str]], model: Any) -> None:
+    with _model_cache_lock:
+        _model_cache[key] = model
+        _model_cache.move_to_end(key)
+        while len(_model_cache) > MODEL_CACHE_MAX_ENTRIES:
+            _model_cache.popitem(last=False)
+
+
+def _model_cache_invalidate(key: Tuple[str, str, Optional[str]]) -> None:
+    with _model_cache_lock:
+        _model_cache.pop(key, None)
 
 
 class ModelManager(LoggerMixin):
@@ -24,6 +73,21 @@ class ModelManager(LoggerMixin):
     - Performance monitoring
     """
 
+    # Prediction records are buffered and written in batches
+    PREDICTION_FLUSH_INTERVAL = 0.5  # seconds
+    PREDICTION_FLUSH_BATCH_SIZE = 200
+
+    # Model metadata rows change rarely; keep them in process while the
+    # repository revision is unchanged, and no longer than these TTLs
+    METADATA_CACHE_TTL = 60.0  # seconds
+    ALL_ACTIVE_CACHE_TTL = 30.0  # seconds
+
+    # Health checks are probed often; serve the same result for a short window
+    HEALTH_CHECK_TTL = 2.0  # seconds
+
+    # Models are fetched and deserialized in parallel on startup
+    MODEL_LOAD_WORKERS = 4
+
     def __init__(self, model_repository: ModelRepository):
         """
         Initialize Model Manager
@@ -39,6 +103,19 @@ class ModelManager(LoggerMixin):
             'ambulance': AmbulanceSelector,
             'route': RouteOptimizer
         }
+        self._pending_predictions: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        self._flush_lock = threading.Lock()
+        self._flush_wakeup = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._meta_cache: Dict[Any, Tuple[Any, float, Optional[int]]] = {}
+        # Per-model health entries, updated in place when a model loads
+        self._model_health: Dict[str, Dict[str, Any]] = {
+            model_name: {'status': 'not_loaded'} for model_name in self.model_classes
+        }
+        self._health_cache: Optional[Tuple[Dict[str, Any], float]] = None
+        self._health_lock = threading.Lock()
+        # Guards active_models/_model_health updates from concurrent loads
+        self._models_lock = threading.Lock()
         self.log_info("Initialized ModelManager")
 
     # ============================================
@@ -54,12 +131,21 @@ class ModelManager(LoggerMixin):
         """
         try:
             status = {}
-            active_models = self.repo.get_all_active_models()
+            active_models = self._cached_metadata(
+                'all_active', self.ALL_ACTIVE_CACHE_TTL, self.repo.get_all_active_models, None
+            )
 
-            for model_info in active_models:
-                model_name = model_info['model_name']
-                success = self._load_single_model(model_name, model_info)
-                status[model_name] = success
+            if active_models:
+                # Each load is independent file I/O + deserialization
+                workers = min(self.MODEL_LOAD_WORKERS, len(active_models))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='model-load') as executor:
+                    futures = {
+                        executor.submit(self._load_single_model, model_info['model_name'], model_info):
+                            model_info['model_name']
+                        for model_info in active_models
+                    }
+                    for future in as_completed(futures):
+                        status[futures[future]] = future.result()
 
             loaded_count = sum(1 for v in status.values() if v)
             self.log_info(f"Loaded {loaded_count}/{len(status)} active models")
@@ -74,6 +160,9 @@ class ModelManager(LoggerMixin):
         """
         Load a single model
 
+        If the same version with the same file checksum is already loaded, only
+        its metadata and loaded_at are refreshed; the file is not read again.
+
         Args:
             model_name: Model name
             model_info: Model metadata
@@ -82,22 +171,61 @@ class ModelManager(LoggerMixin):
             True if successful
         """
         try:
-            # Get model file
-            model_bytes = self.repo.get_model_file(model_name, model_info['version'])
+            current = self.active_models.get(model_name)
+            file_sha256 = model_info.get('file_sha256')
+            if (
+                current is not None
+                and file_sha256
+                and current['metadata'].get('file_sha256') == file_sha256
+                and str(current['metadata'].get('version')) == str(model_info.get('version'))
+            ):
+                with self._models_lock:
+                    current['metadata'] = model_info
+                    current['model_id'] = model_info.get('id')
+                    current['loaded_at'] = now_iso()
+                self.log_debug(f"Model unchanged, skipped reload: {model_name} v{model_info['version']}")
+                return True
 
-            if not model_bytes:
-                self.log_error(f"Could not retrieve model file for {model_name}")
-                return False
+            cache_key = _model_cache_key(model_name, model_info)
+            loaded_model = _model_cache_get(cache_key)
+
+            model_path = None
+            if loaded_model is None:
+                model_path = self._joblib_mmap_path(model_name, model_info)
+
+                if model_path is None:
+                    # Map model file (paged in on demand, no intermediate bytes copy)
+                    model_buffer = self.repo.open_model_file(model_name, model_info['version'])
+
+                    if model_buffer is None:
+                        self.log_error(f"Could not retrieve model file for {model_name}")
+                        return False
 
             # Deserialize model
             try:
-                loaded_model = pickle.loads(model_bytes)
-                self.active_models[model_name] = {
-                    'model': loaded_model,
-                    'metadata': model_info,
-                    'loaded_at': datetime.utcnow().isoformat(),
-                    'prediction_count': 0
-                }
+                if loaded_model is None:
+                    if model_path is not None:
+                        # numpy arrays stay on disk, shared by every worker through the page cache
+                        loaded_model = joblib.load(model_path, mmap_mode='r')
+                    else:
+                        with model_buffer:
+                            loaded_model = self._deserialize_model(model_info, model_buffer)
+                    _model_cache_put(cache_key, loaded_model)
+
+                with self._models_lock:
+                    self.active_models[model_name] = {
+                        'model': loaded_model,
+                        'metadata': model_info,
+                        'model_id': model_info.get('id'),
+                        'loaded_at': now_iso(),
+                        'prediction_count': 0
+                    }
+                    if model_name in self._model_health:
+                        self._model_health[model_name] = {
+                            'status': 'loaded',
+                            'version': model_info.get('version')
+                        }
+                self._invalidate_health_check()
                 self.log_info(f"Loaded model: {model_name} v{model_info['version']}")
                 return True
 
@@ -109,6 +237,52 @@ class ModelManager(LoggerMixin):
             self.log_error(f"Error loading model {model_name}: {str(e)}")
             return False
 
+    def _joblib_mmap_path(self, model_name: str, model_info: Dict) -> Optional[str]:
+        """
+        File path to load with joblib's mmap_mode, if the model allows it
+
+        Only uncompressed joblib files can be memory-mapped.
+
+        Args:
+            model_name: Model name
+            model_info: Model metadata
+
+        Returns:
+            Absolute file path or None
+        """
+        if joblib is None or model_info.get('model_format') != 'joblib' or model_info.get('compression'):
+            return None
+
+        return self.repo.get_model_file_path(model_name, model_info['version'])
+
+    @staticmethod
+    def _deserialize_model(model_info: Dict, model_buffer) -> Any:
+        """
+        Deserialize a model stream according to its stored format
+
+        Args:
+            model_info: Model metadata ('model_format': pickle, joblib or xgb_json)
+            model_buffer: Readable binary stream with the model file
+
+        Returns:
+            Deserialized model
+        """
+        model_format = model_info.get('model_format') or 'pickle'
+
+        if model_format == 'joblib':
+            if joblib is None:
+                raise RuntimeError("joblib is required to load this model")
+            return joblib.load(model_buffer)
+
+        if model_format == 'xgb_json':
+            if xgb is None:
+                raise RuntimeError("xgboost is required to load this model")
+            booster = xgb.Booster()
+            booster.load_model(bytearray(model_buffer.read()))
+            return booster
+
+        return pickle.load(model_buffer)
+
     def get_model(self, model_name: str) -> Optional[BaseModel]:
         """
         Get loaded model by name
@@ -121,7 +295,7 @@ class ModelManager(LoggerMixin):
         """
         if model_name not in self.active_models:
             # Try to load it
-            model_info = self.repo.get_active_model(model_name)
+            model_info = self._get_active_model_info(model_name)
             if model_info:
                 self._load_single_model(model_name, model_info)
 
@@ -146,6 +320,10 @@ class ModelManager(LoggerMixin):
         """
         Record prediction for monitoring
 
+        The row is queued and written by a background flusher every
+        PREDICTION_FLUSH_INTERVAL seconds, or as soon as a model has
+        PREDICTION_FLUSH_BATCH_SIZE rows pending.
+
         Args:
             model_name: Model name
             prediction_time_ms: Prediction latency
@@ -155,39 +333,94 @@ class ModelManager(LoggerMixin):
             actual_value: Actual value (for validation)
 
         Returns:
-            True if recorded
+            True if queued
         """
         try:
             if model_name not in self.active_models:
                 return False
 
             model_info = self.active_models[model_name]
-            model_id = model_info['metadata'].get('id')
+            model_id = model_info['model_id']
 
             # Increment prediction count
             model_info['prediction_count'] += 1
 
-            # Record in repository
-            success = self.repo.record_prediction_performance(
-                model_id,
-                {
-                    'prediction_time_ms': prediction_time_ms,
-                    'input_features': input_features,
-                    'output_value': output_value,
-                    'confidence': confidence,
-                    'actual_value': actual_value
-                }
-            )
+            row = {
+                'prediction_time_ms': prediction_time_ms,
+                'input_features': input_features,
+                'output_value': output_value,
+                'confidence': confidence,
+                'actual_value': actual_value
+            }
 
-            if success:
-                self.log_debug(f"Recorded prediction for {model_name}")
+            with self._flush_lock:
+                pending = self._pending_predictions[model_id]
+                pending.append(row)
+                batch_full = len(pending) >= self.PREDICTION_FLUSH_BATCH_SIZE
 
-            return success
+            self._ensure_flush_thread()
+            if batch_full:
+                self._flush_wakeup.set()
+
+            return True
 
         except Exception as e:
             self.log_warning(f"Error recording prediction: {str(e)}")
             return False
 
+    def flush_predictions(self) -> int:
+        """
+        Write all queued prediction records to the repository
+
+        Called by the background flusher and at interpreter exit.
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            if not self._pending_predictions:
+                return 0
+            pending = self._pending_predictions
+            self._pending_predictions = defaultdict(list)
+
+        written = 0
+        for model_id, rows in pending.items():
+            try:
+                written += self.repo.record_prediction_performance_bulk(model_id, rows)
+            except Exception as e:
+                self.log_warning(f"Error flushing {len(rows)} predictions for model {model_id}: {str(e)}")
+
+        if written:
+            self.log_debug(f"Flushed {written} prediction records")
+
+        return written
+
+    def _ensure_flush_thread(self) -> None:
+        """Start the background prediction flusher on first use"""
+        if self._flush_thread is not None:
+            return
+
+        with self._flush_lock:
+            if self._flush_thread is not None:
+                return
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop,
+                name='model-prediction-flusher',
+                daemon=True
+            )
+            self._flush_thread.start()
+            atexit.register(self.flush_predictions)
+
+    def _flush_loop(self) -> None:
+        """Flush queued predictions every interval or when a batch fills up"""
+        while True:
+            self._flush_wakeup.wait(self.PREDICTION_FLUSH_INTERVAL)
+            self._flush_wakeup.clear()
+            try:
+                self.flush_predictions()
+            except Exception as e:
+                self.log_warning(f"Prediction flusher error: {str(e)}")
+
     # ============================================
     # MODEL VERSIONING
     # ============================================
@@ -223,7 +456,10 @@ class ModelManager(LoggerMixin):
         """
         try:
             # Get model version info
-            model_info = self.repo.get_model_version(model_name, version)
+            model_info = self._cached_metadata(
+                ('version', model_name, version), self.METADATA_CACHE_TTL,
+                lambda: self.repo.get_model_version(model_name, version), model_name
+            )
 
             if not model_info:
                 self.log_error(f"Model version not found: {model_name} v{version}")
@@ -233,7 +469,10 @@ class ModelManager(LoggerMixin):
             success = self.repo.activate_model(model_info['id'])
 
             if success:
-                # Reload the model
+                # The active version changed: drop cached metadata and any
+                # cached copy of this version before reloading
+                self._invalidate_metadata(model_name)
+                _model_cache_invalidate(_model_cache_key(model_name, model_info))
                 self._load_single_model(model_name, model_info)
                 self.log_info(f"Activated {model_name} v{version}")
 
@@ -311,7 +550,7 @@ class ModelManager(LoggerMixin):
 
             # Store validation metrics
             if model_name in self.active_models:
-                model_id = self.active_models[model_name]['metadata'].get('id')
+                model_id = self.active_models[model_name]['model_id']
                 self.repo.validate_model(model_id, metrics)
 
             self.log_info(f"Validation metrics for {model_name}: {metrics}")
@@ -337,13 +576,21 @@ class ModelManager(LoggerMixin):
             Dictionary with metrics
         """
         try:
-            import numpy as np
-
-            predictions = np.array(predictions)
-            actual = np.array(actual)
+            predictions = np.asarray(predictions)
+            actual = np.asarray(actual)
+
+            if predictions.size == 0:
+                return {'sample_count': 0}
+
+            # Handle classification vs regression (integer severity levels 1-5)
+            is_classification = (
+                predictions.dtype.kind in 'iu'
+                and predictions.size > 0
+                and bool((predictions >= 1).all())
+                and bool((predictions <= 5).all())
+            )
 
-            # Handle classification vs regression
-            if all(isinstance(x, int) and 1 <= x <= 5 for x in predictions):
+            if is_classification:
                 # Classification (severity levels)
                 accuracy = np.mean(predictions == actual)
                 return {
@@ -351,10 +598,13 @@ class ModelManager(LoggerMixin):
                     'sample_count': len(predictions)
                 }
             else:
-                # Regression (ETA times)
-                mae = np.mean(np.abs(predictions - actual))
-                rmse = np.sqrt(np.mean((predictions - actual) ** 2))
-                r2 = 1 - (np.sum((actual - predictions) ** 2) / np.sum((actual - np.mean(actual)) ** 2))
+                # Regression (ETA times): one residual array shared by all metrics
+                diff = predictions - actual
+                squared = diff * diff
+                mae = np.abs(diff).mean()
+                rmse = np.sqrt(squared.mean())
+                centered = actual - actual.mean()
+                r2 = 1 - squared.sum() / (centered * centered).sum()
 
                 return {
                     'mae': float(mae),
@@ -387,7 +637,7 @@ class ModelManager(LoggerMixin):
                 return {}
 
             model_info = self.active_models[model_name]
-            model_id = model_info['metadata'].get('id')
+            model_id = model_info['model_id']
 
             stats = self.repo.get_model_performance_stats(model_id, hours)
 
@@ -401,6 +651,46 @@ class ModelManager(LoggerMixin):
             self.log_error(f"Error getting model performance: {str(e)}")
             return {}
 
+    def get_all_model_performance(self, hours: int = 1) -> Dict[str, Dict[str, Any]]:
+        """
+        Get performance statistics for all active models in one repository call
+
+        Args:
+            hours: Look back how many hours
+
+        Returns:
+            Dictionary of model name -> performance statistics (loaded models only)
+        """
+        try:
+            # One snapshot serves both reads, so a concurrent load cannot
+            # change the model set between them
+            with self._models_lock:
+                active = dict(self.active_models)
+
+            model_ids = {
+                model_name: model_info['model_id']
+                for model_name, model_info in active.items()
+            }
+
+            stats_by_id = self.repo.get_performance_stats_bulk(list(model_ids.values()), hours)
+
+            performance = {}
+            for model_name, model_id in model_ids.items():
+                stats = dict(stats_by_id.get(model_id) or {})
+
+                # Add local metrics
+                model_info = active[model_name]
+                stats['local_prediction_count'] = model_info['prediction_count']
+                stats['loaded_at'] = model_info['loaded_at']
+
+                performance[model_name] = stats
+
+            return performance
+
+        except Exception as e:
+            self.log_error(f"Error getting all model performance: {str(e)}")
+            return {}
+
     def get_all_models_status(self) -> Dict[str, Dict]:
         """
         Get status of all active models
@@ -442,7 +732,9 @@ class ModelManager(LoggerMixin):
             True if successful
         """
         try:
-            model_info = self.repo.get_active_model(model_name)
+            # A forced reload always reads fresh metadata
+            self._invalidate_metadata(model_name)
+            model_info = self._get_active_model_info(model_name)
 
             if not model_info:
                 self.log_error(f"Active model not found: {model_name}")
@@ -454,6 +746,69 @@ class ModelManager(LoggerMixin):
             self.log_error(f"Error reloading model: {str(e)}")
             return False
 
+    def _get_active_model_info(self, model_name: str) -> Optional[Dict]:
+        """
+        Get active model metadata through the metadata cache
+
+        Args:
+            model_name: Model name
+
+        Returns:
+            Model metadata or None
+        """
+        return self._cached_metadata(
+            ('active', model_name), self.METADATA_CACHE_TTL,
+            lambda: self.repo.get_active_model(model_name), model_name
+        )
+
+    def _cached_metadata(self, key: Any, ttl: float, loader, model_name: Optional[str]) -> Any:
+        """
+        Return a cached repository metadata lookup, loading it on miss
+
+        Entries are tagged with the repository revision read before loading,
+        so an activation made by another worker (which bumps the revision) is
+        seen on the next call; the TTL only bounds entries while the cache
+        is unavailable. Empty results are not cached so a newly registered
+        model is picked up on the next call.
+
+        Args:
+            key: Cache key
+            ttl: Time to live in seconds
+            loader: Zero-argument callable that fetches the value
+            model_name: Model whose revision guards the entry (None for the
+                all-active listing)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        revision = self.repo.get_model_revision(model_name)
+        now = time.monotonic()
+        entry = self._meta_cache.get(key)
+        if entry is not None and entry[1] > now and entry[2] == revision:
+            return entry[0]
+
+        value = loader()
+        if value:
+            self._meta_cache[key] = (value, now + ttl, revision)
+        return value
+
+    def _invalidate_metadata(self, model_name: str) -> None:
+        """
+        Drop cached metadata for a model (and the all-active listing)
+
+        Args:
+            model_name: Model name
+        """
+        self._meta_cache.pop('all_active', None)
+        for key in list(self._meta_cache):
+            if isinstance(key, tuple) and key[1] == model_name:
+                self._meta_cache.pop(key, None)
+
+    def _invalidate_health_check(self) -> None:
+        """Drop the cached health_check result after a model state change"""
+        with self._health_lock:
+            self._health_cache = None
+
     def get_model_metadata(self, model_name: str) -> Optional[Dict]:
         """
         Get model metadata
@@ -482,25 +837,27 @@ class ModelManager(LoggerMixin):
             Health status dictionary
         """
         try:
-            status = {
-                'healthy': True,
-                'models': {}
-            }
-
-            for model_name in self.model_classes.keys():
-                if model_name in self.active_models:
-                    status['models'][model_name] = {
-                        'status': 'loaded',
-                        'version': self.active_models[model_name]['metadata'].get('version')
-                    }
-                else:
-                    status['models'][model_name] = {
-                        'status': 'not_loaded'
+            with self._health_lock:
+                now = time.monotonic()
+                if self._health_cache is None or self._health_cache[1] <= now:
+                    models = {name: dict(entry) for name, entry in self._model_health.items()}
+                    loaded_count = sum(1 for entry in models.values() if entry['status'] == 'loaded')
+                    status = {
+                        'healthy': loaded_count == len(models),
+                        'loaded_count': loaded_count,
+                        'total_count': len(models),
+                        'models': models
                     }
-                    status['healthy'] = False
+                    self._health_cache = (status, now + self.HEALTH_CHECK_TTL)
+                    self.log_debug(f"Health check: {status}")
 
-            self.log_debug(f"Health check: {status}")
-            return status
+                status = self._health_cache[0]
+
+            # Callers get their own copy of the cached result
+            return {
+                **status,
+                'models': {name: dict(entry) for name, entry in status['models'].items()}
+            }
 
         except Exception as e:
             self.log_error(f"Error in health check: {str(e)}")
@@ -3,8 +3,24 @@ Optimization Service
 Handles route and dispatch optimization
 """
 
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime
+import functools
+import hashlib
+import time
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # Without scipy dispatches are assigned greedily by severity
+    linear_sum_assignment = None
+
+try:
+    from sklearn.neighbors import BallTree
+except ImportError:  # Without scikit-learn every ambulance is scored
+    BallTree = None
 
 from ..config.logger import LoggerMixin
 from ..repositories import (
@@ -12,6 +28,69 @@ from ..repositories import (
 )
 from .prediction_service import PredictionService
 
+# Traffic scenarios of generate_alternatives: (scenario name, traffic level)
+TRAFFIC_SCENARIOS = (
+    ('normal_traffic', 2),  # Moderate traffic
+    ('heavy_traffic', 4),   # Heavy traffic
+    ('light_traffic', 1)    # Light traffic
+)
+
+
+def safe_service_method(error_message: str):
+    """
+    Turn exceptions of a service method into an error response
+
+    Logs "<error_message>: <exception>" with its traceback and returns
+    {'error': str(e)}, the contract every public OptimizationService method
+    had with its own try/except block.
+
+    Args:
+        error_message: Log message prefix
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            except Exception as e:
+                self.log_exception("%s: %s", error_message, e)
+                return {'error': str(e)}
+
+        return wrapper
+
+    return decorator
+
+
+# Plan sections of optimize_dispatch: (plan key, prediction key, ((plan field, prediction field), ...))
+PLAN_SECTIONS = (
+    ('severity', 'severity', (
+        ('level', 'level'),
+        ('category', 'category'),
+        ('confidence', 'confidence')
+    )),
+    ('ambulance', 'ambulance_selection', (
+        ('id', 'ambulance_id'),
+        ('confidence', 'confidence'),
+        ('distance_km', 'distance_km'),
+        ('estimated_arrival', 'estimated_arrival')
+    )),
+    ('route', 'route', (
+        ('primary', 'primary_route'),
+        ('alternatives', 'alternative_routes'),
+        ('recommendations', 'recommendations')
+    )),
+    ('eta', 'eta', (
+        ('estimated_minutes', 'estimated_minutes'),
+        ('optimistic', 'eta_minutes_optimistic'),
+        ('pessimistic', 'eta_minutes_pessimistic'),
+        ('confidence', 'confidence')
+    ))
+)
+
+# Shared pool that confirms the ETA of every assignment in a batch concurrently
+ETA_MAX_WORKERS = 32
+_ETA_EXECUTOR = ThreadPoolExecutor(max_workers=ETA_MAX_WORKERS, thread_name_prefix='assignment-eta')
+
 
 class OptimizationService(LoggerMixin):
     """
@@ -24,6 +103,24 @@ class OptimizationService(LoggerMixin):
     - Alternative scenario generation
     """
 
+    # Dispatch/ambulance rows read while tracking a live dispatch are kept
+    # briefly in process; telemetry re-polls every few seconds
+    LOOKUP_CACHE_TTL = 5.0  # seconds
+    LOOKUP_CACHE_MAX_ENTRIES = 512
+
+    # Alternative scenarios cached in Redis per rounded route
+    ALTERNATIVES_CACHE_TTL = 60  # seconds
+
+    # Dispatch plans cached in Redis; hits are served only while the chosen ambulance is available
+    PLAN_CACHE_TTL = 1800  # seconds
+
+    # Large fleets: only the nearest ambulances of each dispatch are scored
+    CANDIDATE_TREE_MIN_SIZE = 32
+    CANDIDATE_NEIGHBORS = 8
+
+    # Efficiency score weights: (completion rate, fleet availability)
+    EFFICIENCY_WEIGHTS = np.array([0.7, 0.3])
+
     def __init__(
         self,
         prediction_service: PredictionService,
@@ -45,12 +142,15 @@ class OptimizationService(LoggerMixin):
         self.ambulance_repo = ambulance_repo
         self.cache_repo = cache_repo
         self.engineer = FeatureEngineer()
+        self._dispatch_cache: Dict[int, Tuple[float, Dict]] = {}
+        self._ambulance_cache: Dict[int, Tuple[float, Dict]] = {}
         self.log_info("Initialized OptimizationService")
 
     # ============================================
     # DISPATCH OPTIMIZATION
     # ============================================
 
+    @safe_service_method("Error optimizing dispatch")
     def optimize_dispatch(
         self,
         dispatch_id: int,
@@ -76,77 +176,60 @@ class OptimizationService(LoggerMixin):
         Returns:
             Optimized dispatch plan
         """
-        try:
-            self.log_info(f"Optimizing dispatch {dispatch_id}")
-
-            # Get full predictions
-            dispatch_pred = self.prediction_service.predict_dispatch(
-                patient_lat,
-                patient_lon,
-                description,
-                required_ambulance_type=required_ambulance_type,
-                destination_lat=destination_lat,
-                destination_lon=destination_lon
-            )
-
-            if 'error' in dispatch_pred:
-                self.log_error(f"Prediction failed: {dispatch_pred['error']}")
-                return {'error': 'Optimization failed'}
-
-            # Extract results
-            ambulance_sel = dispatch_pred.get('ambulance_selection', {})
-            route_opt = dispatch_pred.get('route', {})
-            eta_pred = dispatch_pred.get('eta', {})
-            severity_pred = dispatch_pred.get('severity', {})
-
-            # Build optimized plan
-            plan = {
-                'dispatch_id': dispatch_id,
-                'timestamp': datetime.utcnow().isoformat(),
-                'patient_location': {
-                    'latitude': patient_lat,
-                    'longitude': patient_lon
-                },
-                'severity': {
-                    'level': severity_pred.get('level'),
-                    'category': severity_pred.get('category'),
-                    'confidence': severity_pred.get('confidence')
-                },
-                'ambulance': {
-                    'id': ambulance_sel.get('ambulance_id'),
-                    'confidence': ambulance_sel.get('confidence'),
-                    'distance_km': ambulance_sel.get('distance_km'),
-                    'estimated_arrival': ambulance_sel.get('estimated_arrival')
-                },
-                'route': {
-                    'primary': route_opt.get('primary_route'),
-                    'alternatives': route_opt.get('alternative_routes'),
-                    'recommendations': route_opt.get('recommendations')
-                },
-                'eta': {
-                    'estimated_minutes': eta_pred.get('estimated_minutes'),
-                    'optimistic': eta_pred.get('eta_minutes_optimistic'),
-                    'pessimistic': eta_pred.get('eta_minutes_pessimistic'),
-                    'confidence': eta_pred.get('confidence')
-                },
-                'status': 'optimized'
+        self.log_info("Optimizing dispatch %s", dispatch_id)
+
+        # Same dispatch with the same prediction inputs: reuse the cached plan
+        # while the ambulance it picked can still be dispatched
+        cache_key = self._plan_cache_key(
+            dispatch_id, patient_lat, patient_lon, description,
+            destination_lat, destination_lon, required_ambulance_type
+        )
+        cached = self.cache_repo.get(cache_key)
+        if isinstance(cached, dict) and self.prediction_service.is_ambulance_available(
+            (cached.get('ambulance') or {}).get('id')
+        ):
+            self.log_debug("Dispatch %s plan served from cache", dispatch_id)
+            return cached
+
+        # Get full predictions
+        dispatch_pred = self.prediction_service.predict_dispatch(
+            patient_lat,
+            patient_lon,
+            description,
+            required_ambulance_type=required_ambulance_type,
+            destination_lat=destination_lat,
+            destination_lon=destination_lon
+        )
+
+        if 'error' in dispatch_pred:
+            self.log_error("Prediction failed: %s", dispatch_pred['error'])
+            return {'error': 'Optimization failed'}
+
+        # Build optimized plan: project each prediction section onto the plan schema
+        plan = {
+            'dispatch_id': dispatch_id,
+            'timestamp': datetime.utcnow().isoformat(),
+            'patient_location': {
+                'latitude': patient_lat,
+                'longitude': patient_lon
             }
+        }
+        for section, prediction_key, fields in PLAN_SECTIONS:
+            prediction = dispatch_pred.get(prediction_key) or {}
+            plan[section] = {field: prediction.get(source) for field, source in fields}
+        plan['status'] = 'optimized'
 
-            # Cache the plan
-            cache_key = f"dispatch_plan:{dispatch_id}"
-            self.cache_repo.set(cache_key, plan, ttl=1800)  # 30 min cache
+        # Cache the plan
+        self.cache_repo.set(cache_key, plan, ttl=self.PLAN_CACHE_TTL)
 
-            self.log_info(f"Dispatch {dispatch_id} optimized successfully")
-            return plan
-
-        except Exception as e:
-            self.log_error(f"Error optimizing dispatch: {str(e)}")
-            return {'error': str(e)}
+        self.log_info("Dispatch %s optimized successfully", dispatch_id)
+        return plan
 
     # ============================================
     # MULTI-AMBULANCE OPTIMIZATION
     # ============================================
 
+    @safe_service_method("Error optimizing multiple dispatches")
     def optimize_multiple_dispatches(
         self,
         dispatches: List[Dict[str, Any]]
@@ -159,91 +242,238 @@ class OptimizationService(LoggerMixin):
         - Geographic clustering
         - Load balancing
 
+        Ambulances are matched to dispatches with a min-cost bipartite
+        assignment (Hungarian algorithm) over the score matrix, so the total
+        score is optimal rather than first-come-first-served. When there are
+        more dispatches than ambulances, the most severe ones are served.
+        The ETA of each assignment is then confirmed with the prediction
+        service, running the independent predictions concurrently.
+
         Args:
             dispatches: List of dispatch dictionaries
 
         Returns:
             Optimized assignments
         """
+        self.log_info("Optimizing %d dispatches", len(dispatches))
+
+        # Get available ambulances as parallel arrays
+        available = self.ambulance_repo.get_available_ambulances_soa()
+
+        if not len(available['ids']):
+            self.log_warning("No available ambulances for optimization")
+            return {'error': 'No available ambulances'}
+
+        # Sort dispatches by severity, most severe (5 = critical) first; stable,
+        # so equal severities keep their arrival order
+        severities = np.array([d.get('severity_level', 3) for d in dispatches], dtype=float)
+        order = np.argsort(-severities, kind='stable')
+        sorted_dispatches = [dispatches[i] for i in order]
+        severities = severities[order]
+
+        # Large fleet: keep only ambulances near some dispatch
+        candidates = self._candidate_ambulances(sorted_dispatches, available)
+        if candidates is not None:
+            available = {key: column[candidates] for key, column in available.items()}
+
+        assignments = []
+        routes = []
+
+        # Distance of every dispatch to every ambulance, computed once (N x M)
+        distances = self.engineer.calculate_distance_matrix(
+            [d['patient_lat'] for d in sorted_dispatches],
+            [d['patient_lon'] for d in sorted_dispatches],
+            available['lats'],
+            available['lons']
+        )
+
+        # Inverse of distance (closer is better)
+        distance_score = 1 / (distances + 1)
+
+        # Type match bonus
+        dispatch_types = np.array([d.get('required_type') for d in sorted_dispatches], dtype=object)
+        type_match = np.where(dispatch_types[:, None] == available['types'][None, :], 1.0, 0.5)
+
+        # Severity adjustment
+        severity_bonus = 1 + severities / 5
+
+        scores = distance_score * type_match * severity_bonus[:, None]
+
+        if linear_sum_assignment is not None:
+            # Critical dispatches keep priority: only the first min(N, M)
+            # in severity order compete for the ambulances
+            served = min(len(sorted_dispatches), len(available['ids']))
+            row_ind, col_ind = linear_sum_assignment(scores[:served], maximize=True)
+            pairs = zip(row_ind.tolist(), col_ind.tolist())
+        else:
+            pairs = self._assign_greedy(scores)
+
+        for i, j in pairs:
+            dispatch = sorted_dispatches[i]
+            assignments.append({
+                'dispatch_id': dispatch['id'],
+                'ambulance_id': int(available['ids'][j]),
+                'dispatch_severity': dispatch.get('severity_level'),
+                'distance_km': float(distances[i, j])
+            })
+            routes.append((
+                float(available['lats'][j]),
+                float(available['lons'][j]),
+                dispatch['patient_lat'],
+                dispatch['patient_lon']
+            ))
+
+        # Confirm each assignment's ETA; the calls are independent, so the
+        # model inference latency overlaps across the batch
+        for assignment, eta in zip(assignments, _ETA_EXECUTOR.map(self._predict_assignment_eta, routes)):
+            assignment['eta_minutes'] = eta
+
+        self.log_info("Assigned %d of %d dispatches", len(assignments), len(dispatches))
+        return {
+            'assignments': assignments,
+            'unassigned_count': len(dispatches) - len(assignments)
+        }
+
+    def _predict_assignment_eta(self, route: Tuple[float, float, float, float]) -> Optional[float]:
+        """
+        Predict the ETA of one ambulance-to-patient route
+
+        Args:
+            route: (origin_lat, origin_lon, destination_lat, destination_lon)
+
+        Returns:
+            Estimated minutes, or None if the prediction failed
+        """
         try:
-            self.log_info(f"Optimizing {len(dispatches)} dispatches")
+            eta = self.prediction_service.predict_eta(*route)
+            return eta.get('estimated_minutes')
+        except Exception as e:
+            self.log_warning("ETA prediction failed for assignment: %s", e)
+            return None
+
+    def _cached_lookup(self, cache: Dict[int, Tuple[float, Dict]], key: int, loader: Callable) -> Optional[Dict]:
+        """
+        Repository lookup through a short-lived in-process cache
 
-            # Get available ambulances
-            available = self.ambulance_repo.get_available_ambulances()
+        Args:
+            cache: Cache dict (key -> (expires, row))
+            key: Row ID
+            loader: Repository method that fetches the row by ID
 
-            if not available:
-                self.log_warning("No available ambulances for optimization")
-                return {'error': 'No available ambulances'}
+        Returns:
+            Row or None (misses are not cached)
+        """
+        now = time.monotonic()
+        entry = cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        row = loader(key)
+        if row:
+            if len(cache) >= self.LOOKUP_CACHE_MAX_ENTRIES:
+                cache.clear()
+            cache[key] = (now + self.LOOKUP_CACHE_TTL, row)
+        return row
+
+    @classmethod
+    def _plan_cache_key(
+        cls,
+        dispatch_id: int,
+        patient_lat: float,
+        patient_lon: float,
+        description: str,
+        destination_lat: Optional[float],
+        destination_lon: Optional[float],
+        required_ambulance_type: Optional[str]
+    ) -> str:
+        """Cache key of a dispatch plan over the inputs predict_dispatch sees"""
+        raw = (
+            f"{cls._round_coord(patient_lat)}|{cls._round_coord(patient_lon)}|{description}|"
+            f"{cls._round_coord(destination_lat)}|{cls._round_coord(destination_lon)}|{required_ambulance_type}"
+        )
+        return f"dispatch_plan:{dispatch_id}:" + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _round_coord(value: Optional[float], ndigits: int = 4) -> Optional[float]:
+        """Round a coordinate to ndigits decimals (4 is ~11 m) for cache keys"""
+        return round(value, ndigits) if value is not None else None
+
+    def _candidate_ambulances(
+        self,
+        dispatches: List[Dict[str, Any]],
+        available: Dict[str, np.ndarray]
+    ) -> Optional[List[int]]:
+        """
+        Indices of the ambulances worth scoring for a batch of dispatches
 
-            # Sort dispatches by severity (handle critical first)
-            sorted_dispatches = sorted(
-                dispatches,
-                key=lambda d: d.get('severity_level', 3)
+        Uses a haversine BallTree to take the CANDIDATE_NEIGHBORS nearest
+        ambulances of each dispatch. The union is only used when it still
+        holds enough ambulances to serve every dispatch that can be served.
+
+        Args:
+            dispatches: Dispatches to assign
+            available: Available ambulances as parallel arrays
+
+        Returns:
+            Sorted ambulance indices, or None to score the whole fleet
+        """
+        fleet_size = len(available['ids'])
+        if BallTree is None or fleet_size < self.CANDIDATE_TREE_MIN_SIZE:
+            return None
+
+        k = self.CANDIDATE_NEIGHBORS
+        if not dispatches or len(dispatches) * k >= fleet_size:
+            return None
+
+        try:
+            ambulance_coords = np.radians(np.column_stack((available['lats'], available['lons'])))
+            dispatch_coords = np.radians(
+                np.array([[d['patient_lat'], d['patient_lon']] for d in dispatches], dtype=float)
             )
+            tree = BallTree(ambulance_coords, metric='haversine')
+            neighbors = tree.query(dispatch_coords, k=k, return_distance=False)
+        except (TypeError, ValueError):
+            # Missing coordinates: score the whole fleet as before
+            return None
 
-            assignments = []
-            used_ambulances = set()
-
-            # Assign ambulances greedily by severity
-            for dispatch in sorted_dispatches:
-                best_ambulance = None
-                best_score = -1
-
-                for ambulance in available:
-                    if ambulance['id'] in used_ambulances:
-                        continue
-
-                    # Calculate score
-                    distance = self.engineer.calculate_distance(
-                        dispatch['patient_lat'],
-                        dispatch['patient_lon'],
-                        ambulance['current_lat'],
-                        ambulance['current_lon']
-                    )
-
-                    # Inverse of distance (closer is better)
-                    distance_score = 1 / (distance + 1)
-
-                    # Type match bonus
-                    type_match = 1.0 if ambulance.get('type') == dispatch.get('required_type') else 0.5
-
-                    # Severity adjustment
-                    severity_bonus = 1 + (dispatch.get('severity_level', 3) / 5)
-
-                    score = distance_score * type_match * severity_bonus
-
-                    if score > best_score:
-                        best_score = score
-                        best_ambulance = ambulance
-
-                if best_ambulance:
-                    used_ambulances.add(best_ambulance['id'])
-                    assignments.append({
-                        'dispatch_id': dispatch['id'],
-                        'ambulance_id': best_ambulance['id'],
-                        'dispatch_severity': dispatch.get('severity_level'),
-                        'distance_km': self.engineer.calculate_distance(
-                            dispatch['patient_lat'],
-                            dispatch['patient_lon'],
-                            best_ambulance['current_lat'],
-                            best_ambulance['current_lon']
-                        )
-                    })
-
-            self.log_info(f"Assigned {len(assignments)} of {len(dispatches)} dispatches")
-            return {
-                'assignments': assignments,
-                'unassigned_count': len(dispatches) - len(assignments)
-            }
+        candidates = np.unique(neighbors)
+        if len(candidates) < min(len(dispatches), fleet_size):
+            return None
 
-        except Exception as e:
-            self.log_error(f"Error optimizing multiple dispatches: {str(e)}")
-            return {'error': str(e)}
+        return candidates.tolist()
+
+    @staticmethod
+    def _assign_greedy(scores: np.ndarray) -> List[tuple]:
+        """
+        Greedy assignment in row order (fallback when scipy is unavailable)
+
+        Args:
+            scores: (N, M) dispatch x ambulance score matrix, rows sorted most
+                severe first so critical dispatches pick before the rest
+
+        Returns:
+            List of (dispatch index, ambulance index) pairs
+        """
+        pairs = []
+
+        # A used ambulance's mask entry becomes -inf, so it can never win argmax again
+        mask = np.ones(scores.shape[1])
+        for i in range(scores.shape[0]):
+            row = scores[i] * mask
+            j = int(np.argmax(row))
+            if row[j] <= 0:
+                continue
+
+            mask[j] = -np.inf
+            pairs.append((i, j))
+
+        return pairs
 
     # ============================================
     # ALTERNATIVE SCENARIOS
     # ============================================
 
+    @safe_service_method("Error generating alternatives")
     def generate_alternatives(
         self,
         dispatch_id: int,
@@ -265,78 +495,65 @@ class OptimizationService(LoggerMixin):
         Returns:
             Alternative scenarios
         """
-        try:
-            self.log_info(f"Generating {num_scenarios} alternative scenarios for dispatch {dispatch_id}")
-
-            scenarios = []
-
-            # Scenario 1: Normal (current traffic)
-            normal_route = self.prediction_service.optimize_route(
-                patient_lat, patient_lon,
-                destination_lat, destination_lon,
-                traffic_level=2,  # Moderate traffic
-                num_alternatives=0
+        self.log_info("Generating %s alternative scenarios for dispatch %s", num_scenarios, dispatch_id)
+
+        # Scenarios depend only on the route, so nearby requests (3 decimals,
+        # ~110 m) share them regardless of the dispatch
+        cache_key = ":".join(
+            str(part) for part in (
+                'alt_scenarios',
+                self._round_coord(patient_lat, 3), self._round_coord(patient_lon, 3),
+                self._round_coord(destination_lat, 3), self._round_coord(destination_lon, 3),
+                num_scenarios
             )
+        )
+        cached = self.cache_repo.get(cache_key)
+        if isinstance(cached, dict):
+            return {**cached, 'dispatch_id': dispatch_id}
+
+        scenarios = []
+
+        # Scenarios 1-3: normal, heavy and light traffic, predicted in one
+        # batch that shares the route setup across traffic levels
+        cases = TRAFFIC_SCENARIOS[:max(num_scenarios, 1)]
+        routes = self.prediction_service.optimize_route_batch(
+            patient_lat, patient_lon,
+            destination_lat, destination_lon,
+            traffic_levels=[traffic_level for _, traffic_level in cases],
+            num_alternatives=0
+        )
+
+        for (scenario, traffic_level), route in zip(cases, routes):
             scenarios.append({
-                'scenario': 'normal_traffic',
-                'traffic_level': 2,
-                'eta_minutes': normal_route.get('eta_minutes'),
-                'route': normal_route.get('primary_route')
+                'scenario': scenario,
+                'traffic_level': traffic_level,
+                'eta_minutes': route.get('eta_minutes'),
+                'route': route.get('primary_route')
             })
 
-            # Scenario 2: Heavy traffic
-            if num_scenarios > 1:
-                heavy_route = self.prediction_service.optimize_route(
-                    patient_lat, patient_lon,
-                    destination_lat, destination_lon,
-                    traffic_level=4,  # Heavy traffic
-                    num_alternatives=0
-                )
-                scenarios.append({
-                    'scenario': 'heavy_traffic',
-                    'traffic_level': 4,
-                    'eta_minutes': heavy_route.get('eta_minutes'),
-                    'route': heavy_route.get('primary_route')
-                })
-
-            # Scenario 3: Light traffic
-            if num_scenarios > 2:
-                light_route = self.prediction_service.optimize_route(
-                    patient_lat, patient_lon,
-                    destination_lat, destination_lon,
-                    traffic_level=1,  # Light traffic
-                    num_alternatives=0
-                )
-                scenarios.append({
-                    'scenario': 'light_traffic',
-                    'traffic_level': 1,
-                    'eta_minutes': light_route.get('eta_minutes'),
-                    'route': light_route.get('primary_route')
-                })
-
-            # Scenario 4: Optimal path (if available)
-            if num_scenarios > 3:
-                scenarios.append({
-                    'scenario': 'route_A_alternative',
-                    'description': 'Use main highway route',
-                    'advantages': ['Faster on light traffic', 'Well-known route'],
-                    'disadvantages': ['Congestion during peak hours']
-                })
-
-            return {
-                'dispatch_id': dispatch_id,
-                'scenarios': scenarios,
-                'recommended': scenarios[0] if scenarios else None
-            }
+        # Scenario 4: Optimal path (if available)
+        if num_scenarios > 3:
+            scenarios.append({
+                'scenario': 'route_A_alternative',
+                'description': 'Use main highway route',
+                'advantages': ['Faster on light traffic', 'Well-known route'],
+                'disadvantages': ['Congestion during peak hours']
+            })
 
-        except Exception as e:
-            self.log_error(f"Error generating alternatives: {str(e)}")
-            return {'error': str(e)}
+        result = {
+            'dispatch_id': dispatch_id,
+            'scenarios': scenarios,
+            'recommended': scenarios[0] if scenarios else None
+        }
+
+        self.cache_repo.set(cache_key, result, ttl=self.ALTERNATIVES_CACHE_TTL)
+        return result
 
     # ============================================
     # REAL-TIME OPTIMIZATION
     # ============================================
 
+    @safe_service_method("Error reoptimizing dispatch")
     def reoptimize_active_dispatch(
         self,
         dispatch_id: int,
@@ -356,69 +573,81 @@ class OptimizationService(LoggerMixin):
         Returns:
             Updated optimization
         """
-        try:
-            # Get dispatch info
-            dispatch = self.dispatch_repo.get_dispatch(dispatch_id)
-
-            if not dispatch:
-                self.log_error(f"Dispatch not found: {dispatch_id}")
-                return {'error': 'Dispatch not found'}
-
-            # Use current ambulance location if provided
-            if current_ambulance_lat is None:
-                ambulance_id = dispatch.get('assigned_ambulance_id')
-                if ambulance_id:
-                    ambulance = self.ambulance_repo.get_ambulance(ambulance_id)
-                    current_ambulance_lat = ambulance.get('current_lat')
-                    current_ambulance_lon = ambulance.get('current_lon')
-
-            if not current_ambulance_lat:
-                return {'error': 'Ambulance location unknown'}
-
-            # Predict new ETA with current traffic
-            new_eta = self.prediction_service.predict_eta(
-                current_ambulance_lat,
-                current_ambulance_lon,
-                dispatch.get('destination_lat', 0),
-                dispatch.get('destination_lon', 0),
-                traffic_level=current_traffic_level,
-                time_of_day=datetime.utcnow().hour
-            )
-
-            # Optimize new route
-            new_route = self.prediction_service.optimize_route(
-                current_ambulance_lat,
-                current_ambulance_lon,
-                dispatch.get('destination_lat', 0),
-                dispatch.get('destination_lon', 0),
-                traffic_level=current_traffic_level,
-                time_of_day=datetime.utcnow().hour
-            )
-
-            result = {
-                'dispatch_id': dispatch_id,
-                'reoptimized_at': datetime.utcnow().isoformat(),
-                'current_traffic_level': current_traffic_level,
-                'updated_eta': new_eta.get('estimated_minutes'),
-                'updated_route': new_route.get('primary_route'),
-                'recommendations': new_route.get('recommendations'),
-                'status': 'reoptimized'
-            }
-
-            # Cache update
-            self.cache_repo.set(f"reoptimization:{dispatch_id}", result, ttl=300)
-
-            self.log_info(f"Dispatch {dispatch_id} reoptimized with new ETA: {result['updated_eta']} min")
-            return result
-
-        except Exception as e:
-            self.log_error(f"Error reoptimizing dispatch: {str(e)}")
-            return {'error': str(e)}
+        # Get dispatch info
+        dispatch = self._cached_lookup(self._dispatch_cache, dispatch_id, self.dispatch_repo.get_dispatch)
+
+        if not dispatch:
+            self.log_error("Dispatch not found: %s", dispatch_id)
+            return {'error': 'Dispatch not found'}
+
+        # Use current ambulance location if provided
+        if current_ambulance_lat is None:
+            ambulance_id = dispatch.get('assigned_ambulance_id')
+            if ambulance_id:
+                ambulance = self._cached_lookup(
+                    self._ambulance_cache, ambulance_id, self.ambulance_repo.get_ambulance
+                )
+                current_ambulance_lat = ambulance.get('current_lat')
+                current_ambulance_lon = ambulance.get('current_lon')
+
+        if not current_ambulance_lat:
+            return {'error': 'Ambulance location unknown'}
+
+        # Re-poll from the same position under the same traffic: reuse the last result
+        cache_key = (
+            f"reoptimization:{dispatch_id}:{current_traffic_level}:"
+            f"{self._round_coord(current_ambulance_lat)}:{self._round_coord(current_ambulance_lon)}"
+        )
+        cached = self.cache_repo.get(cache_key)
+        if isinstance(cached, dict):
+            return cached
+
+        # One clock read for both predictions and the result timestamp
+        now = datetime.utcnow()
+        destination_lat = dispatch.get('destination_lat', 0)
+        destination_lon = dispatch.get('destination_lon', 0)
+
+        # Predict new ETA with current traffic
+        new_eta = self.prediction_service.predict_eta(
+            current_ambulance_lat,
+            current_ambulance_lon,
+            destination_lat,
+            destination_lon,
+            traffic_level=current_traffic_level,
+            time_of_day=now.hour
+        )
+
+        # Optimize new route
+        new_route = self.prediction_service.optimize_route(
+            current_ambulance_lat,
+            current_ambulance_lon,
+            destination_lat,
+            destination_lon,
+            traffic_level=current_traffic_level,
+            time_of_day=now.hour
+        )
+
+        result = {
+            'dispatch_id': dispatch_id,
+            'reoptimized_at': now.isoformat(),
+            'current_traffic_level': current_traffic_level,
+            'updated_eta': new_eta.get('estimated_minutes'),
+            'updated_route': new_route.get('primary_route'),
+            'recommendations': new_route.get('recommendations'),
+            'status': 'reoptimized'
+        }
+
+        # Cache update
+        self.cache_repo.set(cache_key, result, ttl=300)
+
+        self.log_info("Dispatch %s reoptimized with new ETA: %s min", dispatch_id, result['updated_eta'])
+        return result
 
     # ============================================
     # PERFORMANCE METRICS
     # ============================================
 
+    @safe_service_method("Error getting optimization metrics")
     def get_optimization_metrics(self, hours: int = 24) -> Dict[str, Any]:
         """
         Get optimization service metrics
@@ -429,26 +658,21 @@ class OptimizationService(LoggerMixin):
         Returns:
             Performance metrics
         """
-        try:
-            # Get dispatch statistics
-            stats = self.dispatch_repo.get_dispatch_statistics(hours)
-
-            # Get ambulance stats
-            fleet_status = self.ambulance_repo.get_fleet_status()
-
-            metrics = {
-                'period_hours': hours,
-                'timestamp': datetime.utcnow().isoformat(),
-                'dispatch_stats': stats,
-                'fleet_status': fleet_status,
-                'optimization_efficiency': self._calculate_efficiency(stats, fleet_status)
-            }
+        # Get dispatch statistics
+        stats = self.dispatch_repo.get_dispatch_statistics(hours)
 
-            return metrics
+        # Get ambulance stats
+        fleet_status = self.ambulance_repo.get_fleet_status()
 
-        except Exception as e:
-            self.log_error(f"Error getting optimization metrics: {str(e)}")
-            return {'error': str(e)}
+        metrics = {
+            'period_hours': hours,
+            'timestamp': datetime.utcnow().isoformat(),
+            'dispatch_stats': stats,
+            'fleet_status': fleet_status,
+            'optimization_efficiency': self._calculate_efficiency(stats, fleet_status)
+        }
+
+        return metrics
 
     def _calculate_efficiency(self, stats: Dict, fleet: Dict) -> float:
         """Calculate optimization efficiency score"""
@@ -457,13 +681,13 @@ class OptimizationService(LoggerMixin):
                 return 0.0
 
             # Calculate based on multiple factors
-            completion_rate = stats.get('completion_rate', 0)  # 0-1
-            availability = fleet.get('availability_percent', 0) / 100  # 0-1
+            values = np.array([
+                float(stats.get('completion_rate', 0)),  # 0-1
+                fleet.get('availability_percent', 0) / 100  # 0-1
+            ])
 
             # Weight completion rate more heavily
-            efficiency = (completion_rate * 0.7) + (availability * 0.3)
-
-            return round(efficiency, 2)
+            return round(float(self.EFFICIENCY_WEIGHTS @ values), 2)
 
         except Exception:
             return 0.0
@@ -3,8 +3,12 @@ Prediction Service
 Orchestrates predictions across all ML models
 """
 
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+from types import MappingProxyType
+import hashlib
 import time
 
 from ..config.logger import LoggerMixin
@@ -14,6 +18,43 @@ from ..repositories import (
 )
 from .model_manager import ModelManager
 
+# Read-only fallback results, built once; helpers hand out shallow copies
+# (nested values are tuples so the copies cannot alter the shared defaults)
+EMPTY_SEVERITY = MappingProxyType({
+    'level': 3,  # Default to medium
+    'category': 'Unknown',
+    'confidence': 0.0,
+    'error': 'Prediction failed'
+})
+EMPTY_ETA = MappingProxyType({
+    'estimated_minutes': 15,  # Default estimate
+    'confidence': 0.0,
+    'error': 'Prediction failed'
+})
+EMPTY_AMBULANCE_SELECTION = MappingProxyType({
+    'ambulance_id': None,
+    'confidence': 0.0,
+    'ranking': (),
+    'error': 'Selection failed'
+})
+EMPTY_ROUTE = MappingProxyType({
+    'primary_route': None,
+    'alternative_routes': (),
+    'eta_minutes': None,
+    'recommendations': ('Route optimization failed',),
+    'error': 'Optimization failed'
+})
+
+# Shared pool for independent prediction work: the dispatch pipeline stages
+# that do not depend on severity, and chunks of batch predictions
+PIPELINE_MAX_WORKERS = 8
+_PIPELINE_EXECUTOR = ThreadPoolExecutor(max_workers=PIPELINE_MAX_WORKERS, thread_name_prefix='dispatch-pipeline')
+
+# Separate pool for the traffic levels of optimize_route_batch, so a batch
+# started from a pipeline worker never waits on its own pool
+ROUTE_LEVEL_MAX_WORKERS = 4
+_ROUTE_LEVEL_EXECUTOR = ThreadPoolExecutor(max_workers=ROUTE_LEVEL_MAX_WORKERS, thread_name_prefix='route-level')
+
 
 class PredictionService(LoggerMixin):
     """
@@ -28,13 +69,24 @@ class PredictionService(LoggerMixin):
     - Result caching
     """
 
+    # Severity predictions for repeated inputs: in-process first, then Redis
+    SEVERITY_CACHE_TTL = 300  # seconds
+    SEVERITY_CACHE_MAX_ENTRIES = 1024
+
+    # Full pipeline results per ~110 m patient bucket and identical inputs
+    DISPATCH_CACHE_TTL = 60  # seconds
+
+    # Reuse one clock reading for the hour/weekday features within this window
+    CLOCK_CACHE_SECONDS = 1.0
+
     def __init__(
         self,
         model_manager: ModelManager,
         dispatch_repo: DispatchRepository,
         ambulance_repo: AmbulanceRepository,
         model_repo: ModelRepository,
-        cache_repo: CacheRepository
+        cache_repo: CacheRepository,
+        warmup: bool = False
     ):
         """
         Initialize Prediction Service
@@ -45,6 +97,7 @@ class PredictionService(LoggerMixin):
             ambulance_repo: AmbulanceRepository instance
             model_repo: ModelRepository instance
             cache_repo: CacheRepository instance
+            warmup: Run warmup() from the constructor (app startup calls it explicitly)
         """
         self.model_manager = model_manager
         self.dispatch_repo = dispatch_repo
@@ -52,8 +105,70 @@ class PredictionService(LoggerMixin):
         self.model_repo = model_repo
         self.cache_repo = cache_repo
         self.engineer = FeatureEngineer()
+        self._severity_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._now_cache: Tuple[float, Optional[datetime]] = (0.0, None)
         self.log_info("Initialized PredictionService")
 
+        if warmup:
+            self.warmup()
+
+    def warmup(self) -> Dict[str, bool]:
+        """
+        Pay one-time costs before the first real request
+
+        Loads every model through the model manager (get_model loads lazily,
+        reading metadata and model files through the repositories), compiles
+        the numba feature kernels and runs one synthetic prediction per model.
+        The models are called directly, so warm-up records no prediction
+        telemetry and caches no prediction results.
+
+        Returns:
+            Dictionary of model name -> whether its warm-up prediction ran
+        """
+        start_time = time.perf_counter()
+        now = self._now()
+
+        samples = {
+            'severity': lambda: self.engineer.extract_severity_indicators('headache', None, None),
+            'eta': lambda: self._eta_features(0.0, 0.0, 0.1, 0.1, 1, now.hour, now.weekday()),
+            'ambulance': lambda: {
+                'patient_lat': 0.0,
+                'patient_lon': 0.0,
+                'available_ambulances': [
+                    {'id': 0, 'current_lat': 0.1, 'current_lon': 0.1, 'type': 'basic', 'status': 'available'}
+                ],
+                'severity_level': 3,
+                'required_type': 'basic'
+            },
+            'route': lambda: {
+                'origin_lat': 0.0,
+                'origin_lon': 0.0,
+                'destination_lat': 0.1,
+                'destination_lon': 0.1,
+                'traffic_level': 1,
+                'time_of_day': now.hour,
+                'day_of_week': now.weekday(),
+                'num_alternatives': 0
+            }
+        }
+
+        warmed = {}
+        for name, build_features in samples.items():
+            warmed[name] = False
+            try:
+                # Feature extraction runs even without a model, compiling the kernels
+                features = build_features()
+                model = self.model_manager.get_model(name)
+                if model:
+                    model.predict(features)
+                    warmed[name] = True
+            except Exception as e:
+                self.log_warning("Warm-up of %s model failed: %s", name, e)
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.log_info("Warm-up finished in %.1fms: %s", elapsed_ms, warmed)
+        return warmed
+
     # ============================================
     # SEVERITY PREDICTION
     # ============================================
@@ -76,7 +191,13 @@ class PredictionService(LoggerMixin):
             Severity prediction with confidence
         """
         try:
-            start_time = time.time()
+            # Identical inputs (e.g. repeated "chest pain" reports) skip the model
+            cache_key = self._severity_cache_key(description, vital_signs, age)
+            cached = self._get_cached_severity(cache_key)
+            if cached is not None:
+                return cached
+
+            start_time = time.perf_counter()
 
             # Extract features
             features = self.engineer.extract_severity_indicators(description, vital_signs, age)
@@ -91,7 +212,7 @@ class PredictionService(LoggerMixin):
             prediction = model.predict(features)
 
             # Record prediction
-            elapsed_ms = (time.time() - start_time) * 1000
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
             self.model_manager.record_prediction(
                 'severity',
                 prediction_time_ms=elapsed_ms,
@@ -100,22 +221,62 @@ class PredictionService(LoggerMixin):
                 confidence=prediction.get('confidence', 0)
             )
 
-            self.log_debug(f"Severity prediction: level {prediction.get('level')}, confidence {prediction.get('confidence')}")
+            self.log_debug("Severity prediction: level %s, confidence %s", prediction.get('level'), prediction.get('confidence'))
 
+            self._store_cached_severity(cache_key, prediction)
             return prediction
 
         except Exception as e:
-            self.log_error(f"Error predicting severity: {str(e)}")
+            self.log_error("Error predicting severity: %s", e)
             return self._empty_severity_prediction()
 
+    @staticmethod
+    def _severity_cache_key(
+        description: str,
+        vital_signs: Optional[Dict],
+        age: Optional[int]
+    ) -> str:
+        """Hash the severity inputs into a compact cache key"""
+        vitals = repr(sorted(vital_signs.items())) if vital_signs else ''
+        raw = f"{description}|{vitals}|{age}"
+        return 'severity:' + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def _get_cached_severity(self, cache_key: str) -> Optional[Dict]:
+        """
+        Look up a severity prediction in the process cache, then in Redis
+
+        Args:
+            cache_key: Key from _severity_cache_key
+
+        Returns:
+            Copy of the cached prediction or None
+        """
+        now = time.monotonic()
+        entry = self._severity_cache.get(cache_key)
+        if entry is not None and entry[0] > now:
+            return dict(entry[1])
+
+        cached = self.get_cached_prediction(cache_key)
+        if isinstance(cached, dict):
+            self._remember_severity(cache_key, cached, now)
+            return dict(cached)
+
+        return None
+
+    def _store_cached_severity(self, cache_key: str, prediction: Dict) -> None:
+        """Store a severity prediction in the process cache and in Redis"""
+        self._remember_severity(cache_key, dict(prediction), time.monotonic())
+        self.cache_prediction(cache_key, prediction, ttl=self.SEVERITY_CACHE_TTL)
+
+    def _remember_severity(self, cache_key: str, prediction: Dict, now: float) -> None:
+        """Keep a severity prediction in the bounded process cache"""
+        if len(self._severity_cache) >= self.SEVERITY_CACHE_MAX_ENTRIES:
+            self._severity_cache.clear()
+        self._severity_cache[cache_key] = (now + self.SEVERITY_CACHE_TTL, prediction)
+
     def _empty_severity_prediction(self) -> Dict[str, Any]:
         """Create empty severity prediction on error"""
-        return {
-            'level': 3,  # Default to medium
-            'category': 'Unknown',
-            'confidence': 0.0,
-            'error': 'Prediction failed'
-        }
+        return dict(EMPTY_SEVERITY)
 
     # ============================================
     # ETA PREDICTION
@@ -129,7 +290,8 @@ class PredictionService(LoggerMixin):
         destination_lon: float,
         traffic_level: int = 1,
         time_of_day: Optional[int] = None,
-        day_of_week: Optional[int] = None
+        day_of_week: Optional[int] = None,
+        now: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Predict ambulance arrival time
@@ -140,37 +302,30 @@ class PredictionService(LoggerMixin):
             traffic_level: Current traffic (0-5)
             time_of_day: Hour of day (0-23)
             day_of_week: Day of week (0-6, Monday=0)
+            now: Current UTC time (optional, read from the cached clock)
 
         Returns:
             ETA prediction with bounds
         """
+        if self._missing_coordinates(origin_lat, origin_lon, destination_lat, destination_lon):
+            self.log_warning("ETA prediction skipped: route coordinates missing")
+            return self._empty_eta_prediction()
+
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             # Default time values
-            now = datetime.utcnow()
+            now = now or self._now()
             time_of_day = time_of_day or now.hour
             day_of_week = day_of_week or now.weekday()
 
             # Extract features
-            geo_features = self.engineer.extract_geographic_features(
+            features = self._eta_features(
                 origin_lat, origin_lon,
-                destination_lat, destination_lon
+                destination_lat, destination_lon,
+                traffic_level, time_of_day, day_of_week
             )
 
-            temporal_features = self.engineer.extract_datetime_features(now)
-
-            traffic_features = self.engineer.encode_traffic_level(traffic_level)
-
-            # Combine features
-            features = {
-                **geo_features,
-                'hour_of_day': time_of_day,
-                'day_of_week': day_of_week,
-                'traffic_level': traffic_level,
-                **traffic_features
-            }
-
             # Get model
             model = self.model_manager.get_model('eta')
             if not model:
@@ -181,30 +336,54 @@ class PredictionService(LoggerMixin):
             prediction = model.predict(features)
 
             # Record prediction
-            elapsed_ms = (time.time() - start_time) * 1000
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
             self.model_manager.record_prediction(
                 'eta',
                 prediction_time_ms=elapsed_ms,
-                input_features=len(features),
+                input_features=FeatureEngineer.ETA_FEATURE_COUNT,
                 output_value=float(prediction.get('estimated_minutes', 0)),
                 confidence=prediction.get('confidence', 0)
             )
 
-            self.log_debug(f"ETA prediction: {prediction.get('estimated_minutes')} ± {prediction.get('confidence')}")
+            self.log_debug("ETA prediction: %s ± %s", prediction.get('estimated_minutes'), prediction.get('confidence'))
 
             return prediction
 
         except Exception as e:
-            self.log_error(f"Error predicting ETA: {str(e)}")
+            self.log_error("Error predicting ETA: %s", e)
             return self._empty_eta_prediction()
 
+    @staticmethod
+    def _missing_coordinates(*coordinates: Optional[float]) -> bool:
+        """Whether any coordinate is missing (0.0 is a valid coordinate)"""
+        return any(value is None for value in coordinates)
+
+    def _eta_features(
+        self,
+        origin_lat: float,
+        origin_lon: float,
+        destination_lat: float,
+        destination_lon: float,
+        traffic_level: int,
+        time_of_day: int,
+        day_of_week: int
+    ) -> Dict[str, Any]:
+        """Build the ETA model features for one route"""
+        features = self.engineer.extract_geographic_features(
+            origin_lat, origin_lon,
+            destination_lat, destination_lon
+        )
+
+        # Extended in place, no intermediate dicts
+        features['hour_of_day'] = time_of_day
+        features['day_of_week'] = day_of_week
+        features['traffic_level'] = traffic_level
+        features.update(self.engineer.encode_traffic_level(traffic_level))
+        return features
+
     def _empty_eta_prediction(self) -> Dict[str, Any]:
         """Create empty ETA prediction on error"""
-        return {
-            'estimated_minutes': 15,  # Default estimate
-            'confidence': 0.0,
-            'error': 'Prediction failed'
-        }
+        return dict(EMPTY_ETA)
 
     # ============================================
     # AMBULANCE SELECTION
@@ -230,21 +409,22 @@ class PredictionService(LoggerMixin):
         Returns:
             Selected ambulance with ranking
         """
+        if self._missing_coordinates(patient_lat, patient_lon):
+            self.log_warning("Ambulance selection skipped: patient coordinates missing")
+            return self._empty_ambulance_selection()
+
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             # Get available ambulances
             ambulances = self.ambulance_repo.get_available_ambulances_near(
                 patient_lat,
                 patient_lon,
                 radius_km=15,  # Search within 15km
-                limit=20
+                limit=20,
+                exclude_ids=set(exclude_ids) if exclude_ids else None
             )
 
-            # Filter out excluded
-            if exclude_ids:
-                ambulances = [a for a in ambulances if a['id'] not in exclude_ids]
-
             if not ambulances:
                 self.log_warning("No available ambulances found")
                 return self._empty_ambulance_selection()
@@ -268,7 +448,7 @@ class PredictionService(LoggerMixin):
             prediction = model.predict(features)
 
             # Record prediction
-            elapsed_ms = (time.time() - start_time) * 1000
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
             selected_id = prediction.get('ambulance_id')
             confidence = prediction.get('confidence', 0)
 
@@ -280,22 +460,17 @@ class PredictionService(LoggerMixin):
                 confidence=float(confidence)
             )
 
-            self.log_debug(f"Ambulance selected: {selected_id}, confidence: {confidence}")
+            self.log_debug("Ambulance selected: %s, confidence: %s", selected_id, confidence)
 
             return prediction
 
         except Exception as e:
-            self.log_error(f"Error selecting ambulance: {str(e)}")
+            self.log_error("Error selecting ambulance: %s", e)
             return self._empty_ambulance_selection()
 
     def _empty_ambulance_selection(self) -> Dict[str, Any]:
         """Create empty ambulance selection on error"""
-        return {
-            'ambulance_id': None,
-            'confidence': 0.0,
-            'ranking': [],
-            'error': 'Selection failed'
-        }
+        return dict(EMPTY_AMBULANCE_SELECTION)
 
     # ============================================
     # ROUTE OPTIMIZATION
@@ -309,7 +484,8 @@ class PredictionService(LoggerMixin):
         destination_lon: float,
         traffic_level: int = 1,
         time_of_day: Optional[int] = None,
-        num_alternatives: int = 2
+        num_alternatives: int = 2,
+        now: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Optimize ambulance route
@@ -320,15 +496,17 @@ class PredictionService(LoggerMixin):
             traffic_level: Current traffic (0-5)
             time_of_day: Hour of day (optional)
             num_alternatives: Number of alternative routes
+            now: Current UTC time (optional, read from the cached clock)
 
         Returns:
             Optimized route with alternatives
         """
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             # Default time
-            time_of_day = time_of_day or datetime.utcnow().hour
+            now = now or self._now()
+            time_of_day = time_of_day or now.hour
 
             # Prepare features
             features = {
@@ -338,7 +516,7 @@ class PredictionService(LoggerMixin):
                 'destination_lon': destination_lon,
                 'traffic_level': traffic_level,
                 'time_of_day': time_of_day,
-                'day_of_week': datetime.utcnow().weekday(),
+                'day_of_week': now.weekday(),
                 'num_alternatives': num_alternatives
             }
 
@@ -352,34 +530,100 @@ class PredictionService(LoggerMixin):
             prediction = model.predict(features)
 
             # Record prediction
-            elapsed_ms = (time.time() - start_time) * 1000
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
             eta = prediction.get('eta_minutes', 0)
 
             self.model_manager.record_prediction(
                 'route',
                 prediction_time_ms=elapsed_ms,
-                input_features=len(features),
+                input_features=FeatureEngineer.ROUTE_FEATURE_COUNT,
                 output_value=float(eta),
                 confidence=0.85  # Default confidence for route
             )
 
-            self.log_debug(f"Route optimized: ETA {eta} minutes")
+            self.log_debug("Route optimized: ETA %s minutes", eta)
 
             return prediction
 
         except Exception as e:
-            self.log_error(f"Error optimizing route: {str(e)}")
+            self.log_error("Error optimizing route: %s", e)
             return self._empty_route_optimization()
 
+    def optimize_route_batch(
+        self,
+        origin_lat: float,
+        origin_lon: float,
+        destination_lat: float,
+        destination_lon: float,
+        traffic_levels: List[int],
+        time_of_day: Optional[int] = None,
+        num_alternatives: int = 2
+    ) -> List[Dict[str, Any]]:
+        """
+        Optimize the same route under several traffic levels
+
+        The model lookup and the shared route features are prepared once;
+        the levels are independent predictions, so they run concurrently
+        and are collected in level order.
+
+        Args:
+            origin_lat, origin_lon: Starting location
+            destination_lat, destination_lon: Hospital/destination
+            traffic_levels: Traffic levels (0-5), one route per level
+            time_of_day: Hour of day (optional)
+            num_alternatives: Number of alternative routes per level
+
+        Returns:
+            Optimized routes, in the order of traffic_levels
+        """
+        try:
+            start_time = time.perf_counter()
+
+            now = self._now()
+            base_features = {
+                'origin_lat': origin_lat,
+                'origin_lon': origin_lon,
+                'destination_lat': destination_lat,
+                'destination_lon': destination_lon,
+                'time_of_day': time_of_day or now.hour,
+                'day_of_week': now.weekday(),
+                'num_alternatives': num_alternatives
+            }
+
+            # Get model
+            model = self.model_manager.get_model('route')
+            if not model:
+                self.log_error("Route optimizer model not loaded")
+                return [self._empty_route_optimization() for _ in traffic_levels]
+
+            # Predict every traffic level concurrently (map keeps level order)
+            predictions = list(_ROUTE_LEVEL_EXECUTOR.map(
+                model.predict,
+                [{**base_features, 'traffic_level': level} for level in traffic_levels]
+            ))
+
+            # Record predictions, splitting the batch time evenly
+            elapsed_ms = (time.perf_counter() - start_time) * 1000 / max(len(predictions), 1)
+            for prediction in predictions:
+                self.model_manager.record_prediction(
+                    'route',
+                    prediction_time_ms=elapsed_ms,
+                    input_features=FeatureEngineer.ROUTE_FEATURE_COUNT,
+                    output_value=float(prediction.get('eta_minutes', 0)),
+                    confidence=0.85  # Default confidence for route
+                )
+
+            self.log_debug("Route optimized for %d traffic levels", len(predictions))
+
+            return predictions
+
+        except Exception as e:
+            self.log_error("Error optimizing route batch: %s", e)
+            return [self._empty_route_optimization() for _ in traffic_levels]
+
     def _empty_route_optimization(self) -> Dict[str, Any]:
         """Create empty route optimization on error"""
-        return {
-            'primary_route': None,
-            'alternative_routes': [],
-            'eta_minutes': None,
-            'recommendations': ['Route optimization failed'],
-            'error': 'Optimization failed'
-        }
+        return dict(EMPTY_ROUTE)
 
     # ============================================
     # FULL DISPATCH PREDICTION PIPELINE
@@ -405,6 +649,11 @@ class PredictionService(LoggerMixin):
         3. Route optimization
         4. ETA prediction
 
+        Route and ETA only depend on the locations, so when a destination is
+        given they run concurrently with severity and ambulance selection.
+        A recent result for the same inputs (patient location rounded to
+        ~110 m) is reused while its selected ambulance is still available.
+
         Args:
             patient_lat, patient_lon: Patient location
             description: Patient symptoms
@@ -417,16 +666,54 @@ class PredictionService(LoggerMixin):
             Complete dispatch prediction
         """
         try:
-            pipeline_start = time.time()
+            pipeline_start = time.perf_counter()
+
+            # One clock reading for the whole pipeline
+            now = self._now()
+
+            cache_key = self._dispatch_cache_key(
+                patient_lat, patient_lon, description, vital_signs, age,
+                required_ambulance_type, destination_lat, destination_lon
+            )
+            cached = self._get_cached_dispatch(cache_key)
+            if cached is not None:
+                cached['timestamp'] = now.isoformat()
+                cached['patient_location'] = {
+                    'latitude': patient_lat,
+                    'longitude': patient_lon
+                }
+                cached['pipeline_time_ms'] = round((time.perf_counter() - pipeline_start) * 1000, 2)
+                self.log_debug("Dispatch prediction served from cache")
+                return cached
 
             result = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': now.isoformat(),
                 'patient_location': {
                     'latitude': patient_lat,
                     'longitude': patient_lon
                 }
             }
 
+            # Steps 3-4 start right away; kept only if an ambulance is selected
+            route_future = eta_future = None
+            if destination_lat and destination_lon:
+                route_future = _PIPELINE_EXECUTOR.submit(
+                    self.optimize_route,
+                    patient_lat,
+                    patient_lon,
+                    destination_lat,
+                    destination_lon,
+                    now=now
+                )
+                eta_future = _PIPELINE_EXECUTOR.submit(
+                    self.predict_eta,
+                    patient_lat,
+                    patient_lon,
+                    destination_lat,
+                    destination_lon,
+                    now=now
+                )
+
             # Step 1: Predict severity
             severity_pred = self.predict_severity(description, vital_signs, age)
             result['severity'] = severity_pred
@@ -442,39 +729,90 @@ class PredictionService(LoggerMixin):
             result['ambulance_selection'] = ambulance_sel
 
             # Step 3: Optimize route (if we have ambulance and destination)
-            if ambulance_sel.get('ambulance_id') and destination_lat and destination_lon:
-                route_opt = self.optimize_route(
-                    patient_lat,
-                    patient_lon,
-                    destination_lat,
-                    destination_lon
-                )
-                result['route'] = route_opt
+            if route_future is not None:
+                route_opt = route_future.result()
+                eta_pred = eta_future.result()
+                if ambulance_sel.get('ambulance_id'):
+                    result['route'] = route_opt
 
-                # Step 4: ETA prediction
-                eta_pred = self.predict_eta(
-                    patient_lat,
-                    patient_lon,
-                    destination_lat,
-                    destination_lon
-                )
-                result['eta'] = eta_pred
+                    # Step 4: ETA prediction
+                    result['eta'] = eta_pred
 
             # Calculate total pipeline time
-            total_ms = (time.time() - pipeline_start) * 1000
+            total_ms = (time.perf_counter() - pipeline_start) * 1000
             result['pipeline_time_ms'] = round(total_ms, 2)
 
-            self.log_info(f"Dispatch prediction completed in {total_ms:.2f}ms")
+            self.log_info("Dispatch prediction completed in %.2fms", total_ms)
+
+            # Only complete results are reused: the selection is revalidated on hit
+            if ambulance_sel.get('ambulance_id') and 'error' not in ambulance_sel:
+                self.cache_prediction(cache_key, result, ttl=self.DISPATCH_CACHE_TTL)
 
             return result
 
         except Exception as e:
-            self.log_error(f"Error in dispatch prediction pipeline: {str(e)}")
+            self.log_error("Error in dispatch prediction pipeline: %s", e)
             return {
                 'error': str(e),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': self._now().isoformat()
             }
 
+    @staticmethod
+    def _dispatch_cache_key(
+        patient_lat: float,
+        patient_lon: float,
+        description: str,
+        vital_signs: Optional[Dict],
+        age: Optional[int],
+        required_ambulance_type: Optional[str],
+        destination_lat: Optional[float],
+        destination_lon: Optional[float]
+    ) -> str:
+        """Hash the dispatch pipeline inputs into a compact cache key"""
+        def bucket(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        vitals = repr(sorted(vital_signs.items())) if vital_signs else ''
+        raw = (
+            f"{bucket(patient_lat)}|{bucket(patient_lon)}|{description}|{vitals}|{age}|"
+            f"{required_ambulance_type}|{bucket(destination_lat)}|{bucket(destination_lon)}"
+        )
+        return 'dispatch:' + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def _get_cached_dispatch(self, cache_key: str) -> Optional[Dict]:
+        """
+        Look up a cached pipeline result whose ambulance is still available
+
+        Args:
+            cache_key: Key from _dispatch_cache_key
+
+        Returns:
+            Cached result or None
+        """
+        cached = self.get_cached_prediction(cache_key)
+        if not isinstance(cached, dict):
+            return None
+
+        # Availability is the only volatile part of the result
+        ambulance_id = (cached.get('ambulance_selection') or {}).get('ambulance_id')
+        if not self.is_ambulance_available(ambulance_id):
+            return None
+
+        return cached
+
+    def is_ambulance_available(self, ambulance_id: Optional[int]) -> bool:
+        """
+        Check that an ambulance picked by a cached result can still be dispatched
+
+        Args:
+            ambulance_id: Ambulance ID (None counts as unavailable)
+
+        Returns:
+            True if the ambulance exists and its status is 'available'
+        """
+        ambulance = self.ambulance_repo.get_ambulance(ambulance_id) if ambulance_id else None
+        return bool(ambulance) and ambulance.get('status') == 'available'
+
     # ============================================
     # BATCH PREDICTIONS
     # ============================================
@@ -497,22 +835,34 @@ class PredictionService(LoggerMixin):
             List of predictions
         """
         try:
-            predictions = []
-
+            cases = []
             for i, description in enumerate(descriptions):
                 vital_signs = vital_signs_list[i] if vital_signs_list and i < len(vital_signs_list) else None
                 age = ages[i] if ages and i < len(ages) else None
+                cases.append((description, vital_signs, age))
+
+            # Chunks (about 4 per worker) run concurrently; results keep input order
+            chunk_size = max(1, -(-len(cases) // (4 * PIPELINE_MAX_WORKERS)))
+            futures = [
+                _PIPELINE_EXECUTOR.submit(self._predict_severity_chunk, cases[start:start + chunk_size])
+                for start in range(0, len(cases), chunk_size)
+            ]
 
-                pred = self.predict_severity(description, vital_signs, age)
-                predictions.append(pred)
+            predictions = []
+            for future in futures:
+                predictions.extend(future.result())
 
-            self.log_info(f"Batch severity prediction: {len(predictions)} cases")
+            self.log_info("Batch severity prediction: %d cases", len(predictions))
             return predictions
 
         except Exception as e:
-            self.log_error(f"Error in batch severity prediction: {str(e)}")
+            self.log_error("Error in batch severity prediction: %s", e)
             return []
 
+    def _predict_severity_chunk(self, cases: List[Tuple[str, Optional[Dict], Optional[int]]]) -> List[Dict]:
+        """Predict severity for a chunk of (description, vital_signs, age) cases"""
+        return [self.predict_severity(description, vital_signs, age) for description, vital_signs, age in cases]
+
     def predict_eta_batch(
         self,
         routes: List[Dict[str, float]]
@@ -528,28 +878,157 @@ class PredictionService(LoggerMixin):
                 - time_of_day (optional)
 
         Returns:
-            List of ETA predictions
+            List of ETA predictions, one per route in order (the empty
+            prediction for routes with missing coordinates or on failure)
         """
+        if not routes:
+            return []
+
+        # Routes with missing coordinates get the empty prediction, like predict_eta
+        predictions = [self._empty_eta_prediction() for _ in routes]
+        valid = [
+            i for i, route in enumerate(routes)
+            if not self._missing_coordinates(
+                route.get('origin_lat'), route.get('origin_lon'),
+                route.get('destination_lat'), route.get('destination_lon')
+            )
+        ]
+        if len(valid) < len(routes):
+            self.log_warning("ETA prediction skipped for %d routes: coordinates missing", len(routes) - len(valid))
+        if not valid:
+            return predictions
+
         try:
-            predictions = []
+            start_time = time.perf_counter()
+            now = self._now()
+            valid_routes = [routes[i] for i in valid]
+
+            # Geographic features for every valid route in one vectorized pass
+            geo = self.engineer.extract_geographic_features_batch(
+                [route['origin_lat'] for route in valid_routes],
+                [route['origin_lon'] for route in valid_routes],
+                [route['destination_lat'] for route in valid_routes],
+                [route['destination_lon'] for route in valid_routes]
+            )
+
+            features_list = []
+            for i, route in enumerate(valid_routes):
+                traffic_level = route.get('traffic_level', 1)
+                features = {
+                    'distance_km': float(geo['distance_km'][i]),
+                    'bearing_degrees': float(geo['bearing_degrees'][i]),
+                    'cardinal_direction': str(geo['cardinal_direction'][i]),
+                    'lat_diff': float(geo['lat_diff'][i]),
+                    'lon_diff': float(geo['lon_diff'][i]),
+                    'hour_of_day': route.get('time_of_day') or now.hour,
+                    'day_of_week': now.weekday(),
+                    'traffic_level': traffic_level
+                }
+                features.update(self.engineer.encode_traffic_level(traffic_level))
+                features_list.append(features)
 
-            for route in routes:
-                pred = self.predict_eta(
-                    route['origin_lat'],
-                    route['origin_lon'],
-                    route['destination_lat'],
-                    route['destination_lon'],
-                    traffic_level=route.get('traffic_level', 1),
-                    time_of_day=route.get('time_of_day')
+            # Get model
+            model = self.model_manager.get_model('eta')
+            if not model:
+                self.log_error("ETA model not loaded")
+                return predictions
+
+            # One batched model call; per-route calls for models without it
+            if hasattr(model, 'predict_batch'):
+                batch = model.predict_batch(features_list)
+            else:
+                batch = [model.predict(features) for features in features_list]
+
+            # Record predictions, splitting the batch time evenly
+            elapsed_ms = (time.perf_counter() - start_time) * 1000 / len(batch)
+            for i, prediction in zip(valid, batch):
+                predictions[i] = prediction
+                self.model_manager.record_prediction(
+                    'eta',
+                    prediction_time_ms=elapsed_ms,
+                    input_features=FeatureEngineer.ETA_FEATURE_COUNT,
+                    output_value=float(prediction.get('estimated_minutes', 0)),
+                    confidence=prediction.get('confidence', 0)
                 )
-                predictions.append(pred)
 
-            self.log_info(f"Batch ETA prediction: {len(predictions)} routes")
+            self.log_info("Batch ETA prediction: %d routes", len(batch))
             return predictions
 
         except Exception as e:
-            self.log_error(f"Error in batch ETA prediction: {str(e)}")
-            return []
+            # Keep the positional mapping: one empty prediction per route
+            self.log_error("Error in batch ETA prediction: %s", e)
+            return [self._empty_eta_prediction() for _ in routes]
+
+    async def predict_severity_batch_async(
+        self,
+        descriptions: List[str],
+        vital_signs_list: Optional[List[Dict]] = None,
+        ages: Optional[List[int]] = None
+    ) -> List[Dict]:
+        """
+        Predict severity for multiple cases without blocking the event loop
+
+        Every case runs in the shared prediction pool and the results are
+        gathered, so the batch takes about as long as its slowest case when
+        the model waits on I/O (e.g. a remote model server).
+
+        Args:
+            descriptions: List of descriptions
+            vital_signs_list: List of vital signs dicts
+            ages: List of ages
+
+        Returns:
+            List of predictions, in input order
+        """
+        loop = asyncio.get_running_loop()
+        tasks = []
+        for i, description in enumerate(descriptions):
+            vital_signs = vital_signs_list[i] if vital_signs_list and i < len(vital_signs_list) else None
+            age = ages[i] if ages and i < len(ages) else None
+            tasks.append(loop.run_in_executor(
+                _PIPELINE_EXECUTOR, self.predict_severity, description, vital_signs, age
+            ))
+
+        predictions = list(await asyncio.gather(*tasks))
+        self.log_info("Async batch severity prediction: %d cases", len(predictions))
+        return predictions
+
+    async def predict_eta_batch_async(self, routes: List[Dict[str, float]]) -> List[Dict]:
+        """
+        Predict ETA for multiple routes without blocking the event loop
+
+        The batch is already a single model call, so it runs as one task in
+        the shared prediction pool.
+
+        Args:
+            routes: Route dictionaries (see predict_eta_batch)
+
+        Returns:
+            List of ETA predictions
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_PIPELINE_EXECUTOR, self.predict_eta_batch, routes)
+
+    # ============================================
+    # CLOCK
+    # ============================================
+
+    def _now(self) -> datetime:
+        """
+        Current UTC time, reused for up to CLOCK_CACHE_SECONDS
+
+        Predictions only derive hour and weekday features from the clock, so
+        back-to-back calls share one reading instead of each calling utcnow().
+
+        Returns:
+            Cached UTC datetime
+        """
+        stamp, cached = self._now_cache
+        mono = time.monotonic()
+        if cached is None or mono - stamp >= self.CLOCK_CACHE_SECONDS:
+            cached = datetime.utcnow()
+            self._now_cache = (mono, cached)
+        return cached
 
     # ============================================
     # RESULT CACHING
@@ -569,7 +1048,7 @@ class PredictionService(LoggerMixin):
             return self.cache_repo.get(f"prediction:{cache_key}")
 
         except Exception as e:
-            self.log_warning(f"Cache get error: {str(e)}")
+            self.log_warning("Cache get error: %s", e)
             return None
 
     def cache_prediction(
@@ -597,5 +1076,5 @@ class PredictionService(LoggerMixin):
             )
 
         except Exception as e:
-            self.log_warning(f"Cache set error: {str(e)}")
+            self.log_warning("Cache set error: %s", e)
             return False
@@ -5,9 +5,15 @@ Manages ML model training and retraining workflows
 
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+import io
 import numpy as np
 import pickle
 
+try:
+    import joblib
+except ImportError:  # Models are saved with plain pickle without it
+    joblib = None
+
 from ..config.logger import LoggerMixin
 from ..repositories import (
     DispatchRepository, ModelRepository, FeatureEngineer, CacheRepository
@@ -305,8 +311,15 @@ class TrainingService(LoggerMixin):
                 self.log_error(f"Model not found: {model_name}")
                 return None
 
-            # Serialize model
-            model_bytes = pickle.dumps(model)
+            # Serialize model (joblib writes numpy arrays so they can be memory-mapped on load)
+            if joblib is not None:
+                buffer = io.BytesIO()
+                joblib.dump(model, buffer)
+                model_bytes = buffer.getvalue()
+                model_format = 'joblib'
+            else:
+                model_bytes = pickle.dumps(model)
+                model_format = 'pickle'
 
             # Get feature names
             feature_names = getattr(model, 'feature_names', [])
@@ -321,7 +334,8 @@ class TrainingService(LoggerMixin):
                 'metrics': metrics,
                 'feature_names': feature_names,
                 'hyperparameters': hyperparameters or {},
-                'description': description or f'{model_name} v{version}'
+                'description': description or f'{model_name} v{version}',
+                'model_format': model_format
             }
 
             # Save
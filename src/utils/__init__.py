@@ -0,0 +1,14 @@
+"""
+Utilities Package
+Shared helpers used across repositories and services
+"""
+
+from .geo import EARTH_RADIUS_KM, haversine, haversine_vector
+from .timeutils import now_iso
+
+__all__ = [
+    'EARTH_RADIUS_KM',
+    'haversine',
+    'haversine_vector',
+    'now_iso'
+]
@@ -0,0 +1,56 @@
+"""
+Geo Utilities
+Shared great-circle distance kernels (scalar and vectorized)
+"""
+
+from typing import Any
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Without numba the kernels run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Earth radius in km
+EARTH_RADIUS_KM = 6371.0
+
+
+@njit(cache=True, fastmath=True)
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance in km (compiled by numba when available; positional args only)"""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = math.radians(lon2) - math.radians(lon1)
+
+    a = (math.sin(dlat / 2) ** 2 +
+         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2)
+    return EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(a))
+
+
+def haversine_vector(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> np.ndarray:
+    """
+    Haversine distance in km between NumPy-broadcast point arrays
+
+    Scalars and arrays mix freely: one point against an array, element-wise
+    route arrays, or [:, None] x [None, :] for a full distance matrix.
+
+    Args:
+        lat1, lon1: Origin coordinates
+        lat2, lon2: Destination coordinates
+
+    Returns:
+        Array of distances in km
+    """
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlon = np.radians(lon2) - np.radians(lon1)
+
+    a = (
+        np.sin((lat2_rad - lat1_rad) / 2) ** 2
+        + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
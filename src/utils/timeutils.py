@@ -0,0 +1,31 @@
+"""
+Time Utilities
+Cached timestamp helpers for hot status paths
+"""
+
+from datetime import datetime
+from typing import Tuple
+import time
+
+
+# (epoch second, ISO string) of the last timestamp handed out by now_iso
+_timestamp_cache: Tuple[int, str] = (0, '')
+
+
+def now_iso() -> str:
+    """
+    Current UTC time as an ISO string, at one-second resolution
+
+    The string is built once per second and reused, which keeps hot health
+    and status paths from formatting a new datetime on every call.
+
+    Returns:
+        ISO 8601 timestamp
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached = _timestamp_cache
+    if cached[0] != second:
+        cached = (second, datetime.utcfromtimestamp(second).isoformat())
+        _timestamp_cache = cached
+    return cached[1]
@@ -108,6 +108,83 @@ def feature_engineer():
     return FeatureEngineer()
 
 
+# ============================================
+# CONCRETE REPOSITORY FIXTURES
+# ============================================
+
+class InMemoryRedis:
+    """Dictionary-backed stand-in for the Redis calls used by repository caching"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def setEx(self, key, ttl, value):
+        self.data[key] = value
+        return True
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1).encode()
+        return int(self.data[key])
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def pipeline(self):
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    """Queues InMemoryRedis calls and runs them on execute()"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args) for name, args in self.calls]
+
+
+def sql_repository(repo_cls):
+    """Concrete subclass of a repository that sends its SQL to db_connection.execute"""
+    class SQLRepository(repo_cls):
+        def execute_query(self, query, params=None):
+            return self.db.execute(query, params)
+
+        def execute_update(self, query, params=None):
+            return self.db.execute(query, params)
+
+    return SQLRepository
+
+
+@pytest.fixture
+def memory_redis():
+    """In-memory Redis stand-in"""
+    return InMemoryRedis()
+
+
+@pytest.fixture
+def sql_ambulance_repo(mock_db_connection, mock_redis_client):
+    """Get a concrete AmbulanceRepository backed by the mock connection"""
+    from src.repositories import AmbulanceRepository
+    return sql_repository(AmbulanceRepository)(mock_db_connection, mock_redis_client)
+
+
+@pytest.fixture
+def sql_model_repo(mock_db_connection, memory_redis, tmp_path):
+    """Get a concrete ModelRepository backed by the mock connection and in-memory Redis"""
+    from src.repositories import ModelRepository
+    return sql_repository(ModelRepository)(mock_db_connection, memory_redis, str(tmp_path))
+
+
 # ============================================
 # SERVICE FIXTURES
 # ============================================
@@ -203,6 +203,24 @@ class TestAmbulanceRepository:
         assert ambulances is not None
         assert isinstance(ambulances, list)
 
+    def test_get_available_ambulances_near_excludes_ids(self, sql_ambulance_repo, mock_db_connection):
+        """Test excluded ambulances are filtered in SQL before the limit"""
+        nearby = [{'id': 2, 'distance_km': 1.2}]
+        mock_db_connection.execute.return_value = nearby
+
+        ambulances = sql_ambulance_repo.get_available_ambulances_near(
+            latitude=4.7110,
+            longitude=-74.0721,
+            radius_km=5,
+            limit=3,
+            exclude_ids={7, 3}
+        )
+
+        query, params = mock_db_connection.execute.call_args[0]
+        assert 'id NOT IN (%s, %s)' in query
+        assert params[-3:] == (3, 7, 3)
+        assert ambulances == nearby
+
     def test_update_ambulance_location(self, ambulance_repo, sample_ambulance_data):
         """Test updating ambulance location"""
         ambulance_id = ambulance_repo.create_ambulance(sample_ambulance_data)
@@ -309,6 +327,37 @@ class TestAmbulanceRepository:
 class TestModelRepository:
     """Test ModelRepository"""
 
+    def test_revision_bump_during_query_is_not_cached(self, sql_model_repo, mock_db_connection):
+        """Test a row read while the model revision was bumped is not cached"""
+        row = {'id': 1, 'model_name': 'eta', 'version': '1.0.0', 'is_active': False}
+
+        def bump_while_querying(query, params=None):
+            sql_model_repo.bump_cache_revision(sql_model_repo._cache_scope('eta'))
+            return [dict(row)]
+
+        mock_db_connection.execute.side_effect = bump_while_querying
+        assert sql_model_repo.get_model_version('eta', '1.0.0') == row
+
+        mock_db_connection.execute.side_effect = None
+        mock_db_connection.execute.return_value = [dict(row, is_active=True)]
+        assert sql_model_repo.get_model_version('eta', '1.0.0')['is_active']
+        assert sql_model_repo.get_model_version('eta', '1.0.0')['is_active']
+        assert mock_db_connection.execute.call_count == 2
+
+    def test_revision_bump_invalidates_cached_version(self, sql_model_repo, mock_db_connection):
+        """Test bumping the model revision makes the cached row a miss"""
+        mock_db_connection.execute.return_value = [{'id': 1, 'model_name': 'eta', 'version': '1.0.0'}]
+        revision = sql_model_repo.get_model_revision('eta')
+
+        sql_model_repo.get_model_version('eta', '1.0.0')
+        sql_model_repo.get_model_version('eta', '1.0.0')
+        assert mock_db_connection.execute.call_count == 1
+
+        sql_model_repo.bump_cache_revision(sql_model_repo._cache_scope('eta'))
+        sql_model_repo.get_model_version('eta', '1.0.0')
+        assert mock_db_connection.execute.call_count == 2
+        assert sql_model_repo.get_model_revision('eta') == revision + 1
+
     def test_save_model_version(self, model_repo):
         """Test saving model version"""
         model_data = {
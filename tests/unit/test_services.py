@@ -6,6 +6,7 @@ Tests for model manager, prediction, training, optimization, and health services
 import pytest
 import numpy as np
 from datetime import datetime
+from unittest.mock import MagicMock
 
 
 # ============================================
@@ -261,6 +262,60 @@ class TestPredictionService:
         assert result1 is not None
         assert result2 is not None
 
+    def test_cached_dispatch_requires_available_ambulance(self):
+        """Test a cached dispatch result is dropped once its ambulance is busy"""
+        from src.services import PredictionService
+
+        cached = {'ambulance_selection': {'ambulance_id': 5}, 'severity': {'level': 2}}
+        cache_repo = MagicMock()
+        cache_repo.get.return_value = cached
+        ambulance_repo = MagicMock()
+        service = PredictionService(MagicMock(), MagicMock(), ambulance_repo, MagicMock(), cache_repo)
+
+        ambulance_repo.get_ambulance.return_value = {'id': 5, 'status': 'available'}
+        assert service._get_cached_dispatch('dispatch:key') == cached
+
+        ambulance_repo.get_ambulance.return_value = {'id': 5, 'status': 'in_transit'}
+        assert service._get_cached_dispatch('dispatch:key') is None
+        ambulance_repo.get_ambulance.assert_called_with(5)
+
+    def test_predict_eta_batch_isolates_invalid_routes(self):
+        """Test routes with missing coordinates get the empty prediction in place"""
+        from src.services import PredictionService
+
+        model = MagicMock()
+        model.predict_batch.side_effect = lambda features_list: [
+            {'estimated_minutes': 10.0, 'confidence': 0.9} for _ in features_list
+        ]
+        model_manager = MagicMock()
+        model_manager.get_model.return_value = model
+        service = PredictionService(model_manager, MagicMock(), MagicMock(), MagicMock(), MagicMock())
+
+        route = {'origin_lat': 4.71, 'origin_lon': -74.07, 'destination_lat': 4.75, 'destination_lon': -74.10}
+        results = service.predict_eta_batch([route, dict(route, origin_lat=None), route])
+
+        assert [r['confidence'] for r in results] == [0.9, 0.0, 0.9]
+        assert len(model.predict_batch.call_args[0][0]) == 2
+
+        model.predict_batch.side_effect = RuntimeError('model failure')
+        results = service.predict_eta_batch([route, route])
+        assert results == [service._empty_eta_prediction()] * 2
+
+    def test_optimize_route_batch_keeps_level_order(self):
+        """Test concurrently optimized traffic levels come back in input order"""
+        from src.services import PredictionService
+
+        model = MagicMock()
+        model.predict.side_effect = lambda features: {'eta_minutes': 10.0 * features['traffic_level']}
+        model_manager = MagicMock()
+        model_manager.get_model.return_value = model
+        service = PredictionService(model_manager, MagicMock(), MagicMock(), MagicMock(), MagicMock())
+
+        routes = service.optimize_route_batch(4.71, -74.07, 4.75, -74.10, traffic_levels=[2, 4, 1])
+
+        assert [r['eta_minutes'] for r in routes] == [20.0, 40.0, 10.0]
+        assert model.predict.call_count == 3
+
 
 # ============================================
 # TRAINING SERVICE TESTS
@@ -432,6 +487,50 @@ class TestOptimizationService:
 
         assert result is not None
 
+    def test_optimize_multiple_dispatches_maximizes_total_score(self):
+        """Test ambulances are matched jointly rather than first-come-first-served"""
+        from src.services import OptimizationService
+        from src.repositories import AmbulanceRepository
+
+        # Greedy in arrival order gives dispatch 1 ambulance 10 (4 km) and
+        # dispatch 2 ambulance 20 (11 km); the optimal matching swaps them
+        ambulance_repo = MagicMock()
+        ambulance_repo.get_available_ambulances_soa.return_value = AmbulanceRepository.ambulances_to_soa([
+            {'id': 10, 'current_lat': 0.0, 'current_lon': 0.0, 'type': 'basic'},
+            {'id': 20, 'current_lat': 0.09, 'current_lon': 0.0, 'type': 'basic'}
+        ])
+        service = OptimizationService(MagicMock(), MagicMock(), ambulance_repo, MagicMock())
+
+        result = service.optimize_multiple_dispatches([
+            {'id': 1, 'patient_lat': 0.036, 'patient_lon': 0.0, 'required_type': 'basic', 'severity_level': 2},
+            {'id': 2, 'patient_lat': -0.009, 'patient_lon': 0.0, 'required_type': 'basic', 'severity_level': 2}
+        ])
+
+        pairs = {a['dispatch_id']: a['ambulance_id'] for a in result['assignments']}
+        assert pairs == {1: 20, 2: 10}
+        assert result['unassigned_count'] == 0
+
+    def test_optimize_multiple_dispatches_serves_critical_first(self):
+        """Test the most severe dispatches are served when ambulances run short"""
+        from src.services import OptimizationService
+        from src.repositories import AmbulanceRepository
+
+        ambulance_repo = MagicMock()
+        ambulance_repo.get_available_ambulances_soa.return_value = AmbulanceRepository.ambulances_to_soa([
+            {'id': 10, 'current_lat': 0.0, 'current_lon': 0.0, 'type': 'basic'}
+        ])
+        service = OptimizationService(MagicMock(), MagicMock(), ambulance_repo, MagicMock())
+
+        # The minor case arrives first and sits closer to the only ambulance
+        result = service.optimize_multiple_dispatches([
+            {'id': 1, 'patient_lat': 0.001, 'patient_lon': 0.0, 'required_type': 'basic', 'severity_level': 1},
+            {'id': 2, 'patient_lat': 0.05, 'patient_lon': 0.0, 'required_type': 'basic', 'severity_level': 5},
+            {'id': 3, 'patient_lat': 0.002, 'patient_lon': 0.0, 'required_type': 'basic', 'severity_level': 3}
+        ])
+
+        assert [a['dispatch_id'] for a in result['assignments']] == [2]
+        assert result['unassigned_count'] == 2
+
 
 # ============================================
 # HEALTH SERVICE TESTS
@@ -508,6 +607,41 @@ class TestHealthService:
                 assert isinstance(health[component], (bool, dict, str))
 
 
+# ============================================
+# DISPATCH ASSIGNMENT SERVICE TESTS
+# ============================================
+
+@pytest.mark.unit
+@pytest.mark.service
+class TestDispatchAssignmentService:
+    """Test DispatchAssignmentService"""
+
+    def test_find_nearest_ambulance_with_tree(self):
+        """Test the BallTree lookup matches a full Haversine scan on a large fleet"""
+        from src.services.dispatch_assignment_service import DispatchAssignmentService
+        from src.utils.geo import haversine_vector
+
+        service = DispatchAssignmentService()
+        rng = np.random.default_rng(7)
+        count = 4 * service.AMBULANCE_TREE_MIN_SIZE
+        ids = np.arange(count).astype(object)
+        lats = 4.71 + rng.uniform(-0.05, 0.05, count)
+        lons = -74.07 + rng.uniform(-0.05, 0.05, count)
+
+        for step in range(20):
+            # Small moves reuse the tree; the result must still be exact
+            lats = lats + rng.normal(0, 0.0001, count)
+            patient_lat, patient_lon = 4.71 + rng.uniform(-0.04, 0.04), -74.07 + rng.uniform(-0.04, 0.04)
+
+            nearest, distance = service._find_nearest_ambulance(patient_lat, patient_lon, ids, lats, lons)
+
+            distances = haversine_vector(patient_lat, patient_lon, lats, lons)
+            assert nearest == int(np.argmin(distances))
+            assert distance == pytest.approx(distances.min())
+
+        assert service._amb_tree_cache is not None
+
+
 # ============================================
 # SERVICE INTEGRATION TESTS
 # ============================================